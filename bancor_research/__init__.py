@@ -24,6 +24,8 @@ DataFrame = pandas.DataFrame
 
 PandasDataFrame = TypeVar("pandas.core.frame.DataFrame")
 
+from bancor_research.price_feeds import PriceFeeds, read_price_feeds
+
 SECONDS_PER_DAY = 24 * 60 * 60
 
 class DEFAULT:
@@ -44,15 +46,15 @@ class DEFAULT:
 
     PRICE_FEEDS_PATH = "https://bancorml.s3.us-east-2.amazonaws.com/price_feeds.parquet"
 
-    PRICE_FEEDS = DataFrame({
-        "INDX": (    0.00 for _ in range(NUM_TIMESTAMPS)),
-        "vbnt": (    1.00 for _ in range(NUM_TIMESTAMPS)),
-        "tkn" : (    2.50 for _ in range(NUM_TIMESTAMPS)),
-        "bnt" : (    2.50 for _ in range(NUM_TIMESTAMPS)),
-        "link": (   15.00 for _ in range(NUM_TIMESTAMPS)),
-        "eth" : ( 2500.00 for _ in range(NUM_TIMESTAMPS)),
-        "wbtc": (40000.00 for _ in range(NUM_TIMESTAMPS)),
-    })
+    PRICE_FEEDS = PriceFeeds.constant({
+        "INDX":     0.00,
+        "vbnt":     1.00,
+        "tkn" :     2.50,
+        "bnt" :     2.50,
+        "link":    15.00,
+        "eth" :  2500.00,
+        "wbtc": 40000.00,
+    }, NUM_TIMESTAMPS)
 
     USERS = [
         "Alice",
@@ -78,10 +80,4 @@ DEFAULT.WHITELIST = {
     for TOKEN in DEFAULT.TOKENS
 }
 
-def read_price_feeds(price_feeds_path: str):
-    price_feeds = pandas.read_parquet(price_feeds_path)
-    price_feeds.columns = [col.lower() for col in price_feeds.columns]
-    return price_feeds
-
-
 __version__ = "3.1.1"
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from bancor_research.bancor_emulator.solidity import uint, uint8, uint16, uint32, uint256, hours, address, mapping, revert
 from bancor_research.bancor_emulator.utils import contract, parse
 
@@ -12,6 +14,19 @@ from bancor_research.bancor_emulator.RewardsMath import RewardsMath
 FLAT_DISTRIBUTION = uint8(0);
 EXP_DECAY_DISTRIBUTION = uint8(1);
 
+'''
+ * @dev returns `RewardsMath.calcExpDecayRewards` for the data of the given values
+ * the results are cached, so that the rewards distributed until the previous distribution of a program,
+ * which were already calculated during that distribution, are not calculated again
+ * each caller gets its own copy of the cached result, which it may therefore modify
+'''
+def calcExpDecayRewards(totalRewards, timeElapsed, halfLife) -> (uint):
+    return _calcExpDecayRewards(totalRewards, timeElapsed, halfLife).clone();
+
+@lru_cache(maxsize = 4096)
+def _calcExpDecayRewards(totalRewards, timeElapsed, halfLife) -> (uint):
+    return RewardsMath.calcExpDecayRewards(uint256(totalRewards), uint32(timeElapsed), uint32(halfLife));
+
 class ProgramData:
     def __init__(self, x = None) -> None:
         self.startTime = parse(uint32, x, 'startTime');
@@ -225,6 +240,29 @@ class AutoCompoundingRewards(contract, Time):
 
         self._autoProcessRewardsIndex = index % numOfPools;
 
+    '''
+     * @dev advances the time to each one of the given timestamps, and auto-processes the rewards at each one of them
+     *
+     * the result is identical to that of calling `autoProcessRewards` at each one of the given timestamps,
+     * but a call which would not process any program (because every program that it would visit is paused,
+     * not yet started, recently processed or fully distributed) is replaced by advancing the auto-process index
+    '''
+    def autoProcessRewardsOver(self, timestamps) -> None:
+        programs = None;
+
+        for timestamp in timestamps:
+            self._chain.update(timestamp);
+
+            if (programs is None):
+                programs = [self._programTimes(self._programs[pool]) for pool in self._pools.values()];
+
+            index = self._autoProcessRewardsIndexAfterSkip(programs, self._time().data);
+            if (index is None):
+                self.autoProcessRewards();
+                programs = None;
+            else:
+                self._autoProcessRewardsIndex = uint256(index);
+
     '''
      * @inheritdoc IAutoCompoundingRewards
     '''
@@ -283,6 +321,64 @@ class AutoCompoundingRewards(contract, Time):
 
         return True;
 
+    '''
+     * @dev returns the auto-process index which `autoProcessRewards` would leave at a given time,
+     * or `None` if it would process any program (or revert)
+    '''
+    def _autoProcessRewardsIndexAfterSkip(self, programs, currTime):
+        numOfPools = len(programs);
+        if (numOfPools == 0):
+            return None;
+
+        index = int(self._autoProcessRewardsIndex.data);
+        count = int(self._autoProcessRewardsCount.data);
+        maxCount = min(count * int(self.AUTO_PROCESS_MAX_PROGRAMS_FACTOR.data), numOfPools);
+
+        for i in range(maxCount):
+            completed = self._skipRewards(programs[index % numOfPools], currTime);
+            if (completed is None):
+                return None;
+            index += 1;
+            if (completed):
+                count -= 1;
+                if (count == 0):
+                    break;
+
+        return index % numOfPools;
+
+    '''
+     * @dev returns the result of `_processRewards(pool, True)` at a given time if it does not process the program,
+     * or `None` otherwise
+    '''
+    def _skipRewards(self, programTimes, currTime):
+        isPaused, startTime, prevDistributionTimestamp, endTime = programTimes;
+
+        if (isPaused or currTime < startTime):
+            return False;
+
+        if (prevDistributionTimestamp + self.AUTO_PROCESS_REWARDS_MIN_TIME_DELTA.data > uint32.max):
+            return None;
+
+        if (currTime < prevDistributionTimestamp + self.AUTO_PROCESS_REWARDS_MIN_TIME_DELTA.data):
+            return False;
+
+        # a flat program whose rewards were fully distributed has no tokens to distribute
+        if (endTime is not None and max(prevDistributionTimestamp, startTime) >= endTime):
+            return True;
+
+        return None;
+
+    '''
+     * @dev returns the times of a program which determine whether or not its rewards can be processed
+    '''
+    def _programTimes(self, p) -> (tuple):
+        return (
+            p.isPaused,
+            p.startTime.data,
+            p.prevDistributionTimestamp.data,
+            p.endTime.data if p.distributionType == FLAT_DISTRIBUTION else None
+        );
+
     '''
      * @dev creates a rewards program for a given pool
     '''
@@ -355,8 +451,8 @@ class AutoCompoundingRewards(contract, Time):
             currTimeElapsed = currTime - p.startTime;
             prevTimeElapsed = prevTime - p.startTime;
             return \
-                RewardsMath.calcExpDecayRewards(p.totalRewards, currTimeElapsed, p.halfLife) - \
-                RewardsMath.calcExpDecayRewards(p.totalRewards, prevTimeElapsed, p.halfLife);
+                calcExpDecayRewards(p.totalRewards.data, currTimeElapsed.data, p.halfLife.data) - \
+                calcExpDecayRewards(p.totalRewards.data, prevTimeElapsed.data, p.halfLife.data);
 
     '''
      * @dev returns the amount of pool tokens to burn
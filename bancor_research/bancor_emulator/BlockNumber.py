@@ -1,11 +1,14 @@
-from bancor_research.bancor_emulator.solidity import uint, uint32, block
+from bancor_research.bancor_emulator.solidity import uint, uint32, chain
 
 '''
  * @dev this contract abstracts the block number in order to allow for more flexible control in tests
 '''
 class BlockNumber:
+    def __init__(self):
+        self._chain = chain.current()
+
     '''
      * @dev returns the current block-number
     '''
     def _blockNumber(self) -> (uint):
-        return uint32(block.number);
+        return uint32(self._chain.number);
@@ -33,7 +33,11 @@ class EnumerableSet:
     # in bytes32.
 
     def __init__(self):
-        self.set = set()
+        # Storage of set values
+        self._values = [];
+        # Position of the value in the `values` array, plus 1 because index 0
+        # means a value is not in the set.
+        self._indexes = {};
 
     '''
      * @dev Add a value to a set. O(1).
@@ -43,7 +47,10 @@ class EnumerableSet:
     '''
     def add(self, value):
         if (not self.contains(value)):
-            self.set.add(value);
+            self._values.append(value);
+            # The value is stored at length-1, but we add 1 to all indexes
+            # and use 0 as a sentinel value
+            self._indexes[value] = len(self._values);
             return True;
         else:
             return False;
@@ -55,8 +62,32 @@ class EnumerableSet:
      * present.
     '''
     def remove(self, value):
-        if (self.contains(value)):
-            self.set.remove(value);
+        # We read and store the value's index to prevent multiple reads from the same storage slot
+        valueIndex = self._indexes.get(value, 0);
+
+        if (valueIndex != 0):
+            # Equivalent to contains(set, value)
+            # To delete an element from the _values array in O(1), we swap the element to delete with the last one in
+            # the array, and then remove the last element (sometimes called as 'swap and pop').
+            # This modifies the order of the array, as noted in {at}.
+
+            toDeleteIndex = valueIndex - 1;
+            lastIndex = len(self._values) - 1;
+
+            if (lastIndex != toDeleteIndex):
+                lastValue = self._values[lastIndex];
+
+                # Move the last value to the index where the value to delete is
+                self._values[toDeleteIndex] = lastValue;
+                # Update the index for the moved value
+                self._indexes[lastValue] = valueIndex; # Replace lastValue's index to valueIndex
+
+            # Delete the slot where the moved value was stored
+            self._values.pop();
+
+            # Delete the index for the deleted slot
+            del self._indexes[value];
+
             return True;
         else:
             return False;
@@ -65,13 +96,13 @@ class EnumerableSet:
      * @dev Returns true if the value is in the set. O(1).
     '''
     def contains(self, value):
-        return value in self.set;
+        return value in self._indexes;
 
     '''
      * @dev Returns the number of values on the set. O(1).
     '''
     def length(self):
-        return len(self.set);
+        return len(self._values);
 
     '''
      * @dev Returns the value stored at position `index` in the set. O(1).
@@ -84,7 +115,7 @@ class EnumerableSet:
      * - `index` must be strictly less than {length}.
     '''
     def at(self, index):
-        return list(self.set)[index];
+        return self._values[int(index)];
 
     '''
      * @dev Return the entire set in an array
@@ -95,4 +126,4 @@ class EnumerableSet:
      * uncallable if the set grows to a point where copying to memory consumes too much gas to fit in a block.
     '''
     def values(self):
-        return list(self.set);
+        return list(self._values);
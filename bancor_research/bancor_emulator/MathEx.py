@@ -343,5 +343,126 @@ if config.full_precision_mode:
         return x.lo < y.lo
     def mul512(x, y) -> (Uint512):
         return Uint512({ 'hi': 0, 'lo': uint256(x) * y })
+elif config.fast_math_mode:
+    '''
+     * @dev the functions below operate on python integers rather than on `uint` objects,
+     * and reproduce the results and the reverts of the functions above bit for bit:
+     * - every value is wrapped into 256 bits wherever the functions above cast it to `uint256`
+     * - every operation which is checked above is checked here at the same size
+     * - every operation which is unchecked above is wrapped here into 256 bits
+    '''
+    MAX_UINT256 = 2 ** 256 - 1;
+
+    EXP2_TAYLOR_FACTORS = [
+        0x10e1b3be415a0000, 0x05a0913f6b1e0000, 0x0168244fdac78000, 0x004807432bc18000, 0x000c0135dca04000,
+        0x0001b707b1cdc000, 0x000036e0f639b800, 0x00000618fee9f800, 0x0000009c197dcc00, 0x0000000e30dce400,
+        0x000000012ebd1300, 0x0000000017499f00, 0x0000000001a9d480, 0x00000000001c6380, 0x000000000001c638,
+        0x0000000000001ab8, 0x000000000000017c, 0x0000000000000014, 0x0000000000000001,
+    ];
+
+    EXP2_BINARY_FACTORS = [
+        (ONE >> 3, 0x1c3d6a24ed82218787d624d3e5eba95f9, 0x18ebef9eac820ae8682b9793ac6d1e776),
+        (ONE >> 2, 0x18ebef9eac820ae8682b9793ac6d1e778, 0x1368b2fc6f9609fe7aceb46aa619baed4),
+        (ONE >> 1, 0x1368b2fc6f9609fe7aceb46aa619baed5, 0x0bc5ab1b16779be3575bd8f0520a9f21f),
+        (ONE << 0, 0x0bc5ab1b16779be3575bd8f0520a9f21e, 0x0454aaa8efe072e7f6ddbab84b40a55c9),
+        (ONE << 1, 0x0454aaa8efe072e7f6ddbab84b40a55c5, 0x00960aadc109e7a3bf4578099615711ea),
+        (ONE << 2, 0x00960aadc109e7a3bf4578099615711d7, 0x0002bf84208204f5977f9a8cf01fdce3d),
+        (ONE << 3, 0x0002bf84208204f5977f9a8cf01fdc307, 0x0000003c6ab775dd0b95b4cbee7e65d11),
+    ];
+
+    def exp2(f: Fraction256) -> (Fraction256):
+        x = _mulDivF(LN2, int(f.n), int(f.d));
+        if (x >= (ONE << 4)):
+            revert("Overflow");
+
+        z = y = x % (ONE >> 3);
+        n = 0;
+        for factor in EXP2_TAYLOR_FACTORS:
+            z = (z * y & MAX_UINT256) // ONE;
+            n = (n + z * factor) & MAX_UINT256;
+        n = (n // 0x21c3677c82b40000 + y + ONE) & MAX_UINT256;
+
+        for bit, numerator, denominator in EXP2_BINARY_FACTORS:
+            if ((x & bit) != 0):
+                n = (n * numerator & MAX_UINT256) // denominator;
+
+        return Fraction256({ 'n': n, 'd': ONE });
+
+    def truncatedFraction(fraction: Fraction256, max: int) -> (Fraction256):
+        n, d, max = int(fraction.n), int(fraction.d), int(max) & MAX_UINT256;
+        scale = (n if n >= d else d) // max + ((n if n >= d else d) % max != 0);
+        if (d // scale == 0):
+            revert("InvalidFraction");
+
+        return Fraction256({ 'n': n // scale, 'd': d // scale });
+
+    def weightedAverage(
+        fraction1: Fraction256,
+        fraction2: Fraction256,
+        weight1,
+        weight2
+    ) -> (Fraction256):
+        n1, d1, n2, d2 = int(fraction1.n), int(fraction1.d), int(fraction2.n), int(fraction2.d);
+        return Fraction256({
+            'n': _add(_mul(_mul(n1, d2), weight1), _mul(_mul(d1, n2), weight2)),
+            'd': _mul(_mul(d1, d2), weight1 + weight2)
+        });
+
+    def mulDivF(
+        x,
+        y,
+        z
+    ) -> (uint):
+        return uint256(_mulDivF(int(x) & MAX_UINT256, int(y) & MAX_UINT256, int(z) & MAX_UINT256));
+
+    def mulDivC(
+        x,
+        y,
+        z
+    ) -> (uint):
+        x, y, z = int(x) & MAX_UINT256, int(y) & MAX_UINT256, int(z) & MAX_UINT256;
+
+        w = _mulDivF(x, y, z);
+        if (x * y % z > 0):
+            if (w >= MAX_UINT256):
+                revert("Overflow");
+
+            return uint256(w + 1);
+        return uint256(w);
+
+    def mul512(x, y) -> (Uint512):
+        p = int(x) * int(y) % MAX_UINT256;
+        q = (int(x) & MAX_UINT256) * (int(y) & MAX_UINT256) & MAX_UINT256;
+        if (p >= q):
+            return Uint512({ 'hi': p - q, 'lo': q });
+        return Uint512({ 'hi': ((p - q) & MAX_UINT256) - 1, 'lo': q });
+
+    '''
+        * @dev returns the largest integer smaller than or equal to `x * y / z`, given that `x`, `y` and `z` are in range
+    '''
+    def _mulDivF(x: int, y: int, z: int) -> (int):
+        xy = x * y;
+
+        # assert `x * y / z < 2 ^ 256`
+        if (xy > MAX_UINT256 and (xy >> 256) >= z):
+            revert("Overflow");
+
+        return xy // z;
+
+    '''
+        * @dev returns `x + y`, reverting as a checked `uint` operation does
+    '''
+    def _add(x: int, y: int) -> (int):
+        z = x + y;
+        assert 0 <= z <= MAX_UINT256;
+        return z;
+
+    '''
+        * @dev returns `x * y`, reverting as a checked `uint` operation does (including when `y` does not fit in 256 bits)
+    '''
+    def _mul(x: int, y) -> (int):
+        z = x * int(y);
+        assert 0 <= z <= MAX_UINT256 and uint._size(y) <= 256;
+        return z;
 
 library(vars(), MathEx)
\ No newline at end of file
@@ -0,0 +1,61 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from bancor_research import Decimal
+from bancor_research.bancor_emulator import config
+
+INPUTS = 'a, b, c, e, w, m, n, x'.split(', ')
+OUTPUTS = 'p, q, r, s, t, u, v'.split(', ')
+
+def calculateWithdrawalAmounts(inputs, expected = None, maxDiff = 1, maxWorkers = None, chunkSize = 1000, fast_uint_mode = True, fast_math_mode = True):
+    '''
+     * @dev evaluates `PoolCollectionWithdrawal.calculateWithdrawalAmounts` over columns of inputs
+     * returns the columns of outputs (`p`, `q`, `r`, `s`, `t`, `u`, `v`), and if expected outputs are given,
+     * the relative error of every output in every row, where an absolute error of up to `maxDiff` is considered 0
+     *
+     * the rows are evaluated in chunks across a pool of `maxWorkers` processes (in the current process if `maxWorkers` is 1),
+     * by default with the fast uint and fast math implementations, which yield the same outputs as the original ones
+    '''
+    rows = list(zip(*[inputs[z] for z in INPUTS]))
+    chunks = [rows[i : i + chunkSize] for i in range(0, len(rows), chunkSize)]
+    mode = config.mode(None, fast_uint_mode, fast_math_mode)
+
+    if maxWorkers == 1:
+        results = map(evaluate, chunks, repeat(mode))
+    else:
+        with ProcessPoolExecutor(maxWorkers) as executor:
+            results = list(executor.map(evaluate, chunks, repeat(mode)))
+
+    outputs = {z: [] for z in OUTPUTS}
+    for result in results:
+        for z, column in zip(OUTPUTS, result):
+            outputs[z].extend(column)
+
+    if expected is None:
+        return outputs, None
+
+    errors = {z: [relativeError(x, y, maxDiff) for x, y in zip(expected[z], outputs[z])] for z in OUTPUTS}
+    return outputs, errors
+
+'''
+ * @dev returns the columns of outputs of a given chunk of rows, evaluated in a given mode
+'''
+def evaluate(rows, mode):
+    PoolCollectionWithdrawal = config.load('bancor_research.bancor_emulator.PoolCollectionWithdrawal', *mode).PoolCollectionWithdrawal
+    columns = [[] for z in OUTPUTS]
+    for row in rows:
+        actual = PoolCollectionWithdrawal.calculateWithdrawalAmounts(*row)
+        for z, column in zip(OUTPUTS, columns):
+            value = getattr(actual, z)
+            column.append(value.value.data * (-1 if value.isNeg else 1) if z in 'pqr' else value.data)
+    return columns
+
+'''
+ * @dev returns the relative error of an actual value, where an absolute error of up to `maxDiff` is considered 0
+'''
+def relativeError(expected, actual, maxDiff):
+    x = Decimal(expected)
+    y = Decimal(actual)
+    maxDiff = Decimal(maxDiff)
+    if x - maxDiff <= y <= x + maxDiff:
+        return Decimal(0)
+    return abs(y / x - 1) if x != 0 else Decimal(1)
@@ -120,7 +120,7 @@ class StandardRewards(contract, Time):
     '''
     def programIds(self) -> (list):
         length = self._nextProgramId - self.INITIAL_PROGRAM_ID;
-        return [self.INITIAL_PROGRAM_ID + i for i in range(length)]
+        return [self.INITIAL_PROGRAM_ID + i for i in range(int(length))]
 
     '''
      * @inheritdoc IStandardRewards
@@ -303,6 +303,31 @@ class StandardRewards(contract, Time):
 
         return reward;
 
+    '''
+     * @dev returns the pending rewards of each one of the given providers in each one of the given programs
+     *
+     * the updated reward per-token of each program is calculated once, rather than once per provider
+    '''
+    def pendingRewardsTable(self, providers, ids) -> (list):
+        newRewardPerTokens = [];
+
+        for i in range(len(ids)):
+            id = ids[i];
+
+            p = self._programs[id];
+
+            self._verifyProgramExists(p);
+
+            newRewardPerTokens.append(self._rewardPerToken(p, self._programRewards[id]));
+
+        return [
+            [
+                self._pendingRewards(newRewardPerTokens[i], self._providerRewards[provider][ids[i]])
+                for i in range(len(ids))
+            ]
+            for provider in providers
+        ];
+
     '''
      * @inheritdoc IStandardRewards
     '''
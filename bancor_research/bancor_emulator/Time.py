@@ -1,11 +1,14 @@
-from bancor_research.bancor_emulator.solidity import uint, uint32, block
+from bancor_research.bancor_emulator.solidity import uint, uint32, chain
 
 '''
  * @dev this contract abstracts the block timestamp in order to allow for more flexible control in tests
 '''
 class Time:
+    def __init__(self):
+        self._chain = chain.current()
+
     '''
      * @dev returns the current time
     '''
     def _time(self) -> (uint):
-        return uint32(block.timestamp);
+        return uint32(self._chain.timestamp);
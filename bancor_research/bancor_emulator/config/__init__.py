@@ -1,11 +1,58 @@
+from importlib import import_module
 from sys import modules
+from threading import RLock
 
 full_precision_mode = False
+fast_uint_mode = False
+fast_math_mode = False
+
+# the emulator modules imported in each mode, which are kept aside rather than discarded upon switching to another mode
+_modules = {}
+
+# held while the modules of another mode are swapped into `sys.modules`, so that no other thread switches the mode
+# or loads a module in the meantime (a thread which imports an emulator module directly should hold it as well)
+lock = RLock()
 
 def enable_full_precision_mode(state):
-    global full_precision_mode
-    if full_precision_mode != state:
-        full_precision_mode = state
-        par_name = '.'.join(__name__.split('.')[:-1])
-        for name in [name for name in modules if name.startswith(par_name) and name != __name__]:
-            del modules[name]
+    with lock:
+        _switch(*mode(full_precision = state))
+
+def enable_fast_uint_mode(state):
+    with lock:
+        _switch(*mode(fast_uint = state))
+
+def enable_fast_math_mode(state):
+    with lock:
+        _switch(*mode(fast_math = state))
+
+def mode(full_precision = None, fast_uint = None, fast_math = None):
+    with lock:
+        return (
+            full_precision_mode if full_precision is None else full_precision,
+            fast_uint_mode if fast_uint is None else fast_uint,
+            fast_math_mode if fast_math is None else fast_math,
+        )
+
+def load(name, full_precision = None, fast_uint = None, fast_math = None):
+    '''
+     * @dev returns an emulator module as imported in a given mode, importing it only if it was never imported in that mode
+     * the current mode remains unchanged
+    '''
+    with lock:
+        current = mode()
+        _switch(*mode(full_precision, fast_uint, fast_math))
+        try:
+            return import_module(name)
+        finally:
+            _switch(*current)
+
+def _switch(full_precision, fast_uint, fast_math):
+    global full_precision_mode, fast_uint_mode, fast_math_mode
+    with lock:
+        current = mode()
+        if current != (full_precision, fast_uint, fast_math):
+            par_name = '.'.join(__name__.split('.')[:-1])
+            names = [name for name in modules if name.startswith(par_name) and name != __name__]
+            _modules[current] = {name: modules.pop(name) for name in names}
+            full_precision_mode, fast_uint_mode, fast_math_mode = full_precision, fast_uint, fast_math
+            modules.update(_modules.pop((full_precision, fast_uint, fast_math), {}))
@@ -1,2 +1,168 @@
-number = 0
-timestamp = 0
+from collections import defaultdict
+from sys import modules
+from threading import local
+from types import ModuleType, FunctionType, MethodType
+from weakref import WeakKeyDictionary
+from . uint import uint
+
+_IMMUTABLE = frozenset([type(None), bool, int, float, str])
+_MISSING = object()
+_FIELDS = object()
+
+class chain:
+    '''
+     * @dev the block number and block timestamp of an emulated network
+     *
+     * contracts read the chain which is active when they are constructed,
+     * and `block.number` / `block.timestamp` read the chain which is currently active
+     *
+     * a snapshot records the fields of every contract constructed on the chain,
+     * and then journals every entry of every mapping on the chain before it is first accessed,
+     * so that reverting to the snapshot restores only these entries rather than a copy of every contract
+    '''
+    local = local()
+
+    def __init__(self, number = 0, timestamp = 0):
+        self.number = number
+        self.timestamp = timestamp
+        self.contracts = WeakKeyDictionary()
+        self._journal = []
+        self._snapshots = []
+        self._snapshotId = 0
+
+    def __enter__(self):
+        chain._stack().append(self)
+        return self
+
+    def __exit__(self, *args):
+        chain._stack().pop()
+
+    def update(self, timestamp):
+        if self.timestamp < timestamp:
+            self.timestamp = timestamp
+            self.number += 1
+        else:
+            assert self.timestamp == timestamp
+
+    def snapshot(self):
+        '''
+         * @dev returns the id of a snapshot of the current state of the chain
+        '''
+        self._snapshotId += 1
+        self._snapshots.append((self._snapshotId, len(self._journal), self.number, self.timestamp, set()))
+        for c in list(self.contracts):
+            self._journal.append((c, _FIELDS, self._copy(vars(c))))
+        return self._snapshotId
+
+    def revert(self, id):
+        '''
+         * @dev reverts the state of the chain to a given snapshot, discarding this snapshot and every later one
+        '''
+        ids = [snapshot[0] for snapshot in self._snapshots]
+        assert id in ids, 'unknown snapshot {}'.format(id)
+        index = ids.index(id)
+        _, length, self.number, self.timestamp, _ = self._snapshots[index]
+        for obj, key, value in reversed(self._journal[length:]):
+            if key is _FIELDS:
+                vars(obj).clear()
+                vars(obj).update(value)
+            elif value is _MISSING:
+                dict.pop(obj, key, None)
+            else:
+                dict.__setitem__(obj, key, value)
+        del self._journal[length:]
+        del self._snapshots[index:]
+
+    def _record(self, obj, key):
+        accessed = self._snapshots[-1][-1]
+        if (id(obj), key) not in accessed:
+            accessed.add((id(obj), key))
+            self._journal.append((obj, key, self._copy(dict.get(obj, key, _MISSING))))
+
+    def _copy(self, value):
+        if type(value) is list:
+            return [self._copy(x) for x in value]
+        if type(value) is dict:
+            return {k: self._copy(v) for k, v in value.items()}
+        if isinstance(value, uint):
+            return value.clone()
+        if isinstance(value, (chain, defaultdict, type, FunctionType, MethodType)) or value in self.contracts:
+            return value
+        if hasattr(value, '__dict__'):
+            result = object.__new__(type(value))
+            vars(result).update(self._copy(vars(value)))
+            return result
+        return value
+
+    def clone(self, value):
+        '''
+         * @dev returns a copy of a given value, along with a copy of the chain and of every contract constructed on it
+         * (the copy of the value refers to the copy of the chain and the copies of the contracts)
+        '''
+        result = chain(self.number, self.timestamp)
+        memo = {id(self): result}
+        contracts = list(self.contracts)
+        for c in contracts:
+            memo[id(c)] = object.__new__(type(c))
+            result.contracts[memo[id(c)]] = None
+        for c in contracts:
+            vars(memo[id(c)]).update(self._clone(vars(c), memo))
+        return self._clone(value, memo)
+
+    def _clone(self, value, memo):
+        cls = type(value)
+        if cls in _IMMUTABLE:
+            return value
+        if cls is list:
+            return [self._clone(x, memo) for x in value]
+        if cls is dict:
+            return {self._clone(k, memo): self._clone(v, memo) for k, v in value.items()}
+        if cls is uint:
+            return value.clone()
+        result = memo.get(id(value))
+        if result is not None:
+            return result
+        if issubclass(cls, defaultdict):
+            result = defaultdict.__new__(cls)
+            defaultdict.__init__(result, value.default_factory)
+            memo[id(value)] = result
+            vars(result).update(self._clone(vars(value), memo))
+            dict.update(result, self._clone(dict(value), memo))
+            return result
+        if issubclass(cls, (type, FunctionType, MethodType)) or not hasattr(value, '__dict__'):
+            return value
+        result = object.__new__(cls)
+        memo[id(value)] = result
+        vars(result).update(self._clone(vars(value), memo))
+        return result
+
+    @staticmethod
+    def current():
+        return chain._stack()[-1]
+
+    @staticmethod
+    def _stack():
+        try:
+            return chain.local.stack
+        except AttributeError:
+            chain.local.stack = [chain()]
+            return chain.local.stack
+
+class _block(ModuleType):
+    @property
+    def number(self):
+        return chain.current().number
+
+    @number.setter
+    def number(self, value):
+        chain.current().number = value
+
+    @property
+    def timestamp(self):
+        return chain.current().timestamp
+
+    @timestamp.setter
+    def timestamp(self, value):
+        chain.current().timestamp = value
+
+modules[__name__].__class__ = _block
@@ -1,4 +1,5 @@
 from . uint import uint
+from . block import chain
 from collections import defaultdict
 
 def address(obj):
@@ -7,7 +8,38 @@ def address(obj):
 def payable(obj):
     return obj
 
-mapping = defaultdict
+class mapping(defaultdict):
+    '''
+     * @dev a mapping on the chain which is active when it is constructed (or on the chain of the mapping which contains it),
+     * which journals every entry before it is first accessed after a snapshot of that chain
+    '''
+    def __init__(self, *args):
+        defaultdict.__init__(self, *args)
+        self._chain = chain.current()
+
+    def __missing__(self, key):
+        value = defaultdict.__missing__(self, key)
+        if type(value) is mapping:
+            value._chain = self._chain
+        return value
+
+    def __getitem__(self, key):
+        if self._chain._snapshots:
+            self._chain._record(self, key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        if self._chain._snapshots:
+            self._chain._record(self, key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if self._chain._snapshots:
+            self._chain._record(self, key)
+        dict.__delitem__(self, key)
+
+    def __reduce__(self):
+        return (mapping, (self.default_factory,), vars(self), None, iter(self.items()))
 
 for size in uint.sizes:
     exec('def uint{}(data = 0): return uint({}, data)'.format(size, size))
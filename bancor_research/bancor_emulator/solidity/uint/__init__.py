@@ -2,5 +2,7 @@ from bancor_research.bancor_emulator import config
 
 if config.full_precision_mode:
     from . float import *
+elif config.fast_uint_mode:
+    from . fast import *
 else:
     from . fixed import *
@@ -0,0 +1,175 @@
+from sys import _getframe
+from threading import local
+
+class bounds(dict):
+    def __missing__(self, size):
+        return 2 ** size - 1
+
+class uint:
+    __slots__ = ['size', 'data']
+
+    sizes = [(n + 1) * 8 for n in range(32)]
+    valid = frozenset(sizes)
+    maxes = bounds({size: 2 ** size - 1 for size in sizes})
+
+    def __init__(self, size, other):
+        assert size in uint.valid
+        self.size = size
+        self.data = (other.data if type(other) is uint else int(other)) & uint.maxes[size]
+
+    def clone(self):
+        return uint._make(self.size, self.data)
+
+    def __add__(self, other):
+        return self._new(other, int.__add__)
+
+    def __sub__(self, other):
+        return self._new(other, int.__sub__)
+
+    def __mul__(self, other):
+        return self._new(other, int.__mul__)
+
+    def __truediv__(self, other):
+        return self._new(other, int.__floordiv__)
+
+    def __mod__(self, other):
+        return self._new(other, int.__mod__)
+
+    def __lshift__(self, other):
+        return self._new(other, int.__lshift__)
+
+    def __rshift__(self, other):
+        return self._new(other, int.__rshift__)
+
+    def __and__(self, other):
+        return self._new(other, int.__and__)
+
+    def __xor__(self, other):
+        return self._new(other, int.__xor__)
+
+    def __or__(self, other):
+        return self._new(other, int.__or__)
+
+    def __iadd__(self, other):
+        return self._set(self._new(other, int.__add__))
+
+    def __isub__(self, other):
+        return self._set(self._new(other, int.__sub__))
+
+    def __imul__(self, other):
+        return self._set(self._new(other, int.__mul__))
+
+    def __itruediv__(self, other):
+        return self._set(self._new(other, int.__floordiv__))
+
+    def __imod__(self, other):
+        return self._set(self._new(other, int.__mod__))
+
+    def __ilshift__(self, other):
+        return self._set(self._new(other, int.__lshift__))
+
+    def __irshift__(self, other):
+        return self._set(self._new(other, int.__rshift__))
+
+    def __iand__(self, other):
+        return self._set(self._new(other, int.__and__))
+
+    def __ixor__(self, other):
+        return self._set(self._new(other, int.__xor__))
+
+    def __ior__(self, other):
+        return self._set(self._new(other, int.__or__))
+
+    def __lt__(self, other):
+        return self.data < (other.data if type(other) is uint else int(other))
+
+    def __le__(self, other):
+        return self.data <= (other.data if type(other) is uint else int(other))
+
+    def __eq__(self, other):
+        return self.data == (other.data if type(other) is uint else int(other))
+
+    def __ne__(self, other):
+        return self.data != (other.data if type(other) is uint else int(other))
+
+    def __gt__(self, other):
+        return self.data > (other.data if type(other) is uint else int(other))
+
+    def __ge__(self, other):
+        return self.data >= (other.data if type(other) is uint else int(other))
+
+    def __int__(self):
+        return self.data
+
+    def __str__(self):
+        return str(self.data)
+
+    def __hash__(self):
+        return hash(self.data)
+
+    def _set(self, other):
+        assert self.size >= other.size
+        self.data = other.data
+        return self
+
+    def _new(self, other, op):
+        if type(other) is uint:
+            data = op(self.data, other.data)
+            size = self.size if self.size >= other.size else other.size
+        else:
+            other = int(other)
+            data = op(self.data, other)
+            size = max(self.size, uint._size(other))
+        assert 0 <= data <= uint.maxes[size] or unchecked.scope()
+        assert size in uint.valid
+        return uint._make(size, data & uint.maxes[size])
+
+    @staticmethod
+    def _make(size, data):
+        result = object.__new__(uint)
+        result.size = size
+        result.data = data
+        return result
+
+    @staticmethod
+    def _data(other):
+        return other.data if type(other) is uint else int(other)
+
+    @staticmethod
+    def _size(other):
+        if type(other) is uint:
+            return other.size
+        if other >= 0:
+            return ((other.bit_length() + 7) >> 3 or 1) << 3
+        return (len(hex(other)) - 1) // 2 * 8
+
+class unchecked:
+    local = local()
+
+    @staticmethod
+    def begin():
+        unchecked._stack().append(_getframe(1))
+
+    @staticmethod
+    def end():
+        unchecked._stack().pop()
+
+    @staticmethod
+    def scope():
+        stack = unchecked._stack()
+        return len(stack) > 0 and stack[-1] is unchecked._frame()
+
+    @staticmethod
+    def _stack():
+        try:
+            return unchecked.local.stack
+        except AttributeError:
+            unchecked.local.stack = []
+            return unchecked.local.stack
+
+    @staticmethod
+    def _frame():
+        frame = _getframe(1)
+        while frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        return frame
@@ -65,6 +65,9 @@ class uint:
     def __ge__(self, other):
         return self.data >= uint._data(other)
 
+    def __int__(self):
+        return int(self.data)
+
     def __str__(self):
         return str(self.data)
 
@@ -1,6 +1,5 @@
-from common import read, Decimal
-
-from bancor_research.bancor_emulator.PoolCollectionWithdrawal import PoolCollectionWithdrawal
+from common import read
+from bancor_research.bancor_emulator.PoolCollectionWithdrawalBatch import calculateWithdrawalAmounts, INPUTS, OUTPUTS
 
 maxErrors = {}
 
@@ -12,54 +11,27 @@ def fix(err):
         return err[0: i - 1] + '1'
     return err[0: i] + str(int(err[i]) + 1)
 
-def getMaxErr(x, y, maxDiff, maxErr):
-    z = Decimal(x)
-    w = Decimal(y)
-    maxDiff = Decimal(maxDiff)
-    if not (z - maxDiff <= w <= z + maxDiff):
-        err = abs(w / z - 1) if z != 0 else 1
-        if (err > Decimal(maxErr)):
-            return fix('{:.200f}'.format(err))
-    return maxErr
-
-for fileName in ['PoolCollectionWithdrawalCoverage{}'.format(n + 1) for n in range(8)]:
-    table = read(fileName)
-
-    maxErrors[fileName] = {
-        'p': '0',
-        'q': '0',
-        'r': '0',
-        's': '0',
-        't': '0',
-        'u': '0',
-        'v': '0',
-    }
-
-    for row in table:
-        a, b, c, e, w, m, n, x = [row[z] for z in 'a, b, c, e, w, m, n, x'.split(', ')]
-        p, q, r, s, t, u, v = [row[z] for z in 'p, q, r, s, t, u, v'.split(', ')]
-        actual = PoolCollectionWithdrawal.calculateWithdrawalAmounts(a, b, c, e, w, m, n, x)
-        actual.p = actual.p.value.data * (-1 if actual.p.isNeg else 1)
-        actual.q = actual.q.value.data * (-1 if actual.q.isNeg else 1)
-        actual.r = actual.r.value.data * (-1 if actual.r.isNeg else 1)
-        actual.s = actual.s.data
-        actual.t = actual.t.data
-        actual.u = actual.u.data
-        actual.v = actual.v.data
-        maxErrors[fileName]['p'] = getMaxErr(p, actual.p, '1', maxErrors[fileName]['p'])
-        maxErrors[fileName]['q'] = getMaxErr(q, actual.q, '1', maxErrors[fileName]['q'])
-        maxErrors[fileName]['r'] = getMaxErr(r, actual.r, '1', maxErrors[fileName]['r'])
-        maxErrors[fileName]['s'] = getMaxErr(s, actual.s, '1', maxErrors[fileName]['s'])
-        maxErrors[fileName]['t'] = getMaxErr(t, actual.t, '1', maxErrors[fileName]['t'])
-        maxErrors[fileName]['u'] = getMaxErr(u, actual.u, '1', maxErrors[fileName]['u'])
-        maxErrors[fileName]['v'] = getMaxErr(v, actual.v, '1', maxErrors[fileName]['v'])
-
-    print("            test('{}', {{".format(fileName))
-    print("                p: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['p']))
-    print("                q: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['q']))
-    print("                r: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['r']))
-    print("                s: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['s']))
-    print("                t: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['t']))
-    print("                u: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['u']))
-    print("                v: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }}" .format(maxErrors[fileName]['v']))
-    print("            });\n")
+def getMaxErr(errors):
+    maxErr = max(errors, default = 0)
+    return fix('{:.200f}'.format(maxErr)) if maxErr > 0 else '0'
+
+# the batch calculation runs in worker processes, which import this module on platforms that spawn them
+if __name__ == '__main__':
+    for fileName in ['PoolCollectionWithdrawalCoverage{}'.format(n + 1) for n in range(8)]:
+        table = read(fileName)
+
+        inputs = {z: [row[z] for row in table] for z in INPUTS}
+        expected = {z: [row[z] for row in table] for z in OUTPUTS}
+        _, errors = calculateWithdrawalAmounts(inputs, expected, '1')
+
+        maxErrors[fileName] = {z: getMaxErr(errors[z]) for z in OUTPUTS}
+
+        print("            test('{}', {{".format(fileName))
+        print("                p: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['p']))
+        print("                q: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['q']))
+        print("                r: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['r']))
+        print("                s: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['s']))
+        print("                t: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['t']))
+        print("                u: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }},".format(maxErrors[fileName]['u']))
+        print("                v: {{ maxAbsoluteError: 1, maxRelativeError: '{}' }}" .format(maxErrors[fileName]['v']))
+        print("            });\n")
@@ -0,0 +1,54 @@
+from bancor_research.bancor_emulator.AutoCompoundingRewards import calcExpDecayRewards
+from bancor_research.bancor_emulator.v3.spec.network import BancorDapp
+
+WHITELISTED_TOKENS = {
+    tkn_name: {'decimals': 18, 'trading_fee': '1%', 'bnt_funding_limit': '40000', 'ep_vault_balance': '0'}
+    for tkn_name in ['eth', 'link', 'wbtc', 'tkn']
+}
+
+MODES = {
+    'fixed': {},
+    'fast': {'fast_uint_mode': True, 'fast_math_mode': True},
+    'full': {'full_precision_mode': True},
+}
+
+def create(mode):
+    bancorDapp = BancorDapp(cooldown_time=0, whitelisted_tokens=WHITELISTED_TOKENS, **MODES[mode])
+    for tkn_name in ['bnt'] + list(WHITELISTED_TOKENS):
+        bancorDapp.set_user_balance('alice', tkn_name, '10000000', 1)
+    for tkn_name in WHITELISTED_TOKENS:
+        bancorDapp.deposit(tkn_name, '50000', 'alice', 1)
+    bancorDapp.create_flat_ac_rewards_program('link', 'alice', '100', 1, 20000, 1)
+    bancorDapp.create_exp_ac_rewards_program('eth', 'alice', '100', 1, 5000, 1)
+    bancorDapp.create_flat_ac_rewards_program('wbtc', 'alice', '100', 500, 3000, 1)
+    bancorDapp.create_exp_ac_rewards_program('tkn', 'alice', '100', 1, 5000, 1)
+    bancorDapp.compoundRewards.pauseProgram(bancorDapp.reserveTokens['tkn'], True)
+    return bancorDapp
+
+def state(bancorDapp):
+    compoundRewards = bancorDapp.compoundRewards
+    programs = [
+        {name: str(value) for name, value in vars(compoundRewards._programs[pool]).items() if name != 'poolToken'}
+        for pool in compoundRewards._pools.values()
+    ]
+    return programs, str(compoundRewards._autoProcessRewardsIndex), str(bancorDapp.chain.timestamp), bancorDapp.describe().to_string()
+
+for mode in MODES:
+    expected = create(mode)
+    for timestamp in range(2, 30000, 97):
+        expected.chain.update(timestamp)
+        expected.compoundRewards.autoProcessRewards()
+
+    actual = create(mode)
+    actual.auto_process_ac_rewards_programs(2, 29999, 97)
+
+    assert state(actual) == state(expected), mode
+    # the programs were distributed along the way, rather than left intact
+    assert state(actual) != state(create(mode)), mode
+
+# the cached rewards are returned as copies, which the callers may modify
+rewards = calcExpDecayRewards(10 ** 20, 1000, 5000)
+value = str(rewards)
+rewards -= 1
+assert str(calcExpDecayRewards(10 ** 20, 1000, 5000)) == value
+assert calcExpDecayRewards(10 ** 20, 1000, 5000) is not calcExpDecayRewards(10 ** 20, 1000, 5000)
@@ -0,0 +1,95 @@
+from threading import Thread
+
+from bancor_research.bancor_emulator.solidity import chain, block
+from bancor_research.bancor_emulator.Time import Time
+from bancor_research.bancor_emulator.BlockNumber import BlockNumber
+from bancor_research.bancor_emulator.v3.spec.network import BancorDapp
+
+WHITELISTED_TOKENS = {
+    tkn_name: {'decimals': 18, 'trading_fee': '1%', 'bnt_funding_limit': '40000', 'ep_vault_balance': '0'}
+    for tkn_name in ['eth', 'link']
+}
+
+def create():
+    bancorDapp = BancorDapp(cooldown_time=10, bnt_min_liquidity='10000', whitelisted_tokens=WHITELISTED_TOKENS)
+    for tkn_name in ['bnt', 'eth', 'link']:
+        bancorDapp.set_user_balance('alice', tkn_name, '1000000', 1)
+    for tkn_name in ['eth', 'link']:
+        bancorDapp.deposit(tkn_name, '50000', 'alice', 1)
+        bancorDapp.enable_trading(tkn_name, '1', '1', 1)
+    return bancorDapp
+
+def steps(bancorDapp, start):
+    '''
+     * @dev yields after every action, so that the actions of several networks can be interleaved
+    '''
+    results = []
+    id = bancorDapp.begin_cooldown_by_ptkn('10%', 'eth', 'alice', start)
+    yield
+    results.append(bancorDapp.trade('1000', 'bnt', 'link', 'alice', start + 5))
+    yield
+    try:
+        bancorDapp.withdraw('alice', id, start + 5)
+        results.append('withdrawn')
+    except AssertionError:
+        results.append('reverted')
+    yield
+    results.append(bancorDapp.withdraw('alice', id, start + 10))
+    yield
+    results.append((bancorDapp.chain.number, bancorDapp.chain.timestamp))
+    results.append(bancorDapp.describe().to_string())
+    yield [str(result) for result in results]
+
+def run(bancorDapp, start):
+    return list(steps(bancorDapp, start))[-1]
+
+# each network runs on its own clock, so networks at different times can be interleaved
+expected = [run(create(), 1000), run(create(), 10)]
+assert expected[0][1] == 'reverted' and expected[1][1] == 'reverted'
+assert expected[0][3] == str((4, 1010)) and expected[1][3] == str((4, 20))
+
+bancorDapps = [create(), create()]
+assert bancorDapps[0].chain is not bancorDapps[1].chain
+generators = [steps(bancorDapps[0], 1000), steps(bancorDapps[1], 10)]
+actual = [None, None]
+for _ in range(5):
+    for i in [1, 0]:
+        actual[i] = next(generators[i])
+assert actual == expected
+
+# the contracts read the clock of the chain on which they are constructed, rather than the one which is currently active
+with chain(3, 300) as outer:
+    time = Time()
+    blockNumber = BlockNumber()
+    with chain(4, 400) as inner:
+        assert chain.current() is inner
+        assert (block.number, block.timestamp) == (4, 400)
+        assert (time._time(), blockNumber._blockNumber()) == (300, 3)
+    assert chain.current() is outer
+    assert (block.number, block.timestamp) == (3, 300)
+    outer.update(301)
+    assert (time._time(), blockNumber._blockNumber()) == (301, 4)
+
+# a network's contracts are registered on its own chain only
+contracts = [set(bancorDapp.chain.contracts) for bancorDapp in bancorDapps]
+assert contracts[0] and contracts[1] and contracts[0].isdisjoint(contracts[1])
+assert contracts[0].isdisjoint(chain.current().contracts) and contracts[1].isdisjoint(chain.current().contracts)
+
+# the timestamp of a chain cannot go back in time
+try:
+    outer.update(300)
+    assert False, 'update not reverted'
+except AssertionError as error:
+    assert not str(error)
+
+# each thread has its own stack of active chains
+default = chain.current()
+results = []
+def current():
+    results.append(chain.current() is not default and chain.current() is not outer)
+with outer:
+    thread = Thread(target = current)
+    thread.start()
+    thread.join()
+assert results == [True]
+assert chain.current() is default
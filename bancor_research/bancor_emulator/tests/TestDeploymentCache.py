@@ -0,0 +1,73 @@
+from bancor_research.bancor_emulator.solidity.types import mapping
+from bancor_research.bancor_emulator.v3.spec.network import BancorDapp
+
+WHITELISTED_TOKENS = {
+    tkn_name: {'decimals': 18, 'trading_fee': '1%', 'bnt_funding_limit': '40000', 'ep_vault_balance': '0'}
+    for tkn_name in ['eth', 'link']
+}
+
+def create(cache_deployment, whitelisted_tokens = WHITELISTED_TOKENS, timestamp = 0):
+    return BancorDapp(timestamp=timestamp, cooldown_time=0, bnt_min_liquidity='10000', whitelisted_tokens=whitelisted_tokens, cache_deployment=cache_deployment)
+
+def execute(bancorDapp, amount):
+    results = []
+    for tkn_name in ['bnt', 'eth', 'link']:
+        bancorDapp.set_user_balance('alice', tkn_name, '1000000', 1)
+    for tkn_name in ['eth', 'link']:
+        results.append(bancorDapp.deposit(tkn_name, amount, 'alice', 1))
+        bancorDapp.enable_trading(tkn_name, '1', '1', 1)
+    id = bancorDapp.create_standard_rewards_program('eth', '1000', 1, 10000, 1)
+    bancorDapp.join_standard_rewards_program('eth', '50%', 'alice', id, 2)
+    results.append(bancorDapp.trade('1000', 'bnt', 'link', 'alice', 3))
+    id = bancorDapp.begin_cooldown_by_ptkn('10%', 'eth', 'alice', 4)
+    results.append(bancorDapp.withdraw('alice', id, 4))
+    return [str(result) for result in results], bancorDapp.describe().to_string()
+
+BancorDapp.deployments.clear()
+
+# the cache is opt-in
+create(False)
+assert len(BancorDapp.deployments) == 0
+
+expected = [execute(create(False), amount) for amount in ['50000', '20000']]
+
+first = create(True)
+second = create(True)
+assert len(BancorDapp.deployments) == 1
+
+# a clone shares no contracts, mappings or uints with the network it is cloned from, nor with the cached state
+assert first.chain is not second.chain
+assert set(first.chain.contracts).isdisjoint(second.chain.contracts)
+assert first.network._bntPool is first.bntPool and second.network._bntPool is second.bntPool
+assert second.poolCollection._poolData[second.reserveTokens['eth']].poolToken is second.poolTokens['eth']
+for bancorDapp in [first, second]:
+    for contract in bancorDapp.chain.contracts:
+        for value in vars(contract).values():
+            if isinstance(value, mapping):
+                assert value._chain is bancorDapp.chain
+
+# the networks diverge without affecting each other, and each behaves as a network which is deployed from scratch
+assert execute(first, '50000') == expected[0]
+assert execute(second, '20000') == expected[1]
+assert execute(create(True), '50000') == expected[0]
+
+# the cached state is not modified by the networks cloned from it
+third = create(True)
+assert third.describe().to_string() == create(False).describe().to_string()
+
+# the networks differing in any deployment parameter are cached separately, including the order of their tokens
+reordered = {tkn_name: WHITELISTED_TOKENS[tkn_name] for tkn_name in ['link', 'eth']}
+create(True, reordered)
+assert len(BancorDapp.deployments) == 2
+assert execute(create(True, reordered), '50000') == execute(create(False, reordered), '50000')
+
+# the least recently used deployment is evicted once the cache is full (here the reordered one, since the other one was used after it)
+create(True)
+for timestamp in range(1, BancorDapp.maxDeployments):
+    create(True, timestamp = timestamp)
+assert len(BancorDapp.deployments) == BancorDapp.maxDeployments
+keys = list(BancorDapp.deployments)
+assert keys[-1][0] == BancorDapp.maxDeployments - 1 and keys[0][0] == 0
+assert all(tuple(tkn_name for tkn_name, _ in key[-1]) == ('eth', 'link') for key in keys)
+
+BancorDapp.deployments.clear()
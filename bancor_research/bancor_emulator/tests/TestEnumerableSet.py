@@ -0,0 +1,45 @@
+from bancor_research.bancor_emulator.EnumerableSet import EnumerableSet
+from bancor_research.bancor_emulator.solidity.uint import fast, fixed, float
+
+values = ['a', 'b', 'c', 'd', 'e']
+
+enumerableSet = EnumerableSet()
+for value in values:
+    assert enumerableSet.add(value)
+assert not enumerableSet.add('c')
+assert enumerableSet.values() == values
+
+# the removed value is replaced by the last one, which is popped
+assert enumerableSet.remove('b')
+assert enumerableSet.values() == ['a', 'e', 'c', 'd']
+assert not enumerableSet.remove('b')
+assert not enumerableSet.contains('b')
+
+# removing the last value only pops it
+assert enumerableSet.remove('d')
+assert enumerableSet.values() == ['a', 'e', 'c']
+
+assert enumerableSet.remove('a')
+assert enumerableSet.values() == ['c', 'e']
+
+# a removed value which is added again is appended
+assert enumerableSet.add('a')
+assert enumerableSet.values() == ['c', 'e', 'a']
+assert enumerableSet.length() == 3
+
+# the positions of the moved values are updated, so they can be removed in turn
+for value in ['e', 'c', 'a']:
+    assert enumerableSet.contains(value)
+    assert enumerableSet.remove(value)
+    assert not enumerableSet.contains(value)
+assert enumerableSet.values() == []
+assert enumerableSet.length() == 0
+
+# the values are indexed by integers and by the uints of every mode
+for value in values:
+    enumerableSet.add(value)
+for i, value in enumerate(values):
+    assert enumerableSet.at(i) == value
+    assert enumerableSet.at(fixed.uint(256, i)) == value
+    assert enumerableSet.at(fast.uint(256, i)) == value
+    assert enumerableSet.at(float.uint(256, i)) == value
@@ -0,0 +1,90 @@
+from bancor_research.bancor_emulator import config
+
+MAX_UINT64 = 2 ** 64 - 1
+MAX_UINT96 = 2 ** 96 - 1
+MAX_UINT112 = 2 ** 112 - 1
+MAX_UINT128 = 2 ** 128 - 1
+MAX_UINT256 = 2 ** 256 - 1
+
+TEST_ARRAY = [
+    0,
+    100,
+    10_000,
+    MAX_UINT128,
+    MAX_UINT256 // 2,
+    MAX_UINT256 - MAX_UINT128,
+    MAX_UINT256
+]
+
+modes = [False, True]
+MathEx = {mode: config.load('bancor_research.bancor_emulator.MathEx', fast_math = mode).MathEx for mode in modes}
+Fraction256 = {mode: config.load('bancor_research.bancor_emulator.Fraction', fast_math = mode).Fraction256 for mode in modes}
+
+def toTuple(x):
+    if hasattr(x, 'hi'):
+        return (int(x.hi), int(x.lo))
+    if hasattr(x, 'n'):
+        return (int(x.n), int(x.d))
+    return int(x)
+
+def evaluate(funcName, mode, *args):
+    args = [Fraction256[mode]({ 'n': arg[0], 'd': arg[1] }) if type(arg) is tuple else arg for arg in args]
+    try:
+        return toTuple(getattr(MathEx[mode], funcName)(*args))
+    except (AssertionError, ZeroDivisionError) as error:
+        return '{}({})'.format(type(error).__name__, error)
+
+def test(funcName, *args):
+    print('{}{}'.format(funcName, args))
+    expected = evaluate(funcName, False, *args)
+    actual = evaluate(funcName, True, *args)
+    assert actual == expected, '{} instead of {}'.format(actual, expected)
+    print(actual)
+
+for m in [MAX_UINT112, MAX_UINT128]:
+    for n in range(10):
+        for d in range(10):
+            test('truncatedFraction', (m - n, m - d), m)
+            test('truncatedFraction', (m - n, m + d), m)
+            test('truncatedFraction', (m + n, m - d), m)
+            test('truncatedFraction', (m + n, m + d), m)
+
+for n in [0, 100, 200, MAX_UINT256]:
+    for d in [0, 2, 3, MAX_UINT256]:
+        for m in [0, 3, 5, MAX_UINT256]:
+            test('truncatedFraction', (n, d), m)
+
+for n1 in [0, MAX_UINT64, MAX_UINT96, MAX_UINT128]:
+    for d1 in [MAX_UINT64, MAX_UINT96, MAX_UINT128]:
+        for n2 in [0, MAX_UINT64, MAX_UINT96, MAX_UINT128]:
+            for d2 in [MAX_UINT64, MAX_UINT96, MAX_UINT128]:
+                for weight1 in [0, 2, 8, MAX_UINT256]:
+                    for weight2 in [0, 2, 8, MAX_UINT256]:
+                        test('weightedAverage', (n1, d1), (n2, d2), weight1, weight2)
+
+for px in [128, 192, 256]:
+    for py in [128, 192, 256]:
+        for pz in [128, 192, 256]:
+            for ax in [3, 5, 7]:
+                for ay in [3, 5, 7]:
+                    for az in [3, 5, 7]:
+                        x = 2 ** px // ax
+                        y = 2 ** py // ay
+                        z = 2 ** pz // az
+                        test('mulDivF', x, y, z)
+                        test('mulDivC', x, y, z)
+
+for x in TEST_ARRAY:
+    for y in TEST_ARRAY:
+        for z in TEST_ARRAY:
+            test('mulDivF', x, y, z)
+            test('mulDivC', x, y, z)
+        test('mul512', x, y)
+
+for n in range(10):
+    for d in range(10):
+        test('exp2', (n, d))
+
+for d in [10 ** i for i in range(3, 9)]:
+    for n in list(range(1, 11)) + list(range(d - 10, d + 11)) + list(range(2 * d - 10, 2 * d + 11)) + list(range(16 * d - 10, 16 * d + 11)):
+        test('exp2', (n, d))
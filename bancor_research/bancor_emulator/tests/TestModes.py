@@ -0,0 +1,74 @@
+from sys import modules
+from threading import Thread
+
+from bancor_research.bancor_emulator import config
+from bancor_research.bancor_emulator.v3.spec.network import BancorDapp
+
+WHITELISTED_TOKENS = {
+    tkn_name: {'decimals': 18, 'trading_fee': '1%', 'bnt_funding_limit': '40000', 'ep_vault_balance': '0'}
+    for tkn_name in ['eth', 'link']
+}
+
+MODES = {
+    'fixed': {},
+    'fast': {'fast_uint_mode': True, 'fast_math_mode': True},
+    'full': {'full_precision_mode': True},
+}
+
+def create(mode):
+    bancorDapp = BancorDapp(cooldown_time=0, bnt_min_liquidity='10000', whitelisted_tokens=WHITELISTED_TOKENS, **MODES[mode])
+    for tkn_name in ['bnt', 'eth', 'link']:
+        bancorDapp.set_user_balance('alice', tkn_name, '1000000', 1)
+    for tkn_name in ['eth', 'link']:
+        bancorDapp.deposit(tkn_name, '50000', 'alice', 1)
+        bancorDapp.enable_trading(tkn_name, '1', '1', 1)
+    return bancorDapp
+
+def execute(bancorDapp, timestamp):
+    return [
+        str(bancorDapp.trade('1000.3', 'bnt', 'eth', 'alice', timestamp)),
+        str(bancorDapp.trade('70.1', 'eth', 'link', 'alice', timestamp)),
+        str(bancorDapp.deposit('link', '33.3', 'alice', timestamp)),
+    ]
+
+mode = config.mode()
+emulatorModules = {name: module for name, module in modules.items() if name.startswith('bancor_research.bancor_emulator')}
+
+# dapps of different modes can be built concurrently, including the first one built in each mode
+built = {}
+threads = [Thread(target=lambda name=name: built.update({name: create(name)})) for name in MODES for _ in range(3)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+assert config.mode() == mode
+
+bancorDapps = {name: create(name) for name in MODES}
+
+for name in MODES:
+    assert type(built[name]) is type(bancorDapps[name])
+    assert built[name].describe().to_string() == bancorDapps[name].describe().to_string()
+
+# each dapp is built from the contracts imported in its own mode, while the current mode and its modules are unchanged
+assert config.mode() == mode
+assert {name: module for name, module in modules.items() if name.startswith('bancor_research.bancor_emulator')} == emulatorModules
+assert type(bancorDapps['fixed']) is BancorDapp
+assert len({type(bancorDapp) for bancorDapp in bancorDapps.values()}) == len(MODES)
+assert len({type(bancorDapp.bnt._totalSupply) for bancorDapp in bancorDapps.values()}) == len(MODES)
+for name, bancorDapp in bancorDapps.items():
+    assert type(bancorDapp).mode == config.mode(**{key[:-len('_mode')]: value for key, value in MODES[name].items()})
+
+# the dapps run side by side, interleaved, and each one matches a dapp which runs alone in the same mode
+results = {name: [] for name in MODES}
+for timestamp in range(2, 6):
+    for name, bancorDapp in bancorDapps.items():
+        results[name].append(execute(bancorDapp, timestamp))
+
+for name in MODES:
+    bancorDapp = create(name)
+    assert [execute(bancorDapp, timestamp) for timestamp in range(2, 6)] == results[name]
+    assert bancorDapp.describe().to_string() == bancorDapps[name].describe().to_string()
+
+# the fast implementations yield the same outputs as the fixed ones, unlike the full precision implementations
+assert results['fast'] == results['fixed']
+assert results['full'] != results['fixed']
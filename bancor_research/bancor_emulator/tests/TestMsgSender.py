@@ -0,0 +1,68 @@
+from threading import Thread
+
+from bancor_research.bancor_emulator.utils import contract
+
+class Callee(contract):
+    def __init__(self) -> None:
+        contract.__init__(self)
+
+    def sender(self):
+        return self.msg_sender
+
+    def fail(self):
+        assert False, 'failed'
+
+class Caller(contract):
+    def __init__(self, callee) -> None:
+        contract.__init__(self)
+        self.callee = callee
+
+    def sender(self):
+        return self.msg_sender
+
+    def senders(self):
+        return [self.msg_sender, self.callee.sender(), self.msg_sender, self._sender()]
+
+    def _sender(self):
+        return self.msg_sender
+
+    def callThrough(self, other):
+        return other.senders()
+
+    def fail(self):
+        self.callee.fail()
+
+callee = Callee()
+caller = Caller(callee)
+other = Caller(callee)
+
+# a call from outside the chain is sent by the connected account
+assert caller.connect('alice').sender() == 'alice'
+assert callee.connect('bob').sender() == 'bob'
+
+# a call from a contract is sent by that contract, and the sender of the outer call is restored once it returns
+assert caller.senders() == ['alice', caller, 'alice', caller]
+
+# each contract along a chain of calls is sent the call by the contract below it
+assert other.connect('carol').callThrough(caller) == [other, caller, other, caller]
+assert other.sender() == 'carol'
+
+# the call stack is unwound when a call reverts
+try:
+    caller.fail()
+    assert False, 'call not reverted'
+except AssertionError as error:
+    assert str(error) == 'failed'
+assert contract.context.stack == []
+assert caller.sender() == 'alice'
+
+# each thread has its own call stack
+results = []
+def run():
+    results.append((caller.senders(), list(contract.context.stack)))
+threads = [Thread(target = run) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+assert results == [(['alice', caller, 'alice', caller], [])] * 4
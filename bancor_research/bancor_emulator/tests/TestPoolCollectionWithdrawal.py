@@ -1,6 +1,7 @@
 from common import read, assertAlmostEqual, LesserOrEqual, GreaterOrEqual
 
 from bancor_research.bancor_emulator.PoolCollectionWithdrawal import PoolCollectionWithdrawal
+from bancor_research.bancor_emulator.PoolCollectionWithdrawalBatch import calculateWithdrawalAmounts, INPUTS, OUTPUTS
 
 maxErrors = {
     'PoolCollectionWithdrawalCoverage1': {
@@ -86,6 +87,7 @@ maxErrors = {
 
 for fileName in maxErrors:
     table = read(fileName)
+    rows = []
 
     for row in table:
         a, b, c, e, w, m, n, x = [row[z] for z in 'a, b, c, e, w, m, n, x'.split(', ')]
@@ -115,3 +117,9 @@ for fileName in maxErrors:
         assertAlmostEqual(t, actual.t, **maxErrors[fileName]['t'])
         assertAlmostEqual(u, actual.u, **maxErrors[fileName]['u'])
         assertAlmostEqual(v, actual.v, **maxErrors[fileName]['v'])
+        rows.append([getattr(actual, z) for z in OUTPUTS])
+
+    # the batch calculation yields the same outputs as the row-by-row calculation
+    inputs = {z: [row[z] for row in table] for z in INPUTS}
+    outputs, _ = calculateWithdrawalAmounts(inputs, maxWorkers = 1, chunkSize = 100)
+    assert [list(row) for row in zip(*[outputs[z] for z in OUTPUTS])] == rows, fileName
@@ -0,0 +1,121 @@
+import os
+import tempfile
+
+from bancor_research.bancor_emulator.solidity import uint, uint256
+from bancor_research.bancor_emulator.utils import contract
+from bancor_research.bancor_emulator.utils.profiler import profiler
+from bancor_research.bancor_emulator.MathEx import MathEx
+from bancor_research.bancor_emulator.v3.spec.network import BancorDapp
+
+class Inner(contract):
+    def __init__(self) -> None:
+        contract.__init__(self)
+
+    def add(self, x, y):
+        return x + y
+
+class Outer(contract):
+    def __init__(self, inner) -> None:
+        contract.__init__(self)
+        self.inner = inner
+
+    def run(self, x):
+        return self.inner.add(self.inner.add(x, x), x) * x
+
+    def recurse(self, n):
+        return self.recurse(n - 1) + self.inner.add(n, n) if n > 0 else n
+
+outer = Outer(Inner())
+
+# the tree of calls records the calls, the uint operations and the wall time of every node
+with profiler() as p:
+    results = [outer.run(uint256(2)), outer.run(uint256(3))]
+assert results == [12, 27]
+
+run = p.root.children['Outer.run']
+add = run.children['Inner.add']
+assert list(p.root.children) == ['Outer.run']
+assert (run.calls, run.ops, run.selfOps()) == (2, 6, 2)
+assert (add.calls, add.ops, add.selfOps(), add.children) == (4, 4, 4, {})
+assert p.ops == 6
+assert run.time >= add.time > 0 and run.selfTime() == run.time - add.time
+
+# the summary counts a recursive call once in the totals of its outermost call
+with profiler() as p:
+    result = outer.recurse(uint256(3))
+assert result == 12
+
+summary = p.summary()
+assert list(summary.columns) == ['calls', 'time', 'self time', 'uint ops', 'self uint ops']
+assert summary['self time'].is_monotonic_decreasing
+assert summary.loc['Outer.recurse', 'calls'] == 4
+assert summary.loc['Inner.add', 'calls'] == 3
+assert summary.loc['Outer.recurse', 'uint ops'] == p.ops == summary['self uint ops'].sum()
+assert abs(summary.loc['Outer.recurse', 'time'] - p.root.children['Outer.recurse'].time) < 1e-9
+
+# the folded stacks hold one line per node, with its self time in microseconds
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'recurse.folded')
+    p.save(path)
+    with open(path) as file:
+        lines = [line.split(' ') for line in file.read().splitlines()]
+stacks = [stack for stack, _ in lines]
+assert set(stacks) == {
+    'Outer.recurse',
+    'Outer.recurse;Outer.recurse',
+    'Outer.recurse;Outer.recurse;Outer.recurse',
+    'Outer.recurse;Outer.recurse;Outer.recurse;Outer.recurse',
+    'Outer.recurse;Inner.add',
+    'Outer.recurse;Outer.recurse;Inner.add',
+    'Outer.recurse;Outer.recurse;Outer.recurse;Inner.add',
+}
+assert len(stacks) == 7 and all(int(micros) >= 0 for _, micros in lines)
+
+# only one profiler is active at a time
+with profiler():
+    try:
+        with profiler():
+            assert False, 'profiler not rejected'
+    except AssertionError as error:
+        assert str(error) == 'profiler already active'
+
+# the instrumentation is removed once the profiler exits, even when the profiled code reverts
+operators = {name: vars(uint).get(name) for name in vars(uint)}
+mulDivF = vars(MathEx)['mulDivF']
+try:
+    with profiler():
+        outer.recurse(uint256(2))
+        assert False, 'failed'
+except AssertionError as error:
+    assert str(error) == 'failed'
+assert contract.context.profiler is None
+assert {name: vars(uint).get(name) for name in vars(uint)} == operators
+assert vars(MathEx)['mulDivF'] is mulDivF
+
+# the library functions called by the contracts are recorded in the tree, without affecting the results
+WHITELISTED_TOKENS = {
+    tkn_name: {'decimals': 18, 'trading_fee': '1%', 'bnt_funding_limit': '40000', 'ep_vault_balance': '0'}
+    for tkn_name in ['eth']
+}
+
+def create():
+    bancorDapp = BancorDapp(cooldown_time=0, bnt_min_liquidity='10000', whitelisted_tokens=WHITELISTED_TOKENS)
+    for tkn_name in ['bnt', 'eth']:
+        bancorDapp.set_user_balance('alice', tkn_name, '1000000', 1)
+    bancorDapp.deposit('eth', '50000', 'alice', 1)
+    bancorDapp.enable_trading('eth', '1', '1', 1)
+    return bancorDapp
+
+bancorDapps = [create(), create()]
+expected = bancorDapps[0].trade('1000', 'bnt', 'eth', 'alice', 2)
+with profiler() as p:
+    result = bancorDapps[1].trade('1000', 'bnt', 'eth', 'alice', 2)
+assert result == expected
+assert bancorDapps[1].describe().to_string() == bancorDapps[0].describe().to_string()
+
+trade = p.root.children['BancorNetwork.tradeBySourceAmount']
+summary = p.summary()
+assert trade.calls == 1 and trade.ops > 0
+assert summary.loc['MathEx.mulDivF', 'calls'] > 0
+assert summary.loc['BancorNetwork._trade', 'uint ops'] <= trade.ops
+assert summary['self uint ops'].sum() == p.ops
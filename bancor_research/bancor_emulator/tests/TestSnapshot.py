@@ -0,0 +1,52 @@
+from bancor_research.bancor_emulator.v3.spec.network import BancorDapp
+
+WHITELISTED_TOKENS = {
+    tkn_name: {'decimals': 18, 'trading_fee': '1%', 'bnt_funding_limit': '40000', 'ep_vault_balance': '0'}
+    for tkn_name in ['eth', 'link']
+}
+
+USER_NAMES = ['alice', 'bob']
+
+bancorDapp = BancorDapp(cooldown_time=0, bnt_min_liquidity='10000', whitelisted_tokens=WHITELISTED_TOKENS)
+
+for user_name in USER_NAMES:
+    for tkn_name in ['bnt', 'eth', 'link']:
+        bancorDapp.set_user_balance(user_name, tkn_name, '1000000', 1)
+
+for tkn_name in ['eth', 'link']:
+    bancorDapp.deposit(tkn_name, '50000', 'alice', 1)
+    bancorDapp.enable_trading(tkn_name, '1', '1', 1)
+
+def execute(timestamp):
+    results = []
+    for tkn_name in ['eth', 'link']:
+        results.append(bancorDapp.deposit(tkn_name, '1000', 'bob', timestamp))
+        id = bancorDapp.begin_cooldown_by_ptkn('50%', tkn_name, 'bob', timestamp)
+        results.append(bancorDapp.withdraw('bob', id, timestamp))
+        results.append(bancorDapp.trade('1000', 'bnt', tkn_name, 'bob', timestamp))
+    return [str(result) for result in results], bancorDapp.describe().to_string()
+
+state = bancorDapp.describe().to_string()
+
+outer = bancorDapp.snapshot()
+expected = execute(100)
+assert bancorDapp.describe().to_string() != state
+bancorDapp.revert(outer)
+assert bancorDapp.describe().to_string() == state
+assert bancorDapp.chain.timestamp == 1
+
+for n in range(3):
+    outer = bancorDapp.snapshot()
+    assert execute(100) == expected
+    inner = bancorDapp.snapshot()
+    bancorDapp.trade('1000', 'eth', 'bnt', 'alice', 100000)
+    bancorDapp.revert(inner)
+    assert bancorDapp.describe().to_string() == expected[1]
+    bancorDapp.revert(outer)
+    assert bancorDapp.describe().to_string() == state
+
+try:
+    bancorDapp.revert(inner)
+    assert False
+except AssertionError as error:
+    assert str(error) == 'unknown snapshot {}'.format(inner)
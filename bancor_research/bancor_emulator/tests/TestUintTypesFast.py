@@ -0,0 +1,101 @@
+from threading import Thread
+
+from bancor_research.bancor_emulator import config
+
+modes = [False, True]
+uint = {mode: config.load('bancor_research.bancor_emulator.solidity.uint', fast_uint = mode).uint for mode in modes}
+unchecked = {mode: config.load('bancor_research.bancor_emulator.solidity.uint', fast_uint = mode).unchecked for mode in modes}
+
+assert uint[False] is not uint[True]
+
+def add(x, y): return x + y
+def sub(x, y): return x - y
+def mul(x, y): return x * y
+def div(x, y): return x / y
+
+ops = [add, sub, mul, div]
+
+def Result(mode, op, x, y):
+    try:
+        z = op(uint[mode](*x), uint[mode](*y) if type(y) is tuple else y)
+        return z.size, int(z)
+    except AssertionError:
+        return 'reverted'
+
+values = [0, 1, 2]
+for size in [8, 32, 112, 128, 256]:
+    values += [2 ** (size - 1) - 1, 2 ** (size - 1), 2 ** size - 2, 2 ** size - 1]
+
+operands = [(size, value) for size in [8, 32, 112, 128, 256] for value in values]
+
+# the fast uints yield the same results as the fixed ones, and revert on the same overflows
+for op in ops:
+    for x in operands:
+        for y in operands + [1, 2 ** 100, 2 ** 256 - 1]:
+            if op is div and (y[1] % 2 ** y[0] if type(y) is tuple else y) == 0:
+                continue
+            results = [Result(mode, op, x, y) for mode in modes]
+            assert results[0] == results[1], (op.__name__, x, y, results)
+
+# within an unchecked block, the fast uints wrap around like the fixed ones
+for mode in modes:
+    x = uint[mode](32, 2 ** 32 - 1)
+    y = uint[mode](32, 2)
+
+    unchecked[mode].begin()
+    assert int(x + y) == 1
+    assert int(uint[mode](32, 1) - y) == 2 ** 32 - 1
+    assert int(x * y) == 2 ** 32 - 2
+    unchecked[mode].end()
+
+    for op in [add, mul]:
+        try:
+            op(x, y)
+            assert False, 'overflow not reverted'
+        except AssertionError as error:
+            assert not str(error)
+
+    # the unchecked block applies only to the operations in the function which began it, not to the functions it calls
+    unchecked[mode].begin()
+    try:
+        add(x, y)
+        assert False, 'overflow not reverted'
+    except AssertionError as error:
+        assert not str(error)
+    unchecked[mode].end()
+
+    # an unchecked block which is begun in a called function ends with it
+    def wrap(x, y):
+        unchecked[mode].begin()
+        z = x + y
+        unchecked[mode].end()
+        return z
+
+    assert int(wrap(x, y)) == 1
+    try:
+        x + y
+        assert False, 'overflow not reverted'
+    except AssertionError as error:
+        assert not str(error)
+
+    # nested blocks restore the enclosing block when they end
+    unchecked[mode].begin()
+    assert int(wrap(x, y)) == 1
+    assert int(x + y) == 1
+    unchecked[mode].end()
+
+# the unchecked blocks of the fast uints are kept per thread
+x = uint[True](32, 2 ** 32 - 1)
+results = []
+def run():
+    try:
+        results.append(int(x + 2))
+    except AssertionError:
+        results.append('reverted')
+unchecked[True].begin()
+thread = Thread(target = run)
+thread.start()
+thread.join()
+assert int(x + 2) == 1
+unchecked[True].end()
+assert results == ['reverted']
@@ -1,14 +1,23 @@
-import inspect
+from functools import wraps
+from threading import local
+from types import FunctionType
+from bancor_research.bancor_emulator.solidity import chain
+
+# every library, and every class which uses a library (along with that library)
+libraries = []
+usings = []
 
 def library(globalVars, classHandle):
     for varName in vars(classHandle):
         if not varName.startswith('__'):
             setattr(classHandle, varName, globalVars[varName])
+    libraries.append(classHandle)
 
 def using(libraryHandle, classHandle):
     for varName in vars(libraryHandle):
         if not varName.startswith('__'):
             setattr(classHandle, varName, getattr(libraryHandle, varName))
+    usings.append((libraryHandle, classHandle))
 
 def parse(cast, var, attr):
     if type(var) is dict:
@@ -19,9 +28,37 @@ def parse(cast, var, attr):
         return cast(var)
     return cast(0)
 
+class context(local):
+    def __init__(self):
+        self.stack = []
+        self.profiler = None
+
+def call(function):
+    name = function.__qualname__
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        context = contract.context
+        context.stack.append(self)
+        try:
+            if context.profiler is None:
+                return function(self, *args, **kwargs)
+            return context.profiler.record(name, function, self, *args, **kwargs)
+        finally:
+            context.stack.pop()
+    return wrapper
+
 class contract:
+    context = context()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if type(value) is FunctionType and (name == '__init__' or not name.startswith('__')):
+                setattr(cls, name, call(value))
+
     def __init__(self):
         self._msg_sender = None
+        chain.current().contracts[self] = None
 
     def connect(self, _msg_sender):
         self._msg_sender = _msg_sender
@@ -29,5 +66,5 @@ class contract:
 
     @property
     def msg_sender(self):
-        f_locals = inspect.currentframe().f_back.f_back.f_locals
-        return f_locals['self'] if 'self' in f_locals and isinstance(f_locals['self'], contract) else self._msg_sender
+        stack = contract.context.stack
+        return stack[-2] if len(stack) > 1 else self._msg_sender
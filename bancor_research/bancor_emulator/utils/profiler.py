@@ -0,0 +1,146 @@
+from functools import wraps
+from time import perf_counter
+from types import FunctionType
+
+from bancor_research import DataFrame
+from bancor_research.bancor_emulator.solidity import uint
+from bancor_research.bancor_emulator.utils import contract, libraries, usings
+
+_MISSING = object()
+
+# the uint operations which are counted while profiling
+OPERATORS = [
+    name for name, value in vars(uint).items()
+    if type(value) is FunctionType and name.startswith('__') and name not in ['__init__', '__int__', '__str__', '__hash__']
+]
+
+class node:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.time = 0
+        self.ops = 0
+        self.children = {}
+
+    def selfTime(self):
+        return self.time - sum(child.time for child in self.children.values())
+
+    def selfOps(self):
+        return self.ops - sum(child.ops for child in self.children.values())
+
+class profiler:
+    '''
+     * @dev records the tree of calls to contract functions and library functions on the current thread,
+     * along with the number of calls, the wall time and the number of uint operations of each node in the tree
+     *
+     * usage:
+     *     with profiler() as p:
+     *         bancorDapp.trade(...)
+     *     p.summary()
+     *     p.save('trade.folded')
+     *
+     * the uint operators and the library functions are instrumented only within the `with` block,
+     * and the contract functions check for an active profiler before anything else
+    '''
+    def __init__(self):
+        self.root = node(None)
+        self.ops = 0
+        self._node = self.root
+        self._originals = []
+
+    def __enter__(self):
+        assert contract.context.profiler is None, 'profiler already active'
+        for name in OPERATORS:
+            self._replace(uint, name, counted(getattr(uint, name)))
+        for library in libraries:
+            for name, value in list(vars(library).items()):
+                if type(value) is FunctionType and not name.startswith('__'):
+                    self._replace(library, name, traced('{}.{}'.format(library.__name__, name), value))
+        for library, classHandle in usings:
+            for name in vars(library):
+                if not name.startswith('__'):
+                    self._replace(classHandle, name, getattr(library, name))
+        contract.context.profiler = self
+        return self
+
+    def __exit__(self, *args):
+        contract.context.profiler = None
+        for classHandle, name, value in reversed(self._originals):
+            if value is _MISSING:
+                delattr(classHandle, name)
+            else:
+                setattr(classHandle, name, value)
+        self._originals.clear()
+
+    def record(self, name, function, *args, **kwargs):
+        parent = self._node
+        child = parent.children.get(name)
+        if child is None:
+            child = parent.children[name] = node(name)
+        self._node = child
+        ops = self.ops
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            child.time += perf_counter() - start
+            child.calls += 1
+            child.ops += self.ops - ops
+            self._node = parent
+
+    def summary(self):
+        '''
+         * @dev returns the number of calls, the wall time (in seconds) and the number of uint operations of every function,
+         * both including and excluding the functions which it calls, ordered by the wall time excluding these functions
+        '''
+        table = {}
+        def visit(n, path):
+            row = table.setdefault(n.name, {'calls': 0, 'time': 0, 'self time': 0, 'uint ops': 0, 'self uint ops': 0})
+            row['calls'] += n.calls
+            row['self time'] += n.selfTime()
+            row['self uint ops'] += n.selfOps()
+            if n.name not in path:
+                # a recursive call is already included in the totals of its outermost call
+                row['time'] += n.time
+                row['uint ops'] += n.ops
+            for child in n.children.values():
+                visit(child, path | {n.name})
+        for child in self.root.children.values():
+            visit(child, frozenset())
+        return DataFrame.from_dict(table, orient='index').sort_values('self time', ascending=False)
+
+    def save(self, path: str):
+        '''
+         * @dev saves the tree of calls in the folded-stacks format (`caller;callee microseconds` per line),
+         * which is supported by flamegraph.pl, speedscope and most other flame-graph viewers
+        '''
+        with open(path, 'w') as file:
+            def visit(n, stack):
+                stack = stack + [n.name]
+                file.write('{} {}\n'.format(';'.join(stack), round(n.selfTime() * 1e6)))
+                for child in n.children.values():
+                    visit(child, stack)
+            for child in self.root.children.values():
+                visit(child, [])
+
+    def _replace(self, classHandle, name, value):
+        self._originals.append((classHandle, name, vars(classHandle).get(name, _MISSING)))
+        setattr(classHandle, name, value)
+
+def counted(function):
+    @wraps(function)
+    def wrapper(*args):
+        p = contract.context.profiler
+        if p is not None:
+            p.ops += 1
+        return function(*args)
+    return wrapper
+
+def traced(name, function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        p = contract.context.profiler
+        if p is None:
+            return function(*args, **kwargs)
+        return p.record(name, function, *args, **kwargs)
+    return wrapper
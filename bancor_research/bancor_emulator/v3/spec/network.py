@@ -1,4 +1,8 @@
-from bancor_research.bancor_emulator.solidity import uint, uint32, uint256, block
+from collections import OrderedDict
+from typing import Union
+
+from bancor_research.bancor_emulator import config
+from bancor_research.bancor_emulator.solidity import uint, uint32, uint256, chain
 
 from bancor_research.bancor_emulator.AutoCompoundingRewards import AutoCompoundingRewards
 from bancor_research.bancor_emulator.BancorNetwork          import BancorNetwork         
@@ -16,7 +20,7 @@ from bancor_research.bancor_emulator.StandardRewards        import StandardRewar
 from bancor_research.bancor_emulator.TokenGovernance        import TokenGovernance       
 from bancor_research.bancor_emulator.Vault                  import Vault                 
 
-from bancor_research import DEFAULT, Decimal, DataFrame, PandasDataFrame, read_price_feeds
+from bancor_research import DEFAULT, Decimal, DataFrame, PandasDataFrame, PriceFeeds, read_price_feeds
 
 def toPPM(percent: str):
     return uint32(Decimal(str(PPM_RESOLUTION)) * Decimal(percent[:-1]) / 100)
@@ -36,14 +40,20 @@ def userAmount(token: ERC20, userId: str, amount: str):
         return token.balanceOf(userId) * n / (d * 100)
     return toWei(amount, token.decimals())
 
-def updateBlock(timestamp):
-    if block.timestamp < timestamp:
-        block.timestamp = timestamp
-        block.number += 1
-    else:
-        assert block.timestamp == timestamp
-
 class BancorDapp:
+    mode = config.mode()
+
+    # the initial state of the networks most recently deployed with `cache_deployment`, keyed by their parameters
+    deployments = OrderedDict()
+    maxDeployments = 8
+
+    def __new__(cls, *args, full_precision_mode: bool = None, fast_uint_mode: bool = None, fast_math_mode: bool = None, **kwargs):
+        mode = config.mode(full_precision_mode, fast_uint_mode, fast_math_mode)
+        if mode != cls.mode:
+            # construct the instance from the contracts imported in the requested mode
+            return config.load(__name__, *mode).BancorDapp(*args, full_precision_mode=mode[0], fast_uint_mode=mode[1], fast_math_mode=mode[2], **kwargs)
+        return super().__new__(cls)
+
     def __init__(
         self,
         timestamp: int = DEFAULT.TIMESTAMP,
@@ -53,13 +63,39 @@ class BancorDapp:
         network_fee: str = DEFAULT.NETWORK_FEE,
         whitelisted_tokens = DEFAULT.WHITELIST,
         price_feeds_path: str = DEFAULT.PRICE_FEEDS_PATH,
-        price_feeds: PandasDataFrame = DEFAULT.PRICE_FEEDS,
+        price_feeds: Union[PriceFeeds, PandasDataFrame] = DEFAULT.PRICE_FEEDS,
         log_state: bool = True,
+        full_precision_mode: bool = None,
+        fast_uint_mode: bool = None,
+        fast_math_mode: bool = None,
+        cache_deployment: bool = False,
     ):
-        block.timestamp = 0
-        block.number = 0
-        updateBlock(timestamp)
-
+        key = (timestamp, bnt_min_liquidity, withdrawal_fee, cooldown_time, network_fee, tuple(
+            (tkn_name, tuple(sorted(pool_params.items()))) for tkn_name, pool_params in whitelisted_tokens.items()
+        ))
+
+        if cache_deployment and key in BancorDapp.deployments:
+            # copy the initial state of an identical network rather than deploying it again
+            BancorDapp.deployments.move_to_end(key)
+            deployment = BancorDapp.deployments[key]
+            vars(self).update(deployment['chain'].clone(deployment))
+        else:
+            self.chain = chain()
+            self.chain.update(timestamp)
+            with self.chain:
+                self._deploy(bnt_min_liquidity, withdrawal_fee, cooldown_time, network_fee, whitelisted_tokens)
+            if cache_deployment:
+                BancorDapp.deployments[key] = self.chain.clone(dict(vars(self)))
+                if len(BancorDapp.deployments) > BancorDapp.maxDeployments:
+                    BancorDapp.deployments.popitem(last=False)
+
+        if price_feeds is None:
+            price_feeds = read_price_feeds(price_feeds_path)
+        elif isinstance(price_feeds, DataFrame):
+            price_feeds = PriceFeeds.from_frame(price_feeds)
+        self.price_feeds = price_feeds
+
+    def _deploy(self, bnt_min_liquidity, withdrawal_fee, cooldown_time, network_fee, whitelisted_tokens):
         self.bnt   = ReserveToken('bnt'  , 'bnt'  , DEFAULT.DECIMALS)
         self.vbnt  = ReserveToken('vbnt' , 'vbnt' , DEFAULT.DECIMALS)
         self.bnbnt = PoolToken   ('bnbnt', 'bnbnt', DEFAULT.DECIMALS, self.bnt)
@@ -110,7 +146,8 @@ class BancorDapp:
             self.reserveTokens[tkn_name] = tkn
             self.poolTokens[tkn_name] = self.network.collectionByPool(tkn).poolToken(tkn)
 
-        self.price_feeds = price_feeds if price_feeds is not None else read_price_feeds(price_feeds_path)
+        # the users who have joined a standard rewards program, in the order in which they first joined one
+        self.rewardsProviders = []
 
     def deposit(
         self,
@@ -120,7 +157,7 @@ class BancorDapp:
         timestamp: int = 0,
         action_name="deposit",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.reserveTokens[tkn_name]
         amt = userAmount(tkn, user_name, tkn_amt)
         tkn.connect(user_name).approve(self.network, amt)
@@ -135,7 +172,7 @@ class BancorDapp:
         timestamp: int,
         transaction_type: str = "trade",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         src_tkn = self.reserveTokens[source_token]
         trg_tkn = self.reserveTokens[target_token]
         src_amt = userAmount(src_tkn, user_name, tkn_amt)
@@ -150,7 +187,7 @@ class BancorDapp:
         timestamp: int = 0,
         action_name: str = "begin cooldown by reserve token amount",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.poolTokens[tkn_name]
         amt = self.networkInfo.underlyingToPoolToken(self.reserveTokens[tkn_name], userAmount(self.reserveTokens[tkn_name], user_name, tkn_amt))
         tkn.connect(user_name).approve(self.network, amt)
@@ -165,7 +202,7 @@ class BancorDapp:
         timestamp: int = 0,
         action_name: str = "begin cooldown by pool token amount",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.poolTokens[tkn_name]
         amt = userAmount(tkn, user_name, tkn_amt)
         tkn.connect(user_name).approve(self.network, amt)
@@ -179,7 +216,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "withdraw",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         return self.network.connect(user_name).withdraw(id_number)
 
     def burn_pool_tokens(
@@ -190,7 +227,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "burnPoolTokenTKN",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.poolTokens[tkn_name]
         amt = userAmount(tkn, user_name, tkn_amt)
         tkn.connect(user_name).burn(amt)
@@ -204,7 +241,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type="create_standard_rewards_program",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.reserveTokens[tkn_name]
         amt = toWei(rewards_amt, self.bnt.decimals())
         return self.standardRewards.createProgram(tkn, amt, start_time, end_time)
@@ -218,11 +255,14 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type="join_standard_rewards_program",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.poolTokens[tkn_name]
         amt = userAmount(tkn, user_name, tkn_amt)
         tkn.connect(user_name).approve(self.standardRewards, amt)
-        return self.standardRewards.connect(user_name).join(program_id, amt)
+        result = self.standardRewards.connect(user_name).join(program_id, amt)
+        if user_name not in self.rewardsProviders:
+            self.rewardsProviders.append(user_name)
+        return result
 
     def leave_standard_rewards_program(
         self,
@@ -233,7 +273,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type="leave_standard_rewards_program",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.poolTokens[tkn_name]
         amt = userAmount(tkn, user_name, tkn_amt)
         return self.standardRewards.connect(user_name).leave(program_id, amt)
@@ -245,9 +285,37 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "claim_standard_rewards",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         return self.standardRewards.connect(user_name).claimRewards(program_ids)
 
+    def get_pending_standard_rewards(
+        self,
+        program_ids: list = None,
+        user_names: list = None,
+        timestamp: int = None,
+    ):
+        '''
+         * @dev returns the rewards pending for each user (rows) in each program (columns) at a given timestamp
+         * (by default, the current one), without modifying the state
+         * all the programs, and all the users who joined one of them (sorted by name), are included by default
+        '''
+        if program_ids is None:
+            program_ids = self.standardRewards.programIds()
+        if user_names is None:
+            user_names = sorted(self.rewardsProviders)
+        id = self.chain.snapshot()
+        try:
+            if timestamp is not None:
+                self.chain.update(timestamp)
+            table = self.standardRewards.pendingRewardsTable(user_names, program_ids)
+        finally:
+            self.chain.revert(id)
+        return DataFrame(
+            [[fromWei(reward, self.bnt.decimals()) for reward in row] for row in table],
+            index=user_names,
+            columns=[int(id) for id in program_ids],
+        )
+
     def create_flat_ac_rewards_program(
         self,
         tkn_name: str,
@@ -258,7 +326,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "create flat autocompounding rewards program",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.reserveTokens[tkn_name]
         amt = userAmount(tkn, user_name, total_rewards)
         self.poolTokens[tkn_name].connect(user_name).transfer(self.erVault, self.networkInfo.underlyingToPoolToken(tkn, amt))
@@ -274,7 +342,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "create exp autocompounding rewards program",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.reserveTokens[tkn_name]
         amt = userAmount(tkn, user_name, total_rewards)
         self.poolTokens[tkn_name].connect(user_name).transfer(self.erVault, self.networkInfo.underlyingToPoolToken(tkn, amt))
@@ -286,17 +354,25 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "process autocompounding rewards program",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.reserveTokens[tkn_name]
         return self.compoundRewards.processRewards(tkn)
 
+    def auto_process_ac_rewards_programs(
+        self,
+        start_time: int,
+        end_time: int,
+        interval: int = 1,
+    ):
+        return self.compoundRewards.autoProcessRewardsOver(range(start_time, end_time + 1, interval))
+
     def terminate_ac_rewards_program(
         self,
         tkn_name: str,
         timestamp: int = 0,
         transaction_type: str = "terminate autocompounding rewards program",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.reserveTokens[tkn_name]
         return self.compoundRewards.terminateProgram(tkn)
 
@@ -308,7 +384,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "set user balance",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.reserveTokens[tkn_name]
         balance = tkn.balanceOf(user_name)
         amount = toWei(tkn_amt, tkn.decimals())
@@ -330,7 +406,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "set trading fee",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         self.poolCollection.setTradingFeePPM(self.reserveTokens[tkn_name], toPPM(percent))
 
     def set_network_fee(
@@ -340,7 +416,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "set network fee",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         self.poolCollection.setNetworkFeePPM(toPPM(percent))
 
     def set_withdrawal_fee(
@@ -350,7 +426,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "set withdrawal fee",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         self.networkSettings.setWithdrawalFeePPM(toPPM(percent))
 
     def set_bnt_funding_limit(
@@ -360,7 +436,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "set bnt funding limit",
     ):
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tkn = self.reserveTokens[tkn_name]
         amt = toWei(amount, self.bnt.decimals())
         self.networkSettings.setFundingLimit(tkn, amt)
@@ -373,7 +449,7 @@ class BancorDapp:
         timestamp: int = 0,
         transaction_type: str = "enableTrading",
     ) -> None:
-        updateBlock(timestamp)
+        self.chain.update(timestamp)
         tknPrice = Decimal(tkn_price) if tkn_price else self.price_feeds.at[timestamp, tkn_name]
         bntPrice = Decimal(bnt_price) if bnt_price else self.price_feeds.at[timestamp, self.bnt.symbol()]
         while tknPrice != int(tknPrice) or bntPrice != int(bntPrice):
@@ -384,6 +460,18 @@ class BancorDapp:
     def create_user(self, user_name: str, timestamp: int = 0):
         pass
 
+    def snapshot(self):
+        '''
+         * @dev returns the id of a snapshot of the current state, which can later be restored via `revert`
+        '''
+        return self.chain.snapshot()
+
+    def revert(self, id: int):
+        '''
+         * @dev restores the state of a given snapshot, discarding this snapshot and every later one
+        '''
+        self.chain.revert(id)
+
     def describe(self, decimals: int = -1):
         table = {}
 
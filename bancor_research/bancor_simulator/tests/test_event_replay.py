@@ -0,0 +1,79 @@
+import pytest
+
+from bancor_research.bancor_simulator.v3.spec.network import BancorDapp
+from bancor_research.scenario_generator.event_replay import EventReplay
+
+WHITELISTED_TOKENS = {
+    tkn_name: {
+        "decimals": decimals,
+        "trading_fee": "1%",
+        "bnt_funding_limit": "40000",
+        "ep_vault_balance": "0",
+    }
+    for tkn_name, decimals in [("eth", 18), ("link", 6)]
+}
+
+# the amounts as emitted on chain, in the smallest units of each token
+EVENTS = """timestamp,type,user_name,tkn_name,amount,target_tkn_name,request_id,program_id
+2,trade,alice,bnt,100000000000000000000,eth,,
+2,deposit,bob,eth,1000000000000000000000,,,
+3,initWithdrawal,alice,eth,10000000000000000000,,0xa1,
+3,trade,bob,eth,50500000000000000000,link,,
+4,initWithdrawal,bob,eth,5000000000000000000,,0xb2,
+5,withdraw,alice,,,,0xa1,
+6,trade,alice,link,20250000,bnt,,
+"""
+
+EVENTS_IN_TOKEN_UNITS = """timestamp,type,user_name,tkn_name,amount,target_tkn_name,request_id,program_id
+2,trade,alice,bnt,100,eth,,
+2,deposit,bob,eth,1000,,,
+3,initWithdrawal,alice,eth,10,,0xa1,
+3,trade,bob,eth,50.5,link,,
+4,initWithdrawal,bob,eth,5,,0xb2,
+5,withdraw,alice,,,,0xa1,
+6,trade,alice,link,20.25,bnt,,
+"""
+
+
+def create_bancor_dapp() -> BancorDapp:
+    bancor_dapp = BancorDapp(
+        cooldown_time=0, whitelisted_tokens=WHITELISTED_TOKENS, log_state=False
+    )
+    for user_name in ["alice", "bob"]:
+        for tkn_name in ["bnt", "eth", "link"]:
+            bancor_dapp.set_user_balance(user_name, tkn_name, "1000000", 1)
+    bancor_dapp.deposit("eth", "50000", "alice", 1)
+    bancor_dapp.deposit("link", "50000", "alice", 1)
+    bancor_dapp.enable_trading("eth", "1", "2", 1)
+    bancor_dapp.enable_trading("link", "3", "1", 1)
+    return bancor_dapp
+
+
+@pytest.mark.parametrize(
+    "events, token_units", [(EVENTS, False), (EVENTS_IN_TOKEN_UNITS, True)]
+)
+@pytest.mark.parametrize("chunk_size", [2, 100])
+def test_replay_csv(tmp_path, events, token_units, chunk_size):
+    path = tmp_path / "events.csv"
+    path.write_text(events)
+    bancor_dapp = create_bancor_dapp()
+    replay = EventReplay(
+        bancor_dapp, str(path), chunk_size=chunk_size, token_units=token_units
+    )
+    snapshots = list(replay.run(3, lambda dapp: dapp.describe().to_string()))
+
+    expected = create_bancor_dapp()
+    expected.trade("100", "bnt", "eth", "alice", 2)
+    expected.deposit("eth", "1000", "bob", 2)
+    alice_id = expected.begin_cooldown_by_ptkn("10", "eth", "alice", 3)
+    expected.trade("50.5", "eth", "link", "bob", 3)
+    bob_id = expected.begin_cooldown_by_ptkn("5", "eth", "bob", 4)
+    expected.withdraw("alice", alice_id, 5)
+    expected.trade("20.25", "link", "bnt", "alice", 6)
+
+    assert [timestamp for timestamp, _ in snapshots] == [3, 5, 6]
+    assert snapshots[-1][1] == expected.describe().to_string()
+    assert replay.withdrawal_ids == {"0xb2": bob_id}
+    users = bancor_dapp.global_state.users
+    assert users["alice"].pending_withdrawals[alice_id].is_complete
+    assert not users["bob"].pending_withdrawals[bob_id].is_complete
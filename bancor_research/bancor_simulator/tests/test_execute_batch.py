@@ -0,0 +1,131 @@
+import pytest
+
+from bancor_research.bancor_simulator.v3.spec.network import BancorDapp, Operation
+
+WHITELISTED_TOKENS = {
+    tkn_name: {
+        "decimals": 18,
+        "trading_fee": "1%",
+        "bnt_funding_limit": "40000",
+        "ep_vault_balance": "0",
+    }
+    for tkn_name in ["eth", "link"]
+}
+
+COUNT = 30
+
+
+def create(log_state: bool) -> BancorDapp:
+    return BancorDapp(
+        timestamp=0,
+        cooldown_time=0,
+        whitelisted_tokens=WHITELISTED_TOKENS,
+        log_state=log_state,
+    )
+
+
+def operations(results: list):
+    """
+    Yields the operations of a simulation, withdrawing every cooldown by the id which was returned when it began.
+    """
+    yield Operation("set_user_balance", ("alice", "bnt", "1000000", 0))
+    for tkn_name in ["eth", "link"]:
+        yield Operation("set_user_balance", ("alice", tkn_name, "1000000", 0))
+        yield Operation("deposit", (tkn_name, "50000", "alice", 0))
+        # a plain tuple is accepted as well
+        yield ("enable_trading", (tkn_name, "1", "1", 0))
+    for i in range(1, COUNT):
+        tkn_name = "eth" if i % 2 else "link"
+        yield Operation("trade", ("10", "bnt", tkn_name, "alice", i))
+        yield Operation(
+            "deposit",
+            kwargs=dict(tkn_name="link", tkn_amt="10", user_name="alice", timestamp=i),
+        )
+        yield Operation("begin_cooldown_by_ptkn", ("1%", "eth", "alice", i))
+        if i % 4 == 0:
+            yield Operation("withdraw", ("alice", results[-1], i))
+
+
+def run_one_by_one(bancor_dapp: BancorDapp, rows: list = None) -> list:
+    """
+    Executes the operations one by one, and appends the range of history rows recorded by each one of them to `rows`.
+    """
+    results = []
+    for operation in operations(results):
+        action, args, kwargs = Operation(*operation)
+        start = len(bancor_dapp.global_state.history)
+        results.append(getattr(bancor_dapp, action)(*args, **(kwargs or {})))
+        if rows is not None:
+            rows.append(range(start, len(bancor_dapp.global_state.history)))
+    return results
+
+
+@pytest.mark.parametrize("log_state", [True, False])
+def test_matches_one_by_one(log_state):
+    expected = create(log_state)
+    expected_results = run_one_by_one(expected)
+    actual = create(log_state)
+    results = []
+    assert actual.execute_batch(operations(results), results=results) is results
+    assert [str(result) for result in results] == [
+        str(result) for result in expected_results
+    ]
+    assert actual.describe().equals(expected.describe())
+    assert actual.export().equals(expected.export())
+    assert actual.log_state == log_state
+    if log_state:
+        # a single backup is saved after the last operation, instead of one per operation
+        assert len(expected.backup_states) > 1
+        assert len(actual.backup_states) == 1
+
+
+@pytest.mark.parametrize("log_state", [True, False])
+def test_intervals(log_state):
+    expected = create(log_state)
+    rows = []
+    run_one_by_one(expected, rows)
+    actual = create(log_state)
+    results = []
+    actual.execute_batch(
+        operations(results), log_interval=10, snapshot_interval=25, results=results
+    )
+    assert actual.describe().equals(expected.describe())
+    # only the rows of every tenth operation are recorded
+    logged = [i for n in range(10, len(rows) + 1, 10) for i in rows[n - 1]]
+    assert len(logged) > 0
+    assert actual.export().equals(expected.export().iloc[logged])
+    unlogged = create(log_state)
+    results = []
+    unlogged.execute_batch(operations(results), log_interval=None, results=results)
+    assert unlogged.describe().equals(expected.describe())
+    assert len(unlogged.export()) == 0
+    if log_state:
+        # a backup is saved once per 25 operations and after the last one, named after their timestamps
+        timestamps = [
+            kwargs["timestamp"] if kwargs else args[-1]
+            for _, args, kwargs in (
+                Operation(*operation) for operation in operations([0])
+            )
+        ]
+        saved = timestamps[24::25] + timestamps[-1:]
+        assert actual.backup_states == [f"end_{ts}" for ts in dict.fromkeys(saved)]
+
+
+def test_failures():
+    bancor_dapp = create(True)
+    before = bancor_dapp.describe()
+    with pytest.raises(AssertionError, match="invalid action `_deposit`"):
+        bancor_dapp.execute_batch([Operation("_deposit")])
+    results = []
+    with pytest.raises(KeyError):
+        bancor_dapp.execute_batch(
+            [
+                Operation("set_user_balance", ("alice", "eth", "1000000", 0)),
+                Operation("withdraw", ("alice", 12345, 0)),
+            ],
+            results=results,
+        )
+    # the operations which completed before the failure keep their results, and state logging is restored
+    assert len(results) == 1
+    assert bancor_dapp.log_state
+    assert not bancor_dapp.describe().equals(before)
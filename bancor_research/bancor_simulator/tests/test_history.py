@@ -0,0 +1,85 @@
+import pickle
+
+import pytest
+
+from bancor_research import Decimal
+from bancor_research.bancor_simulator.v3.spec.history import HistoryRecorder
+
+
+def create_rows(count: int) -> list:
+    return [
+        {
+            "timestamp": i,
+            "is_trading_enabled": i % 2 == 0,
+            "rate": i / 4,
+            "balance": Decimal("1") / Decimal(i + 3),
+            "user_name": f"user{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def record(rows: list, chunk_size: int = 3) -> HistoryRecorder:
+    history = HistoryRecorder(chunk_size)
+    for row in rows:
+        history.append(row)
+    return history
+
+
+@pytest.mark.parametrize("count", [0, 2, 3, 7])
+def test_columns(count):
+    rows = create_rows(count)
+    history = record(rows)
+    assert len(history) == count
+    frame = history.to_frame()
+    assert list(frame.index) == [0] * count
+    assert frame.to_dict("records") == rows
+    # the values are stored compactly, and are decoded back to their original types
+    for name, column in history.columns.items():
+        values = [row[name] for row in rows]
+        assert column.values() == values
+        assert [type(value) for value in column.values()] == [
+            type(value) for value in values
+        ]
+    if count >= 3:
+        assert history.columns["timestamp"].chunks[0].typecode == "q"
+        assert history.columns["balance"].chunks[0][0] == str(rows[0]["balance"])
+
+
+def test_mixed_and_missing_columns():
+    history = record(create_rows(4))
+    # a value of another type turns the column into a column of objects
+    history.append({"timestamp": "five", "label": "new"})
+    frame = history.to_frame()
+    assert list(frame["timestamp"]) == [0, 1, 2, 3, "five"]
+    # the columns missing from a row are filled with None, as are the rows before a new column
+    assert list(frame["label"]) == [None] * 4 + ["new"]
+    assert frame["user_name"].iloc[4] is None
+
+
+def test_forks_share_their_rows():
+    rows = create_rows(8)
+    history = record(rows[:5])
+    fork = history.fork()
+    head = history[:4]
+    history.append(rows[5])
+    fork.append(rows[6])
+    head.append(rows[7])
+    assert history.to_frame().to_dict("records") == rows[:6]
+    assert fork.to_frame().to_dict("records") == rows[:5] + rows[6:7]
+    assert head.to_frame().to_dict("records") == rows[:4] + rows[7:8]
+    # the chunks which are kept entirely are shared rather than copied
+    assert head.columns["timestamp"].chunks[0] is history.columns["timestamp"].chunks[0]
+    with pytest.raises(AssertionError):
+        history[1:3]
+
+
+def test_pickle_own_rows():
+    rows = create_rows(7)
+    history = record(rows)
+    head = history[:2]
+    result = pickle.loads(pickle.dumps(head))
+    assert len(result) == 2
+    assert result.to_frame().to_dict("records") == rows[:2]
+    assert all(len(column) == 2 for column in result.columns.values())
+    assert history.to_frame().to_dict("records") == rows
@@ -0,0 +1,108 @@
+import pandas as pd
+
+from bancor_research import DataFrame
+from bancor_research.scenario_generator import MonteCarloBatch, MonteCarloGenerator
+
+LENGTH = 200
+
+GENERATOR_PARAMS = dict(
+    whitelisted_tokens={
+        tkn_name: {
+            "decimals": 18,
+            "trading_fee": "1%",
+            "bnt_funding_limit": "400000",
+            "ep_vault_balance": "0",
+        }
+        for tkn_name in ["eth", "link"]
+    },
+    price_feed=DataFrame(
+        {
+            "INDX": range(LENGTH),
+            "bnt": [2.5] * LENGTH,
+            "eth": [1500.0] * LENGTH,
+            "link": [7.0] * LENGTH,
+        }
+    ).set_index("INDX", drop=False),
+    user_initial_balances=pd.DataFrame(
+        [
+            {
+                "user_id": user_id,
+                "poolSymbol": tkn_name,
+                "tokenAmount_real_usd": "1000000",
+            }
+            for user_id in ["global user", "alice"]
+            for tkn_name in ["bnt", "eth", "link"]
+        ]
+    ),
+    simulation_actions_count=100,
+    num_timesteps=20,
+    num_simulation_days=20,
+    pool_freq_dist={"eth": 0.5, "link": 0.5},
+    action_freq_dist={},
+    deposit_mean=10,
+    trade_mean=10,
+    withdraw_mean=10,
+)
+
+
+def transact(generator: MonteCarloGenerator):
+    if generator.timestamp == 1:
+        for tkn_name in ["eth", "link"]:
+            generator.protocol.deposit(tkn_name, "100000", "alice", 1)
+            generator.protocol.enable_trading(tkn_name, "1", "1", 1)
+    generator.perform_random_trade()
+    generator.logger.append(
+        pd.DataFrame(
+            {
+                "timestamp": [generator.timestamp],
+                "tkn": [generator.latest_tkn_name],
+                "amt": [generator.latest_amt],
+            }
+        )
+    )
+
+
+def run_alone(seed: int) -> pd.DataFrame:
+    return MonteCarloGenerator(**GENERATOR_PARAMS, seed=seed).run(transact)
+
+
+def test_runs_match_serial_runs():
+    frame = MonteCarloBatch(transact, GENERATOR_PARAMS, max_workers=2).run(3, seed=5)
+    assert list(frame.columns) == ["run_id", "timestamp", "tkn", "amt"]
+    assert list(frame["run_id"].unique()) == [0, 1, 2]
+    for run_id in range(3):
+        run = frame[frame["run_id"] == run_id].drop(columns="run_id")
+        expected = run_alone(5 + run_id)
+        assert (
+            run.reset_index(drop=True)
+            .astype(str)
+            .equals(expected.reset_index(drop=True).astype(str))
+        )
+    # each run has its own random number generator
+    amounts = [list(frame[frame["run_id"] == run_id]["amt"]) for run_id in range(3)]
+    assert amounts[0] != amounts[1] != amounts[2]
+
+
+def test_runs_are_deterministic():
+    frames = [
+        MonteCarloBatch(transact, GENERATOR_PARAMS, max_workers=workers).run(4)
+        for workers in [1, 3, 3]
+    ]
+    for frame in frames[1:]:
+        assert frame.astype(str).equals(frames[0].astype(str))
+
+
+def test_iter_runs_overrides():
+    batch = MonteCarloBatch(transact, GENERATOR_PARAMS, max_workers=2)
+    runs = [
+        ("shared", 1, {}, {}),
+        ("larger", 1, {"trade_mean": 1000}, {}),
+    ]
+    frames = dict(batch.iter_runs(runs))
+    assert sorted(frames) == ["larger", "shared"]
+    assert frames["shared"].astype(str).equals(run_alone(1).astype(str))
+    assert (
+        not frames["larger"]["amt"]
+        .astype(str)
+        .equals(frames["shared"]["amt"].astype(str))
+    )
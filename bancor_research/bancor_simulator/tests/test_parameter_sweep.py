@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from bancor_research.bancor_simulator.tests.test_monte_carlo_batch import (
+    GENERATOR_PARAMS,
+    transact,
+)
+from bancor_research.scenario_generator.parameter_sweep import (
+    RESULTS_FILE,
+    ParameterSweep,
+    grid_samples,
+    latin_hypercube_samples,
+    random_samples,
+)
+
+RUN_PARAMS = dict(mean_events_per_day=1, is_proposal=True)
+
+SPACE = {
+    "constant_multiplier": [100, 520],
+    "n_rolling_days": [2, 5],
+    "pool_freq_dist": [{"eth": 0.5, "link": 0.5}, {"eth": 0.8, "link": 0.2}],
+}
+
+
+def create(checkpoint_dir) -> ParameterSweep:
+    sweep = ParameterSweep(
+        transact,
+        GENERATOR_PARAMS,
+        RUN_PARAMS,
+        checkpoint_dir=str(checkpoint_dir),
+        max_workers=2,
+    )
+    # record the runs which are executed rather than loaded from their checkpoints
+    sweep.executed = []
+    iter_runs = sweep.batch.iter_runs
+
+    def record(runs):
+        runs = list(runs)
+        sweep.executed += [run[0] for run in runs]
+        return iter_runs(runs)
+
+    sweep.batch.iter_runs = record
+    return sweep
+
+
+def test_resume(tmp_path):
+    samples = grid_samples(SPACE)
+    sweep = create(tmp_path)
+    table = sweep.run(samples)
+    assert sweep.executed == list(range(8))
+    assert list(table["key"].unique()) == list(table["key"])
+    assert len(table) == 8
+    assert os.path.exists(tmp_path / RESULTS_FILE)
+
+    # only the run whose checkpoint is missing is executed again
+    os.remove(sweep.checkpoint_path(table["key"][3]))
+    stats = {
+        key: os.stat(sweep.checkpoint_path(key)).st_mtime_ns
+        for key in table["key"]
+        if key != table["key"][3]
+    }
+    resumed = create(tmp_path)
+    assert resumed.run(samples).astype(str).equals(table.astype(str))
+    assert resumed.executed == [3]
+    for key, mtime in stats.items():
+        assert os.stat(resumed.checkpoint_path(key)).st_mtime_ns == mtime
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    # a completed sweep executes nothing
+    completed = create(tmp_path)
+    assert completed.run(samples).astype(str).equals(table.astype(str))
+    assert completed.executed == []
+    assert sorted(completed.frames(samples)["run_id"].unique()) == list(range(8))
+
+
+def test_unknown_parameter(tmp_path):
+    with pytest.raises(AssertionError, match="Unknown simulation parameters"):
+        create(tmp_path).run([{"no_such_param": 1}])
+
+
+def test_samples():
+    assert len(grid_samples(SPACE)) == 8
+    space = {
+        "constant_multiplier": (100, 1000),
+        "mean_events_per_day": (0.5, 3.0),
+        "pool_freq_dist": SPACE["pool_freq_dist"],
+    }
+    samples = latin_hypercube_samples(space, 4)
+    assert samples == latin_hypercube_samples(space, 4)
+    # each quarter of every numeric range is drawn exactly once
+    for name, (low, high) in list(space.items())[:2]:
+        strata = sorted(int((s[name] - low) / (high - low) * 4) for s in samples)
+        assert strata == [0, 1, 2, 3]
+    for sample in random_samples({"n_rolling_days": (1, 7)}, 20):
+        assert sample["n_rolling_days"] in range(1, 8)
@@ -0,0 +1,80 @@
+import copy
+
+import pytest
+
+from bancor_research.bancor_emulator.v3.spec.network import BancorDapp as EmulatorDapp
+from bancor_research.bancor_simulator.v3.spec.network import BancorDapp
+from bancor_research.bancor_simulator.v3.spec.rewards import (
+    get_user_pending_standard_rewards,
+    snapshot_standard_rewards,
+)
+
+WHITELISTED_TOKENS = {
+    tkn_name: {
+        "decimals": 18,
+        "trading_fee": "1%",
+        "bnt_funding_limit": "40000",
+        "ep_vault_balance": "0",
+    }
+    for tkn_name in ["eth", "link"]
+}
+
+USER_NAMES = ["bob", "alice", "carol"]
+
+
+def create(cls):
+    kwargs = {"log_state": False} if cls is BancorDapp else {}
+    bancor_dapp = cls(cooldown_time=0, whitelisted_tokens=WHITELISTED_TOKENS, **kwargs)
+    for user_name in USER_NAMES:
+        for tkn_name in ["bnt", "eth", "link"]:
+            bancor_dapp.set_user_balance(user_name, tkn_name, "1000000", 1)
+        bancor_dapp.deposit("eth", "5000", user_name, 1)
+        bancor_dapp.deposit("link", "5000", user_name, 1)
+    ids = [
+        bancor_dapp.create_standard_rewards_program("eth", "1000", 1, 10000, 1),
+        bancor_dapp.create_standard_rewards_program("link", "500", 1, 10000, 1),
+    ]
+    # carol never joins a program
+    bancor_dapp.join_standard_rewards_program("link", "20%", "bob", ids[1], 10)
+    bancor_dapp.join_standard_rewards_program("eth", "50%", "alice", ids[0], 20)
+    bancor_dapp.join_standard_rewards_program("eth", "10%", "bob", ids[0], 30)
+    bancor_dapp.claim_standard_rewards("alice", ids[:1], 2000)
+    return bancor_dapp
+
+
+@pytest.mark.parametrize("timestamp", [None, 5000])
+def test_emulator_and_simulator_tables(timestamp):
+    expected = create(EmulatorDapp).get_pending_standard_rewards(timestamp=timestamp)
+    actual = create(BancorDapp).get_pending_standard_rewards(timestamp=timestamp)
+    assert list(actual.index) == list(expected.index) == ["alice", "bob"]
+    assert list(actual.columns) == list(expected.columns) == [1, 2]
+    difference = (actual.astype(float) - expected.astype(float)).abs()
+    assert (difference <= expected.astype(float).abs() * 1e-12 + 1e-12).all().all()
+    assert actual.loc["alice", 2] == expected.loc["alice", 2] == 0
+
+
+def test_table_matches_snapshots():
+    bancor_dapp = create(BancorDapp)
+    before = bancor_dapp.describe().to_string()
+    table = bancor_dapp.get_pending_standard_rewards(
+        user_names=USER_NAMES, timestamp=5000
+    )
+    assert list(table.index) == USER_NAMES
+    assert bancor_dapp.describe().to_string() == before
+    state = copy.deepcopy(bancor_dapp.global_state)
+    for user_name in USER_NAMES:
+        for id in table.columns:
+            if id in state.users[user_name].pending_standard_rewards:
+                state = snapshot_standard_rewards(state, id, 5000, user_name)
+                expected = get_user_pending_standard_rewards(state, id, user_name)
+            else:
+                expected = 0
+            assert table.loc[user_name, id] == expected
+
+
+def test_emulator_state_kept():
+    bancor_dapp = create(EmulatorDapp)
+    before = bancor_dapp.describe().to_string()
+    bancor_dapp.get_pending_standard_rewards(timestamp=5000)
+    assert bancor_dapp.chain.timestamp == 2000
+    assert bancor_dapp.describe().to_string() == before
@@ -0,0 +1,81 @@
+import decimal
+import inspect
+
+import pytest
+
+from bancor_research.bancor_simulator.v3.spec.network import (
+    BancorDapp,
+    describe_divergence,
+)
+
+WHITELISTED_TOKENS = {
+    tkn_name: {
+        "decimals": 18,
+        "trading_fee": "1%",
+        "bnt_funding_limit": "40000",
+        "ep_vault_balance": "0",
+    }
+    for tkn_name in ["eth", "link"]
+}
+
+
+def run(precision: int = None) -> BancorDapp:
+    bancor_dapp = BancorDapp(
+        cooldown_time=0,
+        whitelisted_tokens=WHITELISTED_TOKENS,
+        log_state=False,
+        precision=precision,
+    )
+    for tkn_name in ["bnt", "eth", "link"]:
+        bancor_dapp.set_user_balance("alice", tkn_name, "1000000", 1)
+    bancor_dapp.deposit("eth", "50000", "alice", 1)
+    bancor_dapp.deposit("link", "50000", "alice", 1)
+    bancor_dapp.enable_trading("eth", "1", "2", 1)
+    bancor_dapp.enable_trading("link", "3", "1", 1)
+    for timestamp in range(2, 12):
+        bancor_dapp.trade("123.456", "bnt", "eth", "alice", timestamp)
+        bancor_dapp.trade("7.77", "eth", "link", "alice", timestamp)
+        bancor_dapp.deposit("link", "33.3", "alice", timestamp)
+    return bancor_dapp
+
+
+def test_precision():
+    prec = decimal.getcontext().prec
+    exact = run()
+    approx = run(12)
+    assert decimal.getcontext().prec == prec
+    assert approx.describe().to_string() != exact.describe().to_string()
+    divergence = describe_divergence(exact, approx)
+    assert divergence.shape == exact.describe().shape
+    assert 0 < divergence.max().max() < 1e-6
+
+
+def test_no_divergence():
+    exact = run()
+    divergence = describe_divergence(exact, run())
+    assert (divergence == 0).all().all()
+    assert run(None).describe().to_string() == exact.describe().to_string()
+
+
+def test_precision_restored_on_error():
+    prec = decimal.getcontext().prec
+    bancor_dapp = run(12)
+    with pytest.raises(KeyError):
+        bancor_dapp.trade("1", "bnt", "unknown", "alice", 12)
+    assert decimal.getcontext().prec == prec
+
+
+def test_actions_decorated():
+    for name in ["deposit", "trade", "withdraw", "execute_batch", "quote_trades"]:
+        method = getattr(BancorDapp, name)
+        assert hasattr(method, "__wrapped__")
+        assert inspect.signature(method) == inspect.signature(method.__wrapped__)
+    assert list(inspect.signature(BancorDapp.deposit).parameters)[:4] == [
+        "self",
+        "tkn_name",
+        "tkn_amt",
+        "user_name",
+    ]
+    # the internals run in the context of the action which calls them
+    for name in ["copy_state", "next_transaction", "get_state", "update_state"]:
+        assert not hasattr(getattr(BancorDapp, name), "__wrapped__")
@@ -0,0 +1,123 @@
+import copy
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bancor_research.bancor_emulator.v3.spec.network import BancorDapp
+from bancor_research.price_feeds import PriceFeeds, read_price_feeds
+
+LENGTH = 100000
+
+
+def create_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "bnt": np.linspace(1, 3, LENGTH),
+            "eth": np.linspace(2000, 3000, LENGTH),
+        }
+    )
+
+
+def test_from_frame():
+    frame = create_frame()
+    price_feeds = PriceFeeds.from_frame(frame)
+    assert price_feeds.columns == ["bnt", "eth"]
+    assert price_feeds.shape == (LENGTH, 2)
+    assert list(price_feeds) == ["bnt", "eth"]
+    assert price_feeds.at[5, "eth"] == frame.at[5, "eth"]
+    # the columns are shared with the frame rather than copied
+    assert np.shares_memory(price_feeds["bnt"], frame["bnt"].to_numpy())
+    with pytest.raises(KeyError):
+        price_feeds.at[LENGTH, "eth"]
+
+
+def test_from_frame_index():
+    frame = pd.DataFrame({"eth": [1.0, 2.0, 3.0]}, index=[10, 20, 30])
+    price_feeds = PriceFeeds.from_frame(frame)
+    assert price_feeds.at[20, "eth"] == 2.0
+    with pytest.raises(KeyError):
+        price_feeds.at[1, "eth"]
+
+
+def test_emulator_wraps_frame():
+    frame = create_frame()
+    bancor_dapp = BancorDapp(price_feeds=frame)
+    assert isinstance(bancor_dapp.price_feeds, PriceFeeds)
+    assert bancor_dapp.price_feeds.at[5, "eth"] == frame.at[5, "eth"]
+
+
+def test_constant():
+    price_feeds = PriceFeeds.constant({"bnt": 2.5, "eth": 2500}, LENGTH)
+    assert price_feeds.at[LENGTH - 1, "eth"] == 2500
+    assert price_feeds["bnt"].strides == (0,)
+    assert price_feeds.to_frame().shape == (LENGTH, 2)
+
+
+def test_no_dataframe_fallback():
+    price_feeds = PriceFeeds.constant({"bnt": 2.5}, LENGTH)
+    for name in ["loc", "iloc", "head"]:
+        with pytest.raises(AttributeError):
+            getattr(price_feeds, name)
+
+
+def test_copy_overrides():
+    price_feeds = PriceFeeds.from_frame(create_frame())
+    original = price_feeds.at[5, "eth"]
+    fork = copy.deepcopy(price_feeds)
+    fork.at[5, "eth"] = 1.0
+    assert fork.at[5, "eth"] == 1.0
+    assert fork["eth"][5] == 1.0
+    assert price_feeds.at[5, "eth"] == original
+    assert price_feeds["eth"][5] == original
+    assert fork.copy().at[5, "eth"] == 1.0
+    fork["eth"] = np.full(LENGTH, 7.0)
+    assert fork.at[5, "eth"] == 7.0
+    assert price_feeds.at[5, "eth"] == original
+
+
+def test_npy_mapping(tmp_path):
+    frame = create_frame()
+    PriceFeeds.from_frame(frame).save_npy(str(tmp_path))
+    price_feeds = read_price_feeds(str(tmp_path))
+    assert sorted(price_feeds.columns) == ["bnt", "eth"]
+    assert len(price_feeds) == LENGTH
+    # the columns are mapped only when they are first accessed
+    assert price_feeds.mapped == {}
+    assert price_feeds.at[7, "eth"] == frame.at[7, "eth"]
+    assert list(price_feeds.mapped) == ["eth"]
+    assert isinstance(price_feeds.mapped["eth"], np.memmap)
+
+
+def test_pickle_by_path(tmp_path):
+    frame = create_frame()
+    PriceFeeds.from_frame(frame).save_npy(str(tmp_path))
+    price_feeds = read_price_feeds(str(tmp_path))
+    price_feeds.at[3, "bnt"] = 9.0
+    price_feeds["eth"]
+    data = pickle.dumps(price_feeds)
+    # the path of the files is pickled rather than their content
+    assert len(data) < 1000
+    result = pickle.loads(data)
+    assert result.mapped == {}
+    assert result.at[3, "bnt"] == 9.0
+    assert result.at[4, "eth"] == frame.at[4, "eth"]
+    assert np.array_equal(result["eth"], frame["eth"])
+
+
+def test_arrow_mapping(tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.feather
+
+    frame = create_frame()
+    path = str(tmp_path / "price_feeds.arrow")
+    pyarrow.feather.write_feather(
+        pyarrow.Table.from_pandas(frame.rename(columns=str.upper)),
+        path,
+        compression="uncompressed",
+    )
+    price_feeds = read_price_feeds(path)
+    assert sorted(price_feeds.columns) == ["bnt", "eth"]
+    assert price_feeds.at[7, "eth"] == frame.at[7, "eth"]
+    assert len(pickle.dumps(price_feeds)) < 1000
@@ -0,0 +1,94 @@
+from bancor_research import Decimal
+from bancor_research.bancor_simulator.v3.spec.actions import process_trade
+from bancor_research.bancor_simulator.v3.spec.network import BancorDapp
+from bancor_research.bancor_simulator.v3.spec.snapshots import fork_state
+from bancor_research.bancor_simulator.v3.spec.state import get_vortex_balance
+
+WHITELISTED_TOKENS = {
+    tkn_name: {
+        "decimals": 18,
+        "trading_fee": "1%",
+        "bnt_funding_limit": "40000",
+        "ep_vault_balance": "0",
+    }
+    for tkn_name in ["eth", "link", "wbtc"]
+}
+
+AMOUNTS = ["1", "10", "123.5", "1000", "5000"]
+
+ROUTES = [
+    ("bnt", "eth"),
+    ("eth", "bnt"),
+    ("eth", "link"),
+    ("bnt", "wbtc"),
+    ("wbtc", "eth"),
+]
+
+
+def create_bancor_dapp() -> BancorDapp:
+    bancor_dapp = BancorDapp(
+        cooldown_time=0,
+        network_fee="20%",
+        whitelisted_tokens=WHITELISTED_TOKENS,
+        log_state=False,
+    )
+    for tkn_name in ["bnt", "eth", "link", "wbtc"]:
+        bancor_dapp.set_user_balance("alice", tkn_name, "10000000", 1)
+    bancor_dapp.deposit("eth", "50000", "alice", 1)
+    bancor_dapp.deposit("link", "50000", "alice", 1)
+    bancor_dapp.enable_trading("eth", "1", "2", 1)
+    bancor_dapp.enable_trading("link", "3", "1", 1)
+    # trading remains disabled on wbtc
+    bancor_dapp.trade("100", "eth", "link", "alice", 2)
+    return bancor_dapp
+
+
+def trade(bancor_dapp: BancorDapp, amount: str, source_token: str, target_token: str):
+    """
+    Returns the target tokens sent to the user and the network fee collected by the vortex, on a fork of the state.
+    """
+    state = fork_state(bancor_dapp.global_state)
+    target_balance = state.users["alice"].wallet[target_token].balance
+    vortex_balance = get_vortex_balance(state, "bnt")
+    state = process_trade(
+        state, Decimal(amount), source_token, target_token, "alice", 3
+    )
+    return (
+        state.users["alice"].wallet[target_token].balance - target_balance,
+        get_vortex_balance(state, "bnt") - vortex_balance,
+    )
+
+
+def is_close(quote: Decimal, actual: Decimal) -> bool:
+    return abs(quote - actual) <= actual * Decimal("1e-50")
+
+
+def test_quotes_match_trades():
+    bancor_dapp = create_bancor_dapp()
+    quotes = bancor_dapp.quote_trades(AMOUNTS, ROUTES, dtype=object)
+    for route, quote in quotes.items():
+        for i, amount in enumerate(AMOUNTS):
+            target_amount, network_fee = trade(bancor_dapp, amount, *route)
+            assert is_close(quote.target_amount[i], target_amount)
+            assert is_close(quote.network_fee[i], network_fee)
+
+
+def test_quotes_on_disabled_routes():
+    bancor_dapp = create_bancor_dapp()
+    quotes = bancor_dapp.quote_trades(AMOUNTS, ROUTES)
+    for route in [("bnt", "wbtc"), ("wbtc", "eth")]:
+        assert trade(bancor_dapp, AMOUNTS[0], *route) == (0, 0)
+        assert not any(field.any() for field in quotes[route])
+
+
+def test_quotes_do_not_modify_the_state():
+    bancor_dapp = create_bancor_dapp()
+    expected = bancor_dapp.describe().to_string()
+    float_quotes = bancor_dapp.quote_trades(AMOUNTS)
+    exact_quotes = bancor_dapp.quote_trades(AMOUNTS, dtype=object)
+    assert bancor_dapp.describe().to_string() == expected
+    for route, quote in exact_quotes.items():
+        for exact, approximate in zip(
+            quote.target_amount, float_quotes[route].target_amount
+        ):
+            assert abs(float(exact) - approximate) <= float(exact) * 1e-9
@@ -0,0 +1,158 @@
+import pytest
+
+from bancor_research.bancor_simulator.v3.spec.network import BancorDapp
+from bancor_research.bancor_simulator.v3.spec.snapshots import (
+    ExponentialThinning,
+    KeepEveryNth,
+    KeepLast,
+    SharedDict,
+    SnapshotStore,
+    fork_state,
+)
+
+WHITELISTED_TOKENS = {
+    tkn_name: {
+        "decimals": 18,
+        "trading_fee": "1%",
+        "bnt_funding_limit": "40000",
+        "ep_vault_balance": "0",
+    }
+    for tkn_name in ["eth", "link"]
+}
+
+
+def create_bancor_dapp(log_state: bool) -> BancorDapp:
+    return BancorDapp(
+        cooldown_time=0, whitelisted_tokens=WHITELISTED_TOKENS, log_state=log_state
+    )
+
+
+def test_export_rows():
+    # the number of rows exported after each step, as before the snapshots were shared (one row per pool per action,
+    # except for the actions which record their rows after the state is saved, when the state is logged)
+    for log_state, expected in [(True, [2, 4, 6]), (False, [6, 10, 14])]:
+        bancor_dapp = create_bancor_dapp(log_state)
+        bancor_dapp.set_user_balance("alice", "eth", "1000", 1)
+        bancor_dapp.set_user_balance("alice", "bnt", "1000", 1)
+        bancor_dapp.deposit("eth", "10", "alice", 2)
+        actual = [len(bancor_dapp.export())]
+        bancor_dapp.set_trading_fee("eth", "2%", 3)
+        bancor_dapp.trade("1", "bnt", "eth", "alice", 3)
+        actual.append(len(bancor_dapp.export()))
+        bancor_dapp.begin_cooldown_by_ptkn("1%", "eth", "alice", 4)
+        bancor_dapp.deposit("eth", "10", "alice", 5)
+        actual.append(len(bancor_dapp.export()))
+        assert actual == expected
+
+
+def test_backup_history():
+    bancor_dapp = create_bancor_dapp(True)
+    bancor_dapp.set_user_balance("alice", "eth", "1000", 1)
+    bancor_dapp.deposit("eth", "10", "alice", 2)
+    expected = bancor_dapp.export()
+    bancor_dapp.set_user_balance("alice", "link", "1000", 3)
+    bancor_dapp.deposit("link", "10", "alice", 4)
+    assert len(bancor_dapp.export()) > len(expected)
+    bancor_dapp.revert_state("end_2")
+    assert bancor_dapp.export().equals(expected)
+
+
+def test_backup_trade_fees():
+    bancor_dapp = create_bancor_dapp(True)
+    bancor_dapp.set_user_balance("alice", "eth", "1000000", 1)
+    bancor_dapp.set_user_balance("alice", "bnt", "1000000", 1)
+    bancor_dapp.deposit("eth", "50000", "alice", 1)
+    bancor_dapp.enable_trading("eth", "1", "1", 1)
+    bancor_dapp.trade("100", "bnt", "eth", "alice", 2)
+    expected = list(bancor_dapp.global_state.rolling_trade_fees["eth"])
+    state = bancor_dapp.get_state(timestamp=3)
+    state.rolling_trade_fees["eth"].append(expected[0])
+    assert bancor_dapp.global_state.rolling_trade_fees["eth"] == expected
+    bancor_dapp.revert_state("end_2")
+    assert bancor_dapp.global_state.rolling_trade_fees["eth"] == expected
+
+
+def save_states(retention, count: int = 40) -> SnapshotStore:
+    state = create_bancor_dapp(False).global_state
+    snapshots = SnapshotStore(retention)
+    for sequence in range(1, count + 1):
+        state = fork_state(state)
+        state.timestamp = 10 * sequence
+        snapshots[f"s{sequence}"] = state
+    return snapshots
+
+
+@pytest.mark.parametrize(
+    "retention, expected",
+    [
+        (None, list(range(1, 41))),
+        (KeepLast(3), [38, 39, 40]),
+        (KeepEveryNth(3), [3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36, 39, 40]),
+        (ExponentialThinning(2), [16, 32, 36, 38, 39, 40]),
+        (ExponentialThinning(1, 3), [27, 36, 39, 40]),
+    ],
+)
+def test_retention(retention, expected):
+    snapshots = save_states(retention)
+    assert sorted(int(name[1:]) for name in snapshots) == expected
+    assert len(snapshots._index) == len(expected)
+
+
+def test_as_of():
+    snapshots = save_states(KeepEveryNth(4))
+    # the snapshots saved at timestamps 40, 80, ..., 360 and 400 are kept
+    assert snapshots.as_of(80).timestamp == 80
+    assert snapshots.as_of(119).timestamp == 80
+    assert snapshots.as_of(120).timestamp == 120
+    assert snapshots.as_of(399).timestamp == 360
+    assert snapshots.as_of(10**9).timestamp == 400
+    with pytest.raises(KeyError):
+        snapshots.as_of(39)
+
+
+def test_as_of_same_timestamp():
+    state = create_bancor_dapp(False).global_state
+    snapshots = SnapshotStore()
+    for transaction_id in range(3):
+        state = fork_state(state)
+        state.timestamp = 5
+        state.transaction_id = transaction_id
+        snapshots[f"s{transaction_id}"] = state
+    # the last snapshot saved at a timestamp is the state as of that timestamp
+    assert snapshots.as_of(5).transaction_id == 2
+    snapshots["s0"] = snapshots["s0"]
+    assert snapshots.as_of(5).transaction_id == 0
+    del snapshots["s0"]
+    assert snapshots.as_of(5).transaction_id == 2
+
+
+def test_backups_saved_at_action_timestamps():
+    bancor_dapp = create_bancor_dapp(True)
+    bancor_dapp.set_user_balance("alice", "eth", "1000", 1)
+    bancor_dapp.deposit("eth", "10", "alice", 2)
+    bancor_dapp.set_user_balance("alice", "eth", "2000", 4)
+    backups = bancor_dapp._backup_states
+    assert [(name, backups[name].timestamp) for name in backups if "end" in name] == [
+        ("end_1", 1),
+        ("end_2", 2),
+        ("end_4", 4),
+    ]
+    bancor_dapp.revert_state(3)
+    assert bancor_dapp.global_state.timestamp == 2
+    assert bancor_dapp.global_state.users["alice"].wallet["eth"].balance == 990
+
+
+def test_peek():
+    bancor_dapp = create_bancor_dapp(True)
+    bancor_dapp.set_user_balance("alice", "eth", "100", 1)
+    state = fork_state(bancor_dapp.global_state)
+    original = state.tokens.peek("eth")
+    # the value is read in place, while an access copies it from the snapshot
+    assert state.tokens.peek("eth") is original
+    assert state.tokens["eth"] is not original
+    assert state.tokens.peek("eth") is state.tokens["eth"]
+    # the plain dictionaries of a state which was never saved are read in place too
+    state = create_bancor_dapp(False).global_state
+    assert SharedDict.peek(state.tokens, "eth") is state.tokens["eth"]
+    with pytest.raises(KeyError):
+        SharedDict.peek(state.tokens, "unknown")
@@ -0,0 +1,103 @@
+import copy
+
+import pytest
+
+from bancor_research import Decimal
+from bancor_research.bancor_simulator.v3.spec.state import RATE_FIELDS, Token, Tokens
+
+
+def create_tokens(ema_rate: str) -> Tokens:
+    tokens = Tokens(tkn_name="eth")
+    tokens.spot_rate = Decimal("2")
+    tokens.inv_spot_rate = Decimal("0.5")
+    tokens.ema_rate = Decimal(ema_rate)
+    tokens.inv_ema_rate = Decimal(ema_rate)
+    return tokens
+
+
+def uncached_rates(tokens: Tokens) -> list:
+    tokens.__dict__.pop("_rates", None)
+    return [str(rate) for rate in tokens.rates]
+
+
+@pytest.mark.parametrize("name", sorted(RATE_FIELDS))
+def test_rates_cleared_by_assignment(name):
+    tokens = create_tokens("1")
+    before = tokens.rates
+    setattr(tokens, name, getattr(tokens, name) + Decimal("0.5"))
+    assert tokens.rates != before
+    assert [str(rate) for rate in tokens.rates] == uncached_rates(tokens)
+
+
+def test_rates_cleared_by_trusted_assignment():
+    tokens = create_tokens("1")
+    before = tokens.rates
+    object.__setattr__(tokens, "__pydantic_initialised__", False)
+    tokens.ema_rate = Decimal("2")
+    assert tokens.rates != before
+
+
+def test_rates_kept_by_other_assignments():
+    tokens = create_tokens("1")
+    rates = tokens.rates
+    tokens.trading_fee = Decimal("0.02")
+    tokens.tkn_trading_liquidity.set(Decimal("10"))
+    assert tokens.rates is rates
+
+
+def test_rates_written_as_recomputed():
+    # equal ema rates which are written differently yield updated rates which are written differently too
+    tokens = create_tokens("1.0")
+    tokens.rates
+    tokens.ema_rate = Decimal("1.00")
+    tokens.inv_ema_rate = Decimal("1.00")
+    assert [str(rate) for rate in tokens.rates] == [
+        str(rate) for rate in create_tokens("1.00").rates
+    ]
+
+
+def test_token_hashable():
+    token = Token(Decimal("1"))
+    other = Token(Decimal("1"))
+    # tokens are mutable, and are therefore compared and hashed by identity
+    assert token != other
+    assert {token: 1, other: 2}[token] == 1
+
+
+def test_token_arithmetic():
+    token = Token(Decimal("10"))
+    token.add(Decimal("2.5"))
+    token.subtract(1)
+    assert token.balance == Decimal("11.5")
+    token.set(0.1)
+    assert str(token.balance) == "0.1"
+    value = Decimal("3")
+    token.set(value)
+    assert token.balance is value
+    token.set(float("nan"))
+    assert token.balance == 0
+    token.balance = float("nan")
+    token.add(Decimal("1"))
+    assert token.balance == 1
+
+
+def test_token_copy():
+    token = Token(Decimal("1"))
+    for result in [copy.copy(token), copy.deepcopy(token)]:
+        assert type(result) is Token and result is not token
+        result.add(Decimal("1"))
+        assert token.balance == 1
+
+
+def test_copy_fields():
+    tokens = create_tokens("1")
+    tokens.master_vault.set(Decimal("100"))
+    result = copy.deepcopy(tokens)
+    # the immutable fields are shared, while the balances are copied
+    assert result.ema_rate is tokens.ema_rate
+    assert result.master_vault is not tokens.master_vault
+    assert result.master_vault.balance == 100
+    result.master_vault.add(Decimal("1"))
+    assert tokens.master_vault.balance == 100
+    result.ema_rate = Decimal("2")
+    assert tokens.ema_rate == 1
@@ -0,0 +1,88 @@
+import copy
+
+import pytest
+from pydantic import ValidationError
+
+from bancor_research import Decimal
+from bancor_research.bancor_simulator.v3.spec.network import BancorDapp
+from bancor_research.bancor_simulator.v3.spec.snapshots import fork_state
+
+WHITELISTED_TOKENS = {
+    tkn_name: {
+        "decimals": 18,
+        "trading_fee": "1%",
+        "bnt_funding_limit": "40000",
+        "ep_vault_balance": "0",
+    }
+    for tkn_name in ["eth", "link"]
+}
+
+
+def run(trusted: bool, log_state: bool = True) -> BancorDapp:
+    bancor_dapp = BancorDapp(
+        cooldown_time=0,
+        whitelisted_tokens=WHITELISTED_TOKENS,
+        log_state=log_state,
+        trusted=trusted,
+    )
+    for tkn_name in ["bnt", "eth", "link"]:
+        bancor_dapp.set_user_balance("alice", tkn_name, "1000000", 0)
+    bancor_dapp.deposit("eth", "50000", "alice", 0)
+    bancor_dapp.deposit("link", "50000", "alice", 0)
+    bancor_dapp.enable_trading("eth", "1", "1", 0)
+    bancor_dapp.enable_trading("link", "1", "1", 0)
+    for timestamp in range(1, 20):
+        bancor_dapp.trade(
+            "10", "bnt", "eth" if timestamp % 2 else "link", "alice", timestamp
+        )
+        bancor_dapp.deposit("link", "10", "alice", timestamp)
+        id_number = bancor_dapp.begin_cooldown_by_ptkn("1%", "eth", "alice", timestamp)
+        bancor_dapp.withdraw("alice", id_number, timestamp)
+    return bancor_dapp
+
+
+def is_trusted(state) -> bool:
+    try:
+        state.timestamp = "not a timestamp"
+    except ValidationError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("log_state", [True, False])
+def test_trusted_results(log_state):
+    validated = run(False, log_state)
+    trusted = run(True, log_state)
+    assert trusted.describe().to_string() == validated.describe().to_string()
+    assert trusted.export().equals(validated.export())
+    trusted.validate()
+    assert trusted.describe().to_string() == validated.describe().to_string()
+
+
+def test_validate():
+    bancor_dapp = run(True, False)
+    state = bancor_dapp.global_state
+    state.tokens["eth"].ema_rate = 1.5
+    state.timestamp = "7"
+    assert type(state.tokens["eth"].ema_rate) is float
+    bancor_dapp.validate()
+    assert state.tokens["eth"].ema_rate == Decimal("1.5")
+    assert type(state.tokens["eth"].ema_rate) is Decimal
+    assert state.timestamp == 7
+    state.tokens["eth"].trading_fee = "not a fee"
+    with pytest.raises(ValidationError):
+        bancor_dapp.validate()
+
+
+def test_trusted_mode_kept():
+    trusted = run(True)
+    state = trusted.global_state
+    for copied in [fork_state(state), copy.deepcopy(state), trusted.get_state()]:
+        assert is_trusted(copied)
+        assert is_trusted(copied.tokens["eth"])
+    assert is_trusted(trusted._backup_states["end_19"])
+    validated = run(False)
+    state = validated.global_state
+    for copied in [state, fork_state(state), copy.deepcopy(state)]:
+        assert not is_trusted(copied)
+        assert not is_trusted(copied.tokens["eth"])
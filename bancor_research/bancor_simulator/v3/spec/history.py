@@ -0,0 +1,183 @@
+# coding=utf-8
+# --------------------------------------------------------------------------------------------------------------------
+# Licensed under the MIT LICENSE. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------------------------------
+"""Columnar recorder of the system state history."""
+from array import array
+
+from bancor_research import DataFrame, Decimal
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Storage of each kind of column values, as (typecode, encode, decode)
+# Decimal values are stored as strings, which can be converted back without any loss of precision
+COLUMN_KINDS = {
+    bool: ("b", int, bool),
+    int: ("q", int, int),
+    float: ("d", float, float),
+    Decimal: (None, str, Decimal),
+    str: (None, str, str),
+    object: (None, None, None),
+}
+
+
+def column_kind(value) -> type:
+    """
+    Returns the kind of column which can store the given value.
+    """
+    kind = type(value)
+    if kind in COLUMN_KINDS:
+        return kind
+    return object
+
+
+class HistoryColumn:
+    """
+    Represents a single column of the history, stored as a list of compact chunks followed by a growable tail.
+    """
+
+    __slots__ = ["kind", "chunks", "tail"]
+
+    def __init__(self, kind: type):
+        self.kind = kind
+        self.chunks = []
+        self.tail = []
+
+    def append(self, value):
+        encode = COLUMN_KINDS[self.kind][1]
+        self.tail.append(value if encode is None else encode(value))
+
+    def flush(self):
+        """
+        Moves the tail into a new read-only chunk.
+        """
+        typecode = COLUMN_KINDS[self.kind][0]
+        if typecode is None:
+            self.chunks.append(tuple(self.tail))
+        else:
+            self.chunks.append(array(typecode, self.tail))
+        self.tail = []
+
+    def values(self) -> list:
+        """
+        Returns all the values in this column, decoded back to their original type.
+        """
+        return [value for chunk in self.chunks for value in self.decode(chunk)] + list(
+            self.decode(self.tail)
+        )
+
+    def decode(self, values) -> list:
+        decode = COLUMN_KINDS[self.kind][2]
+        return values if decode is None else [decode(value) for value in values]
+
+    def as_objects(self) -> "HistoryColumn":
+        """
+        Returns a copy of this column which can store values of any type.
+        """
+        column = HistoryColumn(object)
+        column.chunks = [tuple(self.decode(chunk)) for chunk in self.chunks]
+        column.tail = list(self.decode(self.tail))
+        return column
+
+    def head(self, length: int, chunk_size: int) -> "HistoryColumn":
+        """
+        Returns a copy of the first `length` values in this column, sharing the chunks which are kept entirely.
+        """
+        column = HistoryColumn(self.kind)
+        column.chunks = self.chunks[: length // chunk_size]
+        remainder = (self.chunks + [self.tail])[length // chunk_size]
+        column.tail = list(remainder[: length % chunk_size])
+        return column
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self.chunks) + len(self.tail)
+
+
+class HistoryRecorder:
+    """
+    Records the system state history one row at a time, in columns rather than in a list of one-row dataframes.
+    The columns are append-only, so that they can be shared between a state and the snapshots taken from it:
+    each recorder holds the first `length` rows of its columns, and copies them before recording a row of its own
+    if the shared columns already hold more rows (recorded by another recorder).
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.length = 0
+        self._columns = {}
+        # the number of rows in the columns, shared by all the recorders which share the columns
+        self._recorded = [0]
+
+    @property
+    def columns(self) -> dict:
+        if self._recorded[0] != self.length:
+            self._columns = {
+                name: column.head(self.length, self.chunk_size)
+                for name, column in self._columns.items()
+            }
+            self._recorded = [self.length]
+        return self._columns
+
+    def fork(self, length: int = None) -> "HistoryRecorder":
+        """
+        Returns a recorder of the first `length` rows (all of them by default), sharing the columns of this recorder.
+        """
+        result = HistoryRecorder(self.chunk_size)
+        result.length = self.length if length is None else length
+        result._columns = self._columns
+        result._recorded = self._recorded
+        return result
+
+    def append(self, row: dict):
+        """
+        Records a new row, given as a dictionary of column names to values.
+        """
+        for name in self.columns.keys() - row.keys():
+            self._column(name, None).append(None)
+        for name, value in row.items():
+            self._column(name, value).append(value)
+        self.length += 1
+        self._recorded[0] += 1
+        if self.length % self.chunk_size == 0:
+            for column in self.columns.values():
+                column.flush()
+
+    def _column(self, name: str, value) -> HistoryColumn:
+        column = self.columns.get(name)
+        if column is None:
+            if self.length == 0:
+                column = HistoryColumn(column_kind(value))
+            else:
+                column = HistoryColumn(object)
+                for i in range(self.length):
+                    column.append(None)
+                    if (i + 1) % self.chunk_size == 0:
+                        column.flush()
+            self.columns[name] = column
+        elif column.kind is not object and column_kind(value) is not column.kind:
+            column = column.as_objects()
+            self.columns[name] = column
+        return column
+
+    def to_frame(self) -> DataFrame:
+        """
+        Builds a single dataframe out of all the recorded rows.
+        """
+        return DataFrame(
+            {name: column.values() for name, column in self.columns.items()},
+            index=[0] * self.length,
+        )
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        assert (
+            isinstance(index, slice) and index.start is None and index.step is None
+        ), "only the first rows of the history can be retrieved"
+        return self.fork(len(range(self.length)[index]))
+
+    def __getstate__(self):
+        # pickle only the rows of this recorder, rather than the rows recorded by the recorders which it shares with
+        self.columns
+        return self.__dict__
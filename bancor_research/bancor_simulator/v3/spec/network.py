@@ -4,13 +4,23 @@
 # --------------------------------------------------------------------------------------------------------------------
 """Main BancorDapp class and simulator module interface."""
 
-import cloudpickle, pandas
+import cloudpickle, decimal, functools, pandas
+from collections import deque
+from typing import NamedTuple, Union
 
 from bancor_research.bancor_simulator.v3.spec.actions import *
 from bancor_research.bancor_simulator.v3.spec.rewards import *
 from bancor_research.bancor_simulator.v3.spec.state import *
+from bancor_research.bancor_simulator.v3.spec.quotes import all_routes, quote_trades
+from bancor_research.bancor_simulator.v3.spec.snapshots import (
+    SnapshotStore,
+    KeepLast,
+    KeepEveryNth,
+    ExponentialThinning,
+    fork_state,
+)
 
-from bancor_research import DataFrame, read_price_feeds
+from bancor_research import DataFrame, PriceFeeds, read_price_feeds
 
 
 def to_decimal(percent: str):
@@ -26,6 +36,32 @@ def to_user_amount(state: State, tkn_name: str, user_name: str, amount: str):
     return Decimal(amount)
 
 
+def numeric_context(method):
+    """
+    Runs a BancorDapp action with the decimal precision selected upon instantiation.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self, "precision", None) is None:
+            return method(self, *args, **kwargs)
+        with decimal.localcontext() as context:
+            context.prec = self.precision
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class Operation(NamedTuple):
+    """
+    Represents a call of a BancorDapp action, such as `Operation("deposit", ("eth", "100", "alice", 1))`.
+    """
+
+    action: str
+    args: tuple = ()
+    kwargs: dict = None
+
+
 class BancorDapp:
     """Main BancorDapp class and simulator module interface."""
 
@@ -40,7 +76,13 @@ class BancorDapp:
         - trading_fee (percentage string, default = 1%): The trading fee of the pool
         - bnt_funding_limit (numeric string, default = 1000000): The BNT funding limit of the pool
         price_feeds_path (string): The path to a file containing price feeds
-        price_feeds (dictionary): The price feeds to use instead of the file
+        price_feeds (PriceFeeds or DataFrame): The price feeds to use instead of the file
+        precision (integer, default = None): The number of significant digits of the arithmetic in every action
+        (default = the global decimal precision, which is exact for all practical purposes)
+        trusted (boolean, default = False): Whether to assign the fields of the state without validating them
+        (they are validated at once by `validate`, after which the tokens, users and programs added since are trusted too)
+        retention (KeepLast, KeepEveryNth or ExponentialThinning, default = None): The policy which discards the backups
+        of the state as they age (default = keep all of them)
     """
 
     def __init__(
@@ -52,8 +94,11 @@ class BancorDapp:
         network_fee: str = DEFAULT.NETWORK_FEE,
         whitelisted_tokens=DEFAULT.WHITELIST,
         price_feeds_path: str = DEFAULT.PRICE_FEEDS_PATH,
-        price_feeds: PandasDataFrame = DEFAULT.PRICE_FEEDS,
+        price_feeds: Union[PriceFeeds, PandasDataFrame] = DEFAULT.PRICE_FEEDS,
         log_state: bool = True,
+        precision: int = None,
+        trusted: bool = False,
+        retention=None,
     ):
 
         transaction_id = 0
@@ -61,11 +106,15 @@ class BancorDapp:
         self.json_data = None
         self.transaction_id = transaction_id
 
-        self.price_feeds = (
-            price_feeds
-            if price_feeds is not None
-            else read_price_feeds(price_feeds_path)
+        # each instance records its own price assignments, while sharing the price columns
+        price_feeds = (
+            read_price_feeds(price_feeds_path)
+            if price_feeds is None
+            else PriceFeeds.from_frame(price_feeds)
+            if isinstance(price_feeds, DataFrame)
+            else price_feeds.copy()
         )
+        self.price_feeds = price_feeds
 
         for tkn_name in whitelisted_tokens:
             assert tkn_name in price_feeds.columns, (
@@ -102,10 +151,14 @@ class BancorDapp:
         )
 
         state.json_export = {"users": [], "operations": []}
-        self._backup_states = {}
+        if trusted:
+            state.validate(trusted)
+        self._backup_states = SnapshotStore(retention)
         self._global_state = state
         self.history = []
         self.log_state = log_state
+        self.precision = precision
+        self.trusted = trusted
 
     @property
     def backup_states(self):
@@ -122,20 +175,21 @@ class BancorDapp:
     def copy_state(self, copy_type: str, state: State = None, timestamp: int = 0):
         """
         Saves a backup of the current global state to revert_state back to if desired.
+        The backup shares every object which is left unchanged with the previous backups.
         """
         assert copy_type in ["initial", "end"], "copy_type must be 'initial' or 'end'"
 
         if state is None:
-            s = self.global_state.copy()
+            s = fork_state(self.global_state)
         else:
-            s = state.copy()
+            s = fork_state(state)
 
         if timestamp is None:
             ts = s.timestamp
         else:
             ts = timestamp
             s.timestamp = timestamp
-        self._backup_states[f"{copy_type}_{ts}"] = s.copy()
+        self._backup_states[f"{copy_type}_{ts}"] = s
         return s
 
     def update_state(self, state: State, timestamp: int = 0):
@@ -144,12 +198,14 @@ class BancorDapp:
         """
         self.global_state = self.copy_state("end", state, timestamp)
 
-    def next_transaction(self, state: State, timestamp: int = 0):
+    def next_transaction(self, state: State, timestamp: int = None):
         """
-        Increments a new id and state for each action
+        Increments a new id and state for each action (saved at the timestamp of the action by default)
         """
         if self.log_state:
             self.update_state(state, timestamp)
+        # the length of the history as saved, excluding the rows which the action records afterwards
+        self._saved_rows = len(state.history)
         self.transaction_id += 1
 
     def get_state(
@@ -168,21 +224,79 @@ class BancorDapp:
 
     def revert_state(self, timestamp):
         """
-        Reverts the state of the bancor network to a previously saved state.
+        Reverts the state of the bancor network to a previously saved state,
+        given either by its name or by a timestamp (reverting to the last state saved at or before it).
+        """
+        if isinstance(timestamp, str):
+            self.global_state = self._backup_states[timestamp]
+        else:
+            self.global_state = self._backup_states.as_of(timestamp)
+
+    @numeric_context
+    def execute_batch(
+        self,
+        operations,
+        log_interval: int = 1,
+        snapshot_interval: int = None,
+        results: list = None,
+    ) -> list:
+        """
+        Executes a sequence of operations against a single working state, and returns the result of each one of them.
+        The history is recorded only once per `log_interval` operations (never if None), and if the state is logged,
+        a backup of it is saved only once per `snapshot_interval` operations and after the last operation.
+        The results are appended to `results` (a new list by default) as soon as each operation returns, so that
+        a generator of operations can read the results of the operations which it yielded before.
+        """
+        log_state = self.log_state
+        if log_state:
+            self.global_state = fork_state(self.global_state)
+        state = self.global_state
+        history = state.history
+        if results is None:
+            results = []
+        self.log_state = False
+        try:
+            for n, operation in enumerate(operations, 1):
+                action, args, kwargs = Operation(*operation)
+                assert not action.startswith("_"), f"invalid action `{action}`"
+                if log_interval is None or n % log_interval:
+                    # the row is appended to an empty queue, which discards it
+                    state.history = deque(maxlen=0)
+                self._saved_rows = None
+                results.append(getattr(self, action)(*args, **(kwargs or {})))
+                if (
+                    log_state
+                    and self._saved_rows is not None
+                    and state.history is history
+                ):
+                    # the rows recorded after the transaction are left out, as they are from a saved state
+                    history = history[: self._saved_rows]
+                state.history = history
+                if log_state and snapshot_interval and n % snapshot_interval == 0:
+                    self.update_state(state, state.timestamp)
+                    state = self.global_state
+                    history = state.history
+        finally:
+            state.history = history
+            self.log_state = log_state
+        if log_state:
+            self.update_state(state, state.timestamp)
+        return results
+
+    def validate(self):
+        """
+        Validates every field of the global state at once, such as at the checkpoints of a trusted simulation.
         """
-        self.global_state = self._backup_states[timestamp]
+        self.global_state.validate(self.trusted)
+        return self
 
     def show_history(self):
         """
         Displays the history of the bancor network in a dataframe.
         """
-        return pandas.concat(
-            [
-                self.global_state.history[i]
-                for i in range(len(self.global_state.history))
-            ]
-        )
+        return self.global_state.history.to_frame()
 
+    @numeric_context
     def deposit(
         self,
         tkn_name: str,
@@ -218,6 +332,7 @@ class BancorDapp:
         )
         self.next_transaction(state)
 
+    @numeric_context
     def trade(
         self,
         tkn_amt: str,
@@ -251,6 +366,7 @@ class BancorDapp:
         )
         self.next_transaction(state)
 
+    @numeric_context
     def begin_cooldown_by_rtkn(
         self,
         tkn_amt: str,
@@ -277,6 +393,7 @@ class BancorDapp:
 
         return id_number
 
+    @numeric_context
     def begin_cooldown_by_ptkn(
         self,
         tkn_amt: str,
@@ -302,6 +419,7 @@ class BancorDapp:
         )
         return id_number
 
+    @numeric_context
     def withdraw(
         self,
         user_name: str,
@@ -325,6 +443,7 @@ class BancorDapp:
         )
         self.next_transaction(state)
 
+    @numeric_context
     def enable_trading(
         self,
         tkn_name: str,
@@ -338,6 +457,9 @@ class BancorDapp:
         """
         state = self.get_state(copy_type="initial", timestamp=timestamp)
         state, tkn_name, user_name = validate_input(state, tkn_name, "", timestamp)
+        if self.log_state and (tkn_price or bnt_price):
+            # the backups share the price feeds
+            state.price_feeds = state.price_feeds.copy()
         if tkn_price:
             state.price_feeds.at[state.timestamp, tkn_name] = tkn_price
         if bnt_price:
@@ -353,6 +475,32 @@ class BancorDapp:
         )
         self.next_transaction(state)
 
+    @numeric_context
+    def quote_trades(self, amounts, routes: list = None, dtype="float64"):
+        """
+        Quotes a trade of each amount on each (source_token, target_token) route, without modifying the state.
+        All the routes between the whitelisted tokens are quoted by default.
+        """
+        state = self.global_state
+        if routes is None:
+            routes = all_routes(state.whitelisted_tokens)
+        return quote_trades(state, amounts, routes, dtype)
+
+    @numeric_context
+    def get_pending_standard_rewards(
+        self, program_ids: list = None, user_names: list = None, timestamp: int = None
+    ) -> DataFrame:
+        """
+        Returns the standard rewards pending for each user (rows) in each program (columns), without modifying the state.
+        All the programs, and all the users who joined one of them (sorted by name), are included by default,
+        at the timestamp of the state by default.
+        """
+        if timestamp is None:
+            timestamp = self.global_state.timestamp
+        return calc_pending_standard_rewards(
+            self.global_state, timestamp, program_ids, user_names
+        )
+
     def describe(self, decimals: int = -1):
         """
         Describes the state ledger in a format similar to BIP15 documentation.
@@ -426,15 +574,19 @@ class BancorDapp:
         """
         Exports transaction history record
         """
-        return pandas.concat(self.global_state.history)
+        return self.global_state.history.to_frame()
 
+    @numeric_context
     def whitelist_token(self, tkn_name: str, timestamp: int = 0):
         """
         Creates a new whitelisted token with initialized starting balances
         """
         state = self.get_state(copy_type="initial", timestamp=timestamp)
         tkn_name = tkn_name.lower()
-        state.price_feeds[tkn_name] = state.price_feeds["bnt"].values
+        if self.log_state:
+            # the backups share the price feeds
+            state.price_feeds = state.price_feeds.copy()
+        state.price_feeds[tkn_name] = state.price_feeds["bnt"]
 
         state.create_whitelisted_tkn(tkn_name)
         handle_whitelisting_tokens(state)
@@ -460,6 +612,7 @@ class BancorDapp:
             "NA", Decimal("0"), f"create_{user_name}", "NA", state.transaction_id, state
         )
 
+    @numeric_context
     def process_ac_rewards_program(
         self,
         tkn_name: str,
@@ -484,6 +637,7 @@ class BancorDapp:
             state=state,
         )
 
+    @numeric_context
     def load_json_simulation(self, path, tkn_name="tkn", timestamp: int = 0):
         """
         Loads a JSON file containing simulation modules to run and report on.
@@ -494,6 +648,7 @@ class BancorDapp:
         state = setup_json_simulation(state, json_data, tkn_name)
         self.next_transaction(state)
 
+    @numeric_context
     def create_flat_ac_rewards_program(
         self,
         tkn_name: str,
@@ -515,6 +670,7 @@ class BancorDapp:
             transaction_type=transaction_type,
         )
 
+    @numeric_context
     def create_exp_ac_rewards_program(
         self,
         tkn_name: str,
@@ -590,6 +746,7 @@ class BancorDapp:
             state=state,
         )
 
+    @numeric_context
     def terminate_ac_rewards_program(
         self,
         tkn_name: str,
@@ -614,6 +771,7 @@ class BancorDapp:
             state=state,
         )
 
+    @numeric_context
     def burn_pool_tokens(
         self,
         tkn_name: str,
@@ -645,6 +803,7 @@ class BancorDapp:
                 state,
             )
 
+    @numeric_context
     def create_standard_rewards_program(
         self,
         tkn_name: str,
@@ -674,6 +833,7 @@ class BancorDapp:
         )
         return id
 
+    @numeric_context
     def join_standard_rewards_program(
         self,
         tkn_name: str,
@@ -703,6 +863,7 @@ class BancorDapp:
             tkn_name, tkn_amt, transaction_type, user_name, self.transaction_id, state
         )
 
+    @numeric_context
     def leave_standard_rewards_program(
         self,
         tkn_name: str,
@@ -732,6 +893,7 @@ class BancorDapp:
             tkn_name, tkn_amt, transaction_type, user_name, self.transaction_id, state
         )
 
+    @numeric_context
     def claim_standard_rewards(
         self,
         user_name: str,
@@ -759,6 +921,7 @@ class BancorDapp:
             state,
         )
 
+    @numeric_context
     def set_user_balance(
         self,
         user_name: str,
@@ -787,6 +950,7 @@ class BancorDapp:
     def set_state(self, state: State):
         self.global_state = state
 
+    @numeric_context
     def set_trading_fee(
         self,
         tkn_name: str,
@@ -807,6 +971,7 @@ class BancorDapp:
         )
         return self
 
+    @numeric_context
     def set_network_fee(
         self,
         tkn_name: str,
@@ -827,6 +992,7 @@ class BancorDapp:
         )
         return self
 
+    @numeric_context
     def set_withdrawal_fee(
         self,
         tkn_name: str,
@@ -847,6 +1013,7 @@ class BancorDapp:
         )
         return self
 
+    @numeric_context
     def set_bnt_funding_limit(
         self,
         tkn_name: str,
@@ -873,3 +1040,12 @@ class BancorDapp:
         """
         with open(file_path, "wb") as f:
             cloudpickle.dump(self, f, protocol=pickle_protocol)
+
+
+def describe_divergence(exact: BancorDapp, approx: BancorDapp) -> DataFrame:
+    """
+    Returns the relative deviation of every value described by a BancorDapp from the value described by an exact one.
+    """
+    expected = exact.describe().astype("float64")
+    actual = approx.describe().astype("float64")
+    return (abs(actual - expected) / abs(expected)).fillna(0)
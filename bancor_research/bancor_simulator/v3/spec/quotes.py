@@ -0,0 +1,151 @@
+# coding=utf-8
+# --------------------------------------------------------------------------------------------------------------------
+# Licensed under the MIT LICENSE. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------------------------------
+"""Read-only trade quotes over many amounts and pools at once."""
+import itertools
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from bancor_research import Decimal
+from bancor_research.bancor_simulator.v3.spec.snapshots import SharedDict
+from bancor_research.bancor_simulator.v3.spec.state import State
+from bancor_research.bancor_simulator.v3.spec.utils import (
+    compute_target_amt,
+    swap_fee_collection,
+    vortex_collection,
+)
+
+
+class TradeQuote(NamedTuple):
+    """
+    The outcome of a trade for each quoted amount, with every field given as an array of the same shape as the amounts.
+
+    Args:
+        target_amount: The target tokens sent to the user
+        bnt_trading_fee: The trading fee kept in bnt by the pool of the source token (trades from tkn to bnt)
+        tkn_trading_fee: The trading fee kept in tkn by the pool of the target token (trades from bnt to tkn)
+        network_fee: The bnt collected by the vortex, over all the hops of the trade
+    """
+
+    target_amount: np.ndarray
+    bnt_trading_fee: np.ndarray
+    tkn_trading_fee: np.ndarray
+    network_fee: np.ndarray
+
+
+def all_routes(tkn_names: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Returns every `(source_token, target_token)` pair between bnt and the given tokens.
+    """
+    names = ["bnt"] + [name for name in tkn_names if name != "bnt"]
+    return list(itertools.permutations(names, 2))
+
+
+def to_array(values, dtype) -> np.ndarray:
+    """
+    Converts the given values into an array, using `Decimal` elements when the dtype is `object`.
+    """
+    if np.dtype(dtype) == object:
+        return np.vectorize(lambda x: Decimal(str(x)), otypes=[object])(values)
+    return np.asarray(values, dtype=dtype)
+
+
+def get_pool_inputs(state: State, tkn_name: str, dtype) -> Tuple[bool, list]:
+    """
+    Returns whether trading is enabled, followed by the trading liquidity and fees of a given tkn_name.
+    The ledger is read in place, and is therefore never copied from the state.
+    """
+    tokens = SharedDict.peek(state.tokens, tkn_name)
+    values = [
+        tokens.bnt_trading_liquidity.balance,
+        tokens.tkn_trading_liquidity.balance,
+        tokens.trading_fee,
+        tokens.network_fee,
+    ]
+    return tokens.is_trading_enabled, [to_array(value, dtype) for value in values]
+
+
+def quote_tkn_for_bnt(a, b, d, e, x) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the bnt sent to the user, the trading fee and the network fee of trading tkn for bnt.
+    The amounts are arrays, to which the formulas of the trade actions apply element-wise.
+    """
+    return (
+        compute_target_amt(a, b, d, x, "tkn"),
+        swap_fee_collection(a, b, d, e, x, "tkn"),
+        vortex_collection(a, b, d, e, x, "tkn"),
+    )
+
+
+def quote_bnt_for_tkn(a, b, d, e, x) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the tkn sent to the user, the trading fee and the network fee of trading bnt for tkn.
+    The amounts are arrays, to which the formulas of the trade actions apply element-wise.
+    """
+    return (
+        compute_target_amt(a, b, d, x, "bnt"),
+        swap_fee_collection(a, b, d, e, x, "bnt"),
+        vortex_collection(a, b, d, e, x, "bnt"),
+    )
+
+
+def quote_trades(
+    state: State,
+    amounts,
+    routes: Iterable[Tuple[str, str]],
+    dtype="float64",
+) -> Dict[Tuple[str, str], TradeQuote]:
+    """
+    Quotes a trade of each amount on each `(source_token, target_token)` route, without modifying the state.
+    Trades between two non-bnt tokens are routed through bnt, as in `process_trade`.
+    Routes on which trading is disabled are quoted at zero.
+    Use `dtype=object` to compute the quotes exactly, with `Decimal` elements.
+    """
+    x = to_array(amounts, dtype)
+    zero = np.zeros_like(x)
+    inputs = {}
+    quotes = {}
+    for source_token, target_token in routes:
+        for tkn_name in [source_token, target_token]:
+            if tkn_name != "bnt" and tkn_name not in inputs:
+                inputs[tkn_name] = get_pool_inputs(state, tkn_name, dtype)
+
+        if source_token == "bnt" and inputs[target_token][0]:
+            target_amount, tkn_trading_fee, network_fee = quote_bnt_for_tkn(
+                *inputs[target_token][1], x
+            )
+            quote = TradeQuote(target_amount, zero, tkn_trading_fee, network_fee)
+
+        elif target_token == "bnt" and inputs[source_token][0]:
+            target_amount, bnt_trading_fee, network_fee = quote_tkn_for_bnt(
+                *inputs[source_token][1], x
+            )
+            quote = TradeQuote(target_amount, bnt_trading_fee, zero, network_fee)
+
+        elif (
+            source_token != "bnt"
+            and target_token != "bnt"
+            and inputs[source_token][0]
+            and inputs[target_token][0]
+        ):
+            intermediate_bnt, bnt_trading_fee, source_network_fee = quote_tkn_for_bnt(
+                *inputs[source_token][1], x
+            )
+            target_amount, tkn_trading_fee, target_network_fee = quote_bnt_for_tkn(
+                *inputs[target_token][1], intermediate_bnt
+            )
+            quote = TradeQuote(
+                target_amount,
+                bnt_trading_fee,
+                tkn_trading_fee,
+                source_network_fee + target_network_fee,
+            )
+
+        else:
+            # Trading is disabled
+            quote = TradeQuote(zero, zero, zero, zero)
+
+        quotes[(source_token, target_token)] = quote
+    return quotes
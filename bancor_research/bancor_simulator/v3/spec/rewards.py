@@ -3,6 +3,7 @@
 # Licensed under the MIT LICENSE. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------------------------------
 """Autocompounding and standard rewards issuance logic."""
+from bancor_research.bancor_simulator.v3.spec.snapshots import SharedDict
 from bancor_research.bancor_simulator.v3.spec.state import *
 
 
@@ -250,6 +251,48 @@ def calc_user_pending_standard_rewards(
     )
 
 
+def calc_pending_standard_rewards(
+    state: State, timestamp: int, ids: List[int] = None, user_names: List[str] = None
+) -> pandas.DataFrame:
+    """
+    Calculates the standard rewards pending for each given user (rows) in each given program (columns).
+    The updated reward per token of each program is calculated once, and then applied to every user.
+    The users are read in place, and are therefore never copied or modified.
+    All the programs, and all the users who joined one of them (sorted by name), are included by default.
+    """
+    if ids is None:
+        ids = list(state.standard_reward_programs)
+    if user_names is None:
+        user_names = sorted(
+            user_name
+            for user_name in state.users
+            if SharedDict.peek(state.users, user_name).pending_standard_rewards
+        )
+
+    user_programs = [
+        SharedDict.peek(state.users, user_name).pending_standard_rewards
+        for user_name in user_names
+    ]
+
+    table = {}
+    for id in ids:
+        new_reward_per_token = calc_standard_reward_per_token(state, id, timestamp)
+        table[id] = [
+            (
+                calc_user_pending_standard_rewards(
+                    user_program.pending_rewards.balance,
+                    user_program.staked_amt.balance,
+                    new_reward_per_token,
+                    user_program.reward_per_token_paid.balance,
+                )
+                if user_program is not None
+                else Decimal(0)
+            )
+            for user_program in [programs.get(id) for programs in user_programs]
+        ]
+    return pandas.DataFrame(table, index=user_names, columns=ids)
+
+
 def calc_standard_rewards_remaining(state: State, id: int, timestamp: int) -> Decimal:
     """
     Calculates the standard rewards remaining for a given program id.
@@ -0,0 +1,329 @@
+# coding=utf-8
+# --------------------------------------------------------------------------------------------------------------------
+# Licensed under the MIT LICENSE. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------------------------------
+"""Copy-on-write snapshots of the system state."""
+import copy, math
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableMapping
+
+from bancor_research.bancor_simulator.v3.spec.state import State
+
+# `State` fields which hold one mutable object (`Tokens`, `User` or program) per key
+SHARED_ENTRIES = [
+    "tokens",
+    "users",
+    "standard_reward_programs",
+    "autocompounding_reward_programs",
+]
+
+# `State` fields which are never modified in place, and are therefore shared by reference
+SHARED_OBJECTS = ["price_feeds", "logger"]
+
+_MISSING = object()
+
+
+def is_same(a, b) -> bool:
+    """
+    Returns True if the two objects hold the same values, compared structurally.
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(is_same(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(is_same(x, y) for x, y in zip(a, b))
+    if hasattr(a, "__dict__"):
+        return is_same(public_vars(a), public_vars(b))
+    return a == b
+
+
+def public_vars(obj) -> dict:
+    """
+    Returns the attributes of an object, excluding the private ones (such as cached values derived from the others).
+    """
+    return {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+
+
+class SharedDict(dict):
+    """
+    Dictionary whose values are shared with one or more snapshots.
+    A value is copied the first time that it is accessed, so that snapshots are never modified through this dictionary.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._originals = {}
+        self._frozen = None
+
+    def __getitem__(self, key):
+        if key not in self._originals and dict.__contains__(self, key):
+            original = dict.__getitem__(self, key)
+            dict.__setitem__(self, key, copy.deepcopy(original))
+            self._originals[key] = original
+            self._frozen = None
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._originals:
+            self._originals[key] = dict.get(self, key, _MISSING)
+        dict.__setitem__(self, key, value)
+        self._frozen = None
+
+    def __delitem__(self, key):
+        if key not in self._originals:
+            self._originals[key] = dict.__getitem__(self, key)
+        dict.__delitem__(self, key)
+        self._frozen = None
+
+    def __deepcopy__(self, memo):
+        result = SharedDict()
+        for key, value in dict.items(self):
+            result[key] = copy.deepcopy(value, memo)
+        return result
+
+    def __reduce__(self):
+        return SharedDict, (dict(dict.items(self)),)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def peek(self, key):
+        """
+        Returns the value of a given key without copying it, so that it must only be read.
+        Also applies to the plain dictionaries of a state which was never saved, as in `SharedDict.peek(state.users, key)`.
+        """
+        return dict.__getitem__(self, key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = self[key]
+        del self[key]
+        return value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def freeze(self) -> dict:
+        """
+        Returns a read-only view of the current values, to be shared with a snapshot.
+        Every value which was accessed but left unchanged is replaced with the original value which it was copied from.
+        """
+        if self._frozen is None:
+            for key, original in self._originals.items():
+                if original is not _MISSING and dict.__contains__(self, key):
+                    if is_same(dict.__getitem__(self, key), original):
+                        dict.__setitem__(self, key, original)
+            self._originals.clear()
+            self._frozen = {key: value for key, value in dict.items(self)}
+        return self._frozen
+
+    @staticmethod
+    def thaw(frozen: dict):
+        """
+        Returns a new dictionary which shares all values with the given read-only view.
+        """
+        result = SharedDict(frozen)
+        result._frozen = frozen
+        return result
+
+
+class Snapshot:
+    """
+    Represents a read-only capture of the system state, sharing unchanged objects with other snapshots.
+    """
+
+    __slots__ = ["values"]
+
+    def __init__(self, state: State):
+        self.values = {}
+        for name, value in vars(state).items():
+            if name in SHARED_ENTRIES:
+                if not isinstance(value, SharedDict):
+                    value = SharedDict(value)
+                    object.__setattr__(state, name, value)
+                self.values[name] = value.freeze()
+            elif name in SHARED_OBJECTS:
+                self.values[name] = value
+            elif name == "history":
+                self.values[name] = (value, len(value))
+            elif name == "rolling_trade_fees":
+                self.values[name] = {k: (v, len(v)) for k, v in value.items()}
+            else:
+                self.values[name] = copy.deepcopy(value)
+
+    @property
+    def timestamp(self) -> int:
+        return self.values["timestamp"]
+
+    def restore(self) -> State:
+        """
+        Returns a new state which can be modified without affecting the snapshot.
+        """
+        state = State.__new__(State)
+        for name, value in self.values.items():
+            if name in SHARED_ENTRIES:
+                value = SharedDict.thaw(value)
+            elif name in SHARED_OBJECTS:
+                pass
+            elif name == "history":
+                value = value[0].fork(value[1])
+            elif name == "rolling_trade_fees":
+                value = {k: shared_list(*v) for k, v in value.items()}
+            else:
+                value = copy.deepcopy(value)
+            object.__setattr__(state, name, value)
+        return state
+
+
+def shared_list(values: list, length: int) -> list:
+    """
+    Returns a copy of the first `length` elements of an append-only list.
+    """
+    return values[:length]
+
+
+def fork_state(state: State) -> State:
+    """
+    Returns a copy of the given state, which shares all unchanged objects with it.
+    """
+    return Snapshot(state).restore()
+
+
+class KeepLast:
+    """
+    Retention policy which keeps only the last `count` snapshots.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def expired(self, sequence: int) -> list:
+        """
+        Returns the sequence numbers of the snapshots which expire upon saving the given one.
+        """
+        return [sequence - self.count]
+
+
+class KeepEveryNth:
+    """
+    Retention policy which keeps every `n`-th snapshot, along with the last one.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def expired(self, sequence: int) -> list:
+        """
+        Returns the sequence numbers of the snapshots which expire upon saving the given one.
+        """
+        return [sequence - 1] if (sequence - 1) % self.n else []
+
+
+class ExponentialThinning:
+    """
+    Retention policy which keeps the snapshots ever more sparsely as they age, hence O(count * log(n)) out of n.
+    A snapshot whose sequence number is divisible by `base ** level` (but not by `base ** (level + 1)`)
+    is kept until `count * base ** level` more snapshots are saved.
+    """
+
+    def __init__(self, count: int, base: int = 2):
+        self.count = count
+        self.base = base
+
+    def level(self, sequence: int) -> int:
+        level = 0
+        while sequence % self.base == 0:
+            sequence //= self.base
+            level += 1
+        return level
+
+    def expired(self, sequence: int) -> list:
+        """
+        Returns the sequence numbers of the snapshots which expire upon saving the given one.
+        """
+        result = []
+        level = 0
+        while sequence - self.count * self.base**level > 0:
+            expired = sequence - self.count * self.base**level
+            if self.level(expired) == level:
+                result.append(expired)
+            level += 1
+        return result
+
+
+class SnapshotStore(MutableMapping):
+    """
+    Stores snapshots of the system state by name.
+    Assigning a state stores a snapshot of it, while reading a name returns a new state restored from its snapshot.
+    The snapshots are also indexed by timestamp and by sequence number (the order in which they are saved),
+    so that the state as of any timestamp is found by bisection, in O(log n) for n snapshots.
+    The index is a sorted list, so saving or discarding a snapshot also moves the entries after it, in O(n).
+    Since the snapshots are mostly saved in order of timestamp, a save appends to the list, while a discard moves
+    the entries of all the later snapshots (which is a single copy of n references, fast for any practical n).
+    A retention policy (such as `KeepLast`, `KeepEveryNth` or `ExponentialThinning`) discards the snapshots which
+    expire upon saving each new one, in order to bound the memory held by long simulations.
+    """
+
+    def __init__(self, retention=None):
+        self.retention = retention
+        self._snapshots = {}
+        self._sequence = 0
+        # the name of each snapshot, sorted by (timestamp, sequence number)
+        self._index = []
+        self._keys = {}
+        self._names = {}
+
+    def __getitem__(self, name) -> State:
+        return self._snapshots[name].restore()
+
+    def __setitem__(self, name, state: State):
+        if name in self._snapshots:
+            del self[name]
+        self._sequence += 1
+        snapshot = Snapshot(state)
+        key = (snapshot.timestamp, self._sequence, name)
+        insort(self._index, key)
+        self._snapshots[name] = snapshot
+        self._keys[name] = key
+        self._names[self._sequence] = name
+        if self.retention is not None:
+            for sequence in self.retention.expired(self._sequence):
+                if sequence in self._names:
+                    del self[self._names[sequence]]
+
+    def __delitem__(self, name):
+        key = self._keys.pop(name)
+        del self._index[bisect_left(self._index, key)]
+        del self._names[key[1]]
+        del self._snapshots[name]
+
+    def __iter__(self):
+        return iter(self._snapshots)
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def as_of(self, timestamp: int) -> State:
+        """
+        Returns a new state restored from the last snapshot saved at or before the given timestamp.
+        """
+        index = bisect_right(self._index, (timestamp, math.inf))
+        if index == 0:
+            raise KeyError(f"no snapshot at or before timestamp {timestamp}")
+        return self[self._index[index - 1][2]]
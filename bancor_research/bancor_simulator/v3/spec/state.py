@@ -5,11 +5,13 @@
 """System state variables, constants, containers and interface."""
 import copy, logging, pandas
 from dataclasses import field
+from pydantic import validate_model
 from pydantic.types import Tuple, Any, List, Dict
 from pydantic.dataclasses import dataclass
 from pydantic.schema import defaultdict
 
-from bancor_research import DEFAULT, Decimal, PandasDataFrame
+from bancor_research import DEFAULT, Decimal, PandasDataFrame, PriceFeeds
+from bancor_research.bancor_simulator.v3.spec.history import HistoryRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +36,20 @@ DEFAULT_ACCOUNT_BALANCE = Decimal("0")
 class Token(object):
     """
     Represents a token balance with common math operations to increase, decrease, and set the balance.
+    The balance is held in a slot rather than in a per-instance dictionary, which makes tokens smaller and faster to copy.
     """
 
+    __slots__ = ["balance"]
+
     def __init__(self, balance: Decimal = Decimal("0")):
         self.balance = balance
 
+    def __copy__(self):
+        return Token(self.balance)
+
+    def __deepcopy__(self, memo):
+        return Token(self.balance)
+
     def add(self, value: Decimal):
         self.validate_balance()
         self.balance += self.validate(value)
@@ -55,27 +66,105 @@ class Token(object):
         return self.validate_value(value)
 
     def validate_balance(self):
+        if type(self.balance) is Decimal and self.balance.is_finite():
+            return
         if pandas.isnull(self.balance):
             self.balance = Decimal("0")
 
     def validate_value(self, value) -> Decimal:
+        if type(value) is Decimal and value.is_finite():
+            # the same value which `Decimal(str(value))` would return
+            return value
         if pandas.isnull(value):
             value = Decimal("0")
         return Decimal(str(value))
 
 
+# Immutable field types, which are shared rather than copied by `copy_fields`
+IMMUTABLE_TYPES = frozenset([type(None), bool, int, float, str, Decimal, tuple])
+
+
+def copy_fields(self, memo: dict):
+    """
+    Returns a deep copy of a dataclass instance, copying only its mutable fields.
+    """
+    result = object.__new__(type(self))
+    memo[id(self)] = result
+    fields = result.__dict__
+    for name, value in self.__dict__.items():
+        if type(value) in IMMUTABLE_TYPES:
+            fields[name] = value
+        elif type(value) is Token:
+            fields[name] = Token(value.balance)
+        else:
+            fields[name] = copy.deepcopy(value, memo)
+    return result
+
+
+def validate_fields(self, trusted: bool = False):
+    """
+    Validates every field of a dataclass instance at once, as upon assignment, along with the dataclass instances which
+    it holds in dictionaries (the dictionaries themselves are left in place, since they may be shared with snapshots).
+    If trusted, the fields are then assigned without validation until they are validated again.
+    """
+    model = type(self).__pydantic_model__
+    fields = {
+        name: value
+        for name, value in self.__dict__.items()
+        if name in model.__fields__ and not isinstance(value, dict)
+    }
+    values, _, error = validate_model(model, fields, cls=type(self))
+    if error:
+        raise error
+    for name, value in fields.items():
+        # a valid value is returned as is, so unchanged objects are never reassigned
+        if values[name] is not value:
+            object.__setattr__(self, name, values[name])
+            # the rates cached by Tokens are computed from the fields assigned here
+            self.__dict__.pop("_rates", None)
+    for value in self.__dict__.values():
+        if isinstance(value, dict):
+            for entry in dict.values(value):
+                if hasattr(entry, "__pydantic_model__"):
+                    validate_fields(entry, trusted)
+    if trusted:
+        self.__dict__["_trusted"] = True
+    else:
+        self.__dict__.pop("_trusted", None)
+
+
+def trusted_setattr(cls):
+    """
+    Wraps the validating `__setattr__` of a dataclass, so that the fields of its trusted instances
+    (those marked by `validate_fields`) are assigned as they are, without validation.
+    """
+    validated_setattr = cls.__setattr__
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_trusted"):
+            object.__setattr__(self, name, value)
+        else:
+            validated_setattr(self, name, value)
+
+    cls.__setattr__ = __setattr__
+    return cls
+
+
 # Containers
 class Config:
     validate_assignment = True
     arbitrary_types_allowed = True
 
 
+@trusted_setattr
 @dataclass(config=Config)
 class GlobalSettings:
     """
     Represents the default global settings. These can be overridden by the BancorDapp configuration upon instantiation.
     """
 
+    __deepcopy__ = copy_fields
+
     timestamp: int = DEFAULT_TIMESTAMP
     whitelisted_tokens: dict = field(default_factory=dict)
     active_users: List[str] = field(default_factory=lambda: DEFAULT_USERS)
@@ -86,12 +175,15 @@ class GlobalSettings:
     alpha: Decimal = DEFAULT_ALPHA
 
 
+@trusted_setattr
 @dataclass(config=Config)
 class Cooldown:
     """
     Represents a pending withdrawal cooldown.
     """
 
+    __deepcopy__ = copy_fields
+
     id: int
     created_at: int
     user_name: str
@@ -101,12 +193,15 @@ class Cooldown:
     pooltoken: Any = field(default_factory=Token)
 
 
+@trusted_setattr
 @dataclass(config=Config)
 class StandardProgram:
     """
     Represents an standard reward program state.
     """
 
+    __deepcopy__ = copy_fields
+
     id: int
     tkn_name: str
     is_active: bool
@@ -121,12 +216,15 @@ class StandardProgram:
     pooltoken_amt: Any = field(default_factory=Token)
 
 
+@trusted_setattr
 @dataclass(config=Config)
 class AutocompoundingProgram:
     """
     Represents an autocompounding reward program state.
     """
 
+    __deepcopy__ = copy_fields
+
     id: int
     created_at: int
     tkn_name: str
@@ -148,23 +246,29 @@ class AutocompoundingProgram:
         return self.total_rewards.balance / self.total_duration
 
 
+@trusted_setattr
 @dataclass(config=Config)
 class UserStandardProgram:
     """
     Represents a standard reward program user state
     """
 
+    __deepcopy__ = copy_fields
+
     staked_amt: Any = field(default_factory=Token)
     pending_rewards: Any = field(default_factory=Token)
     reward_per_token_paid: Any = field(default_factory=Token)
 
 
+@trusted_setattr
 @dataclass(config=Config)
 class User:
     """
     Represents a user agent state.
     """
 
+    __deepcopy__ = copy_fields
+
     user_name: str
     pending_withdrawals: Dict[int, Cooldown] = field(
         default_factory=lambda: defaultdict(Cooldown)
@@ -175,6 +279,7 @@ class User:
     wallet: Dict[str, Token] = field(default_factory=lambda: defaultdict(Token))
 
 
+@trusted_setattr
 @dataclass(config=Config)
 class Tokens(GlobalSettings):
     """
@@ -215,32 +320,51 @@ class Tokens(GlobalSettings):
         """
         True if the spot price deviation from the EMA is less than 1% (or other preset threshold amount).
         """
-        # changed due to contract implementation
-        # should probably use `ema_rate` and `inv_ema_rate` instead
-        ema_rate = self.updated_ema_rate
-        inv_ema_rate = self.updated_inv_ema_rate
-        return (
-            DEFAULT_LOWER_EMA_LIMIT * ema_rate
-            <= self.spot_rate
-            <= DEFAULT_UPPER_EMA_LIMIT * ema_rate
-            and DEFAULT_LOWER_EMA_LIMIT * inv_ema_rate
-            <= self.inv_spot_rate
-            <= DEFAULT_UPPER_EMA_LIMIT * inv_ema_rate
-        )
+        return self.rates[2]
 
     @property
     def updated_ema_rate(self) -> Decimal:
         """
         Computes the ema as a lagging average only once per block, per pool.
         """
-        return self.alpha * self.spot_rate + (1 - self.alpha) * self.ema_rate
+        return self.rates[0]
 
     @property
     def updated_inv_ema_rate(self) -> Decimal:
         """
         Computes the inverse ema as a lagging average only once per block, per pool.
         """
-        return self.alpha * self.inv_spot_rate + (1 - self.alpha) * self.inv_ema_rate
+        return self.rates[1]
+
+    @property
+    def rates(self) -> Tuple[Decimal, Decimal, bool]:
+        """
+        Returns the updated ema rate, the updated inverse ema rate and the price stability of the pool.
+        These are recomputed only after the alpha, the spot rates or the ema rates have been assigned.
+        """
+        rates = self.__dict__.get("_rates")
+        if rates is None:
+            alpha = self.alpha
+            spot_rate = self.spot_rate
+            inv_spot_rate = self.inv_spot_rate
+            updated_ema_rate = alpha * spot_rate + (1 - alpha) * self.ema_rate
+            updated_inv_ema_rate = (
+                alpha * inv_spot_rate + (1 - alpha) * self.inv_ema_rate
+            )
+            # changed due to contract implementation
+            # should probably use `ema_rate` and `inv_ema_rate` instead
+            is_price_stable = (
+                DEFAULT_LOWER_EMA_LIMIT * updated_ema_rate
+                <= spot_rate
+                <= DEFAULT_UPPER_EMA_LIMIT * updated_ema_rate
+                and DEFAULT_LOWER_EMA_LIMIT * updated_inv_ema_rate
+                <= inv_spot_rate
+                <= DEFAULT_UPPER_EMA_LIMIT * updated_inv_ema_rate
+            )
+            rates = (updated_ema_rate, updated_inv_ema_rate, is_price_stable)
+            # bypass the validation of the dataclass fields, since the cache is not one of them
+            object.__setattr__(self, "_rates", rates)
+        return rates
 
     @property
     def bnt_bootstrap_liquidity(self):
@@ -260,6 +384,26 @@ class Tokens(GlobalSettings):
         return self._vbnt_price
 
 
+# The fields from which `Tokens.rates` are computed, whose assignment clears the cached rates
+RATE_FIELDS = frozenset(
+    ["alpha", "spot_rate", "ema_rate", "inv_spot_rate", "inv_ema_rate"]
+)
+
+
+def set_tokens_field(self, name: str, value, setattr=Tokens.__setattr__):
+    """
+    Assigns a field of a Tokens instance (as validated by the dataclass), clearing the cached rates if they depend on it.
+    """
+    if name in RATE_FIELDS:
+        self.__dict__.pop("_rates", None)
+    setattr(self, name, value)
+
+
+# the dataclass decorator replaces any `__setattr__` defined in the class body, so it is wrapped afterwards
+Tokens.__setattr__ = set_tokens_field
+
+
+@trusted_setattr
 @dataclass(config=Config)
 class State(GlobalSettings):
     """
@@ -267,7 +411,7 @@ class State(GlobalSettings):
     """
 
     transaction_id: int = 0
-    price_feeds: PandasDataFrame = None
+    price_feeds: PriceFeeds = None
     tokens: Dict[str, Tokens] = field(default_factory=lambda: defaultdict(Tokens))
     users: Dict[str, User] = field(default_factory=lambda: defaultdict(User))
     standard_reward_programs: Dict[int, StandardProgram] = field(
@@ -276,7 +420,7 @@ class State(GlobalSettings):
     autocompounding_reward_programs: Dict[str, AutocompoundingProgram] = field(
         default_factory=lambda: defaultdict(AutocompoundingProgram)
     )
-    history: list = field(default_factory=list)
+    history: Any = field(default_factory=HistoryRecorder)
     logger: Any = logger
     json_export: dict = field(default_factory=dict)
     whitelisted_tokens: dict = field(default_factory=dict)
@@ -841,6 +985,14 @@ class State(GlobalSettings):
     def copy(self):
         return copy.deepcopy(self)
 
+    def validate(self, trusted: bool = False):
+        """
+        Validates every field of the state and of the tokens, users and programs which it holds.
+        If trusted, the fields are then assigned without validation until they are validated again.
+        """
+        validate_fields(self, trusted)
+        return self
+
 
 def get_total_standard_rewards_staked(state, id: int) -> Decimal:
     """
@@ -1401,8 +1553,8 @@ def get_json_virtual_balances(state: State, tkn_name: str) -> dict:
     Return the virtual balances for a given token name for a json test scenario.
     """
     return {
-        "bntVirtualBalance": state.price_feeds[tkn_name].values[0],
-        "baseTokenVirtualBalance": state.price_feeds["bnt"].values[0],
+        "bntVirtualBalance": state.price_feeds[tkn_name][0],
+        "baseTokenVirtualBalance": state.price_feeds["bnt"][0],
     }
 
 
@@ -0,0 +1,282 @@
+# coding=utf-8
+# --------------------------------------------------------------------------------------------------------------------
+# Licensed under the MIT LICENSE. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------------------------------
+"""Price feeds which are loaded lazily, and shared by reference rather than copied."""
+import os
+
+import numpy as np
+import pandas
+
+_MISSING = object()
+
+
+class PriceFeedsAt(object):
+    """
+    Provides `price_feeds.at[timestamp, tkn_name]` lookups and assignments, in the same way as a `pandas.DataFrame`.
+    """
+
+    __slots__ = ["price_feeds"]
+
+    def __init__(self, price_feeds):
+        self.price_feeds = price_feeds
+
+    def __getitem__(self, key):
+        return self.price_feeds.get(*key)
+
+    def __setitem__(self, key, value):
+        self.price_feeds.set(*key, value)
+
+
+class PriceFeeds(object):
+    """
+    Represents the price of every token at every timestamp, stored column by column.
+    Each column is either a constant, an in-memory array, or an array mapped into memory from a `.npy` file
+    (or an Arrow file) only when it is first accessed.
+    Copies share all columns with the original, and record their own assignments separately.
+    Pickling a file-backed feed stores the path of the file rather than its content.
+
+    Args:
+        length: The number of timestamps
+        constants: The price of each constant column
+        arrays: The prices of each in-memory column
+        path: The file or directory from which the remaining columns are mapped
+        columns: The names of the columns in the file or directory
+        index: The timestamps, if they are not `0, 1, 2, ...`
+    """
+
+    def __init__(
+        self,
+        length: int,
+        constants: dict = None,
+        arrays: dict = None,
+        path: str = None,
+        columns: dict = None,
+        index: pandas.Index = None,
+    ):
+        self.length = length
+        self.constants = dict(constants) if constants is not None else {}
+        self.arrays = dict(arrays) if arrays is not None else {}
+        self.path = path
+        self.file_columns = dict(columns) if columns is not None else {}
+        self.index = index
+        self.overrides = {}
+        self.mapped = {}
+        self.at = PriceFeedsAt(self)
+
+    @staticmethod
+    def constant(prices: dict, length: int):
+        """
+        Returns price feeds in which the price of each token is the same at every timestamp.
+        """
+        return PriceFeeds(
+            length,
+            constants={name: np.float64(price) for name, price in prices.items()},
+        )
+
+    @staticmethod
+    def from_frame(frame: pandas.DataFrame):
+        """
+        Returns price feeds which share the columns of a dataframe (copying only columns of mixed dtypes).
+        """
+        index = frame.index
+        if (
+            isinstance(index, pandas.RangeIndex)
+            and index.start == 0
+            and index.step == 1
+        ):
+            index = None
+        arrays = {name: frame[name].to_numpy() for name in frame.columns}
+        return PriceFeeds(len(frame), arrays=arrays, index=index)
+
+    @staticmethod
+    def from_npy(path: str):
+        """
+        Returns price feeds whose columns are mapped from the `<tkn_name>.npy` files of a directory.
+        """
+        columns = {
+            name[: -len(".npy")].lower(): name
+            for name in sorted(os.listdir(path))
+            if name.endswith(".npy")
+        }
+        lengths = {
+            len(np.load(os.path.join(path, name), mmap_mode="r"))
+            for name in columns.values()
+        }
+        assert len(lengths) == 1, f"The columns in `{path}` differ in length"
+        return PriceFeeds(lengths.pop(), path=path, columns=columns)
+
+    @staticmethod
+    def from_arrow(path: str):
+        """
+        Returns price feeds whose columns are mapped from an Arrow IPC (feather v2) file.
+        """
+        import pyarrow.ipc
+
+        table = pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+        columns = {name.lower(): name for name in table.column_names}
+        return PriceFeeds(table.num_rows, path=path, columns=columns)
+
+    @property
+    def columns(self) -> list:
+        names = list(self.constants) + list(self.arrays)
+        return names + [name for name in self.file_columns if name not in names]
+
+    def __len__(self):
+        return self.length
+
+    def __contains__(self, tkn_name: str):
+        return tkn_name in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    @property
+    def shape(self) -> tuple:
+        return self.length, len(self.columns)
+
+    def __getitem__(self, tkn_name: str) -> np.ndarray:
+        """
+        Returns the prices of a token at every timestamp, as a read-only array.
+        """
+        column = self.column(tkn_name)
+        overrides = {
+            self.position(timestamp): value
+            for (timestamp, name), value in self.overrides.items()
+            if name == tkn_name
+        }
+        if overrides:
+            column = column.astype(object)
+            for position, value in overrides.items():
+                column[position] = value
+            column.flags.writeable = False
+        return column
+
+    def __setitem__(self, tkn_name: str, prices):
+        """
+        Replaces the prices of a token at every timestamp.
+        """
+        prices = np.asarray(prices)
+        assert len(prices) == self.length, f"Expected {self.length} prices"
+        self.constants.pop(tkn_name, None)
+        self.arrays.pop(tkn_name, None)
+        if prices.strides == (0,) and prices.dtype != object:
+            # the prices of a constant column, which are kept as such rather than as a full array
+            self.constants[tkn_name] = prices[0]
+        else:
+            self.arrays[tkn_name] = prices
+        self.overrides = {
+            key: value for key, value in self.overrides.items() if key[1] != tkn_name
+        }
+
+    def get(self, timestamp: int, tkn_name: str):
+        """
+        Returns the price of a token at a given timestamp.
+        """
+        if self.overrides:
+            value = self.overrides.get((timestamp, tkn_name), _MISSING)
+            if value is not _MISSING:
+                return value
+        if tkn_name in self.constants:
+            self.position(timestamp)
+            return self.constants[tkn_name]
+        return self.column(tkn_name)[self.position(timestamp)]
+
+    def set(self, timestamp: int, tkn_name: str, value):
+        """
+        Sets the price of a token at a given timestamp, without modifying the columns shared with other copies.
+        """
+        self.position(timestamp)
+        self.column(tkn_name)
+        self.overrides[(timestamp, tkn_name)] = value
+
+    def copy(self):
+        """
+        Returns a copy which shares all columns with this one.
+        """
+        result = PriceFeeds(
+            self.length,
+            self.constants,
+            self.arrays,
+            self.path,
+            self.file_columns,
+            self.index,
+        )
+        result.overrides = dict(self.overrides)
+        result.mapped = self.mapped
+        return result
+
+    def position(self, timestamp: int) -> int:
+        """
+        Returns the row of a given timestamp.
+        """
+        if self.index is not None:
+            return self.index.get_loc(timestamp)
+        if not 0 <= timestamp < self.length:
+            raise KeyError(timestamp)
+        return timestamp
+
+    def column(self, tkn_name: str) -> np.ndarray:
+        """
+        Returns the prices of a token at every timestamp, mapping them from the file upon first access.
+        """
+        if tkn_name in self.arrays:
+            return self.arrays[tkn_name]
+        if tkn_name in self.constants:
+            return np.broadcast_to(np.float64(self.constants[tkn_name]), (self.length,))
+        if tkn_name not in self.mapped:
+            if tkn_name not in self.file_columns:
+                raise KeyError(tkn_name)
+            self.mapped[tkn_name] = self.map_column(self.file_columns[tkn_name])
+        return self.mapped[tkn_name]
+
+    def map_column(self, name: str) -> np.ndarray:
+        if os.path.isdir(self.path):
+            return np.load(os.path.join(self.path, name), mmap_mode="r")
+        import pyarrow.ipc
+
+        table = pyarrow.ipc.open_file(pyarrow.memory_map(self.path)).read_all()
+        return table.column(name).to_numpy()
+
+    def to_frame(self) -> pandas.DataFrame:
+        """
+        Returns all the prices in a dataframe (which is built in memory, and should therefore be used sparingly).
+        """
+        return pandas.DataFrame(
+            {name: self[name] for name in self.columns}, index=self.index
+        )
+
+    def save_npy(self, path: str):
+        """
+        Saves every column in a `<tkn_name>.npy` file of a given directory, to be mapped by `from_npy`.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in self.columns:
+            np.save(os.path.join(path, f"{name}.npy"), self[name].astype("float64"))
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["at"]
+        state["mapped"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.at = PriceFeedsAt(self)
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+
+def read_price_feeds(price_feeds_path: str) -> PriceFeeds:
+    """
+    Returns the price feeds in a directory of `.npy` files, an Arrow file or a parquet file.
+    The `.npy` and Arrow columns are mapped into memory lazily, while a parquet file is read in full.
+    """
+    if os.path.isdir(price_feeds_path):
+        return PriceFeeds.from_npy(price_feeds_path)
+    if price_feeds_path.endswith((".arrow", ".feather")):
+        return PriceFeeds.from_arrow(price_feeds_path)
+    price_feeds = pandas.read_parquet(price_feeds_path)
+    price_feeds.columns = [col.lower() for col in price_feeds.columns]
+    return PriceFeeds.from_frame(price_feeds)
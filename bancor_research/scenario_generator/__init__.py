@@ -2,4 +2,12 @@
 # --------------------------------------------------------------------------------------------------------------------
 # Licensed under the MIT LICENSE. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------------------------------
-from .monte_carlo_generator import MonteCarloGenerator
\ No newline at end of file
+from .monte_carlo_generator import MonteCarloGenerator
+from .monte_carlo_batch import MonteCarloBatch
+from .event_replay import EventReplay, read_events
+from .parameter_sweep import (
+    ParameterSweep,
+    grid_samples,
+    random_samples,
+    latin_hypercube_samples,
+)
\ No newline at end of file
@@ -0,0 +1,223 @@
+# coding=utf-8
+# --------------------------------------------------------------------------------------------------------------------
+# Licensed under the MIT LICENSE. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------------------------------
+"""Replays historical on-chain events into the simulator, streaming them from chunked files."""
+import os
+from typing import Any, Callable, Iterator, Tuple, Union
+
+import pandas as pd
+
+from bancor_research import DEFAULT, Decimal
+from bancor_research.bancor_simulator.v3.spec.network import BancorDapp, Operation
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# the types of events which can be replayed, named after the contract functions which emit them
+EVENT_TYPES = [
+    "deposit",
+    "trade",
+    "initWithdrawal",
+    "withdraw",
+    "joinProgram",
+    "leaveProgram",
+    "claimRewards",
+    "processAcrProgram",
+]
+
+
+def read_events(
+    paths: Union[str, list], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields the events stored in CSV or parquet files, one chunk of at most `chunk_size` rows at a time.
+    A directory stands for all the `.csv` and `.parquet` files in it, in the order of their names.
+    The values in CSV files are read as strings, so that the amounts are converted to decimals without any loss.
+    """
+    for path in [paths] if isinstance(paths, str) else paths:
+        if os.path.isdir(path):
+            yield from read_events(
+                [
+                    os.path.join(path, name)
+                    for name in sorted(os.listdir(path))
+                    if name.endswith((".csv", ".parquet"))
+                ],
+                chunk_size,
+            )
+        elif path.endswith(".parquet"):
+            try:
+                import pyarrow.parquet
+            except ImportError as error:
+                raise ImportError(
+                    f"Reading the events in `{path}` requires pyarrow (`pip install pyarrow`)"
+                ) from error
+
+            for batch in pyarrow.parquet.ParquetFile(path).iter_batches(chunk_size):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(
+                path, chunksize=chunk_size, dtype=str, keep_default_na=False
+            )
+
+
+class EventReplay(object):
+    """
+    Replays historical events into a BancorDapp, reading them from disk one chunk at a time.
+
+    Each event is a row with the columns `timestamp`, `type` (see `EVENT_TYPES`), `user_name`, `tkn_name` and `amount`,
+    along with `target_tkn_name` for trades, `request_id` for withdrawals and `program_id` for standard rewards.
+    The amounts are given in the smallest units of each token, as emitted on chain, and are converted into token units
+    according to the decimals of the whitelisted tokens (18 for bnt). Withdrawal and program amounts are given in
+    pool tokens, which have the decimals of their reserve tokens. The on-chain request ids are mapped onto the ids of
+    the cooldowns begun in the simulator.
+
+    Args:
+        bancor_dapp: The BancorDapp which the events are replayed into (created with `log_state=False`, so that
+        no backup of the state is kept)
+        paths: The CSV or parquet files (or directories of files) which store the events, in chronological order
+        chunk_size: The number of events read at a time
+        log_interval: The number of events per row recorded in the history (default = None, recording none)
+        token_units: Whether the amounts are already given in token units rather than on-chain units (default = False)
+    """
+
+    def __init__(
+        self,
+        bancor_dapp: BancorDapp,
+        paths: Union[str, list],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        log_interval: int = None,
+        token_units: bool = False,
+    ):
+        self.bancor_dapp = bancor_dapp
+        self.paths = paths
+        self.chunk_size = chunk_size
+        self.log_interval = log_interval
+        self.token_units = token_units
+        self.withdrawal_ids = {}
+
+    def to_token_units(self, amount, tkn_name: str) -> str:
+        """
+        Converts an amount of a given token from on-chain units into token units.
+        """
+        if self.token_units:
+            return str(amount)
+        decimals = self.bancor_dapp.global_state.whitelisted_tokens.get(
+            tkn_name, {}
+        ).get("decimals", DEFAULT.DECIMALS)
+        return format(Decimal(amount).scaleb(-decimals).normalize(), "f")
+
+    def operations(self, events: pd.DataFrame, results: list) -> Iterator[Operation]:
+        """
+        Maps each event onto a BancorDapp operation.
+        The operations are executed as soon as they are yielded, and their results are appended to the given list
+        before the next event is mapped.
+        """
+        for event in events.itertuples(index=False):
+            timestamp = int(event.timestamp)
+            if event.type == "deposit":
+                yield Operation(
+                    "deposit",
+                    (
+                        event.tkn_name,
+                        self.to_token_units(event.amount, event.tkn_name),
+                        event.user_name,
+                        timestamp,
+                    ),
+                )
+            elif event.type == "trade":
+                yield Operation(
+                    "trade",
+                    (
+                        self.to_token_units(event.amount, event.tkn_name),
+                        event.tkn_name,
+                        event.target_tkn_name,
+                        event.user_name,
+                        timestamp,
+                    ),
+                )
+            elif event.type == "initWithdrawal":
+                yield Operation(
+                    "begin_cooldown_by_ptkn",
+                    (
+                        self.to_token_units(event.amount, event.tkn_name),
+                        event.tkn_name,
+                        event.user_name,
+                        timestamp,
+                    ),
+                )
+                # the id of the cooldown which the operation has just begun
+                self.withdrawal_ids[event.request_id] = results[-1]
+            elif event.type == "withdraw":
+                yield Operation(
+                    "withdraw",
+                    (
+                        event.user_name,
+                        self.withdrawal_ids.pop(event.request_id),
+                        timestamp,
+                    ),
+                )
+            elif event.type == "joinProgram":
+                yield Operation(
+                    "join_standard_rewards_program",
+                    (
+                        event.tkn_name,
+                        self.to_token_units(event.amount, event.tkn_name),
+                        event.user_name,
+                        int(event.program_id),
+                        timestamp,
+                    ),
+                )
+            elif event.type == "leaveProgram":
+                yield Operation(
+                    "leave_standard_rewards_program",
+                    (
+                        event.tkn_name,
+                        self.to_token_units(event.amount, event.tkn_name),
+                        event.user_name,
+                        int(event.program_id),
+                        timestamp,
+                    ),
+                )
+            elif event.type == "claimRewards":
+                yield Operation(
+                    "claim_standard_rewards",
+                    (event.user_name, [int(event.program_id)], timestamp),
+                )
+            elif event.type == "processAcrProgram":
+                yield Operation(
+                    "process_ac_rewards_program", (event.tkn_name, timestamp)
+                )
+            else:
+                raise ValueError(f"unsupported event type `{event.type}`")
+
+    def run(
+        self, snapshot_interval: int, snapshot: Callable[[BancorDapp], Any] = None
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Replays all the events, and yields `(timestamp, snapshot(bancor_dapp))` once per `snapshot_interval` events
+        and after the last event (by default, the snapshot is `bancor_dapp.describe()`).
+        Only one chunk of events is held in memory at a time.
+        """
+        if snapshot is None:
+            snapshot = BancorDapp.describe
+        count = 0
+        for events in read_events(self.paths, self.chunk_size):
+            start = 0
+            while start < len(events):
+                stop = min(
+                    len(events), start + snapshot_interval - count % snapshot_interval
+                )
+                results = []
+                self.bancor_dapp.execute_batch(
+                    self.operations(events.iloc[start:stop], results),
+                    self.log_interval,
+                    results=results,
+                )
+                count += stop - start
+                start = stop
+                if count % snapshot_interval == 0:
+                    yield self.bancor_dapp.global_state.timestamp, snapshot(
+                        self.bancor_dapp
+                    )
+        if count % snapshot_interval:
+            yield self.bancor_dapp.global_state.timestamp, snapshot(self.bancor_dapp)
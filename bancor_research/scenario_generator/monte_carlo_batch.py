@@ -0,0 +1,101 @@
+# coding=utf-8
+# --------------------------------------------------------------------------------------------------------------------
+# Licensed under the MIT LICENSE. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------------------------------
+"""Runs independent Monte Carlo simulations across a pool of worker processes."""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+import cloudpickle
+import pandas as pd
+
+from .monte_carlo_generator import MonteCarloGenerator
+
+RUN_ID = "run_id"
+
+# the settings shared by all the runs in a worker process, see `init_worker`
+_worker_settings = None
+
+
+def init_worker(settings: bytes):
+    """
+    Receives the settings shared by all the runs, once per worker process.
+    """
+    global _worker_settings
+    _worker_settings = cloudpickle.loads(settings)
+
+
+def run_simulation(
+    run_id: Any, seed: int, generator_params: dict, run_params: dict
+) -> Tuple[Any, pd.DataFrame]:
+    """
+    Executes a single simulation in a worker process and returns its logger frames.
+    """
+    transact, shared_generator_params, shared_run_params = _worker_settings
+    generator = MonteCarloGenerator(
+        **{**shared_generator_params, **generator_params}, seed=seed
+    )
+    return run_id, generator.run(transact, **{**shared_run_params, **run_params})
+
+
+class MonteCarloBatch(object):
+    """
+    Runs many independent simulations, each one with its own random number generator and seed.
+
+    Args:
+        transact: The function which performs the actions of each simulated day, given the `MonteCarloGenerator`
+        generator_params: The arguments passed to `MonteCarloGenerator` in every run (excluding `seed`)
+        run_params: The arguments passed to `MonteCarloGenerator.run` in every run (excluding `transact`)
+        max_workers: The number of worker processes (default = the number of processors on the machine)
+    """
+
+    def __init__(
+        self,
+        transact: Callable,
+        generator_params: dict,
+        run_params: dict = None,
+        max_workers: int = None,
+    ):
+        self.transact = transact
+        self.generator_params = generator_params
+        self.run_params = run_params if run_params is not None else {}
+        self.max_workers = max_workers
+
+    def iter_runs(
+        self, runs: Iterable[Tuple[Any, int, dict, dict]]
+    ) -> Iterator[Tuple[Any, pd.DataFrame]]:
+        """
+        Executes the given runs, each one given as `(run_id, seed, generator_params, run_params)`.
+        The parameters of each run override the parameters shared by all the runs.
+        Yields `(run_id, frame)` for every run as soon as it is completed.
+        """
+        settings = cloudpickle.dumps(
+            (self.transact, self.generator_params, self.run_params)
+        )
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=init_worker,
+            initargs=(settings,),
+        ) as executor:
+            futures = [executor.submit(run_simulation, *run) for run in runs]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, num_runs: int, seed: int = 1) -> pd.DataFrame:
+        """
+        Executes `num_runs` simulations seeded with `seed`, `seed + 1`, ..., and merges their logger frames.
+        """
+        runs = [(run_id, seed + run_id, {}, {}) for run_id in range(num_runs)]
+        frames = dict(self.iter_runs(runs))
+        return merge_runs(frames)
+
+
+def merge_runs(frames: dict) -> pd.DataFrame:
+    """
+    Merges the frames of several runs, ordered by run id, into a single frame with a run id column.
+    """
+    merged = pd.concat(
+        [frames[run_id].assign(**{RUN_ID: run_id}) for run_id in sorted(frames)],
+        ignore_index=True,
+    )
+    return merged[[RUN_ID] + [column for column in merged if column != RUN_ID]]
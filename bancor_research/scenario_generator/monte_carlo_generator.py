@@ -26,6 +26,7 @@ class MonteCarloGenerator(object):
             withdraw_mean: float,
             cooldown_time: int = 0,
             bnt_min_liquidity: Any = 10000,
+            seed: int = 1,
     ):
 
         # all users/agents use a single BancorDapp instance
@@ -62,7 +63,10 @@ class MonteCarloGenerator(object):
                     )
 
         self.protocol = v3
-        self.random = random
+
+        # each generator draws from its own random number generator, so that several can run side by side
+        self.random = random.Random(seed)
+        self.seed = seed
         self.logger = []
         self.timestamp = 0
         self.simulation_actions_count = simulation_actions_count
@@ -96,9 +100,8 @@ class MonteCarloGenerator(object):
                 random_tkn_names.append(tkn)
 
         # randomly shuffle the list of tokens that we will select from
-        random.seed(1)
         for i in range(50):
-            random.shuffle(random_tkn_names)
+            self.random.shuffle(random_tkn_names)
         self.pool_freq_dist_list = random_tkn_names
 
     def get_random_deposit_amt(self, amt: Decimal = None) -> Decimal:
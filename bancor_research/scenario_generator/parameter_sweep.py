@@ -0,0 +1,208 @@
+# coding=utf-8
+# --------------------------------------------------------------------------------------------------------------------
+# Licensed under the MIT LICENSE. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------------------------------
+"""Parameter sweeps over the Monte Carlo simulation settings, with checkpointing of the completed runs."""
+import hashlib, inspect, itertools, json, os, pickle, random
+from typing import Callable, List
+
+import pandas as pd
+
+from .monte_carlo_batch import RUN_ID, MonteCarloBatch, merge_runs
+from .monte_carlo_generator import MonteCarloGenerator
+
+GENERATOR_PARAMS = [
+    name
+    for name in inspect.signature(MonteCarloGenerator.__init__).parameters
+    if name not in ["self", "seed"]
+]
+RUN_PARAMS = [
+    name
+    for name in inspect.signature(MonteCarloGenerator.run).parameters
+    if name not in ["self", "transact"]
+]
+RESULTS_FILE = "results.csv"
+
+
+def grid_samples(space: dict) -> List[dict]:
+    """
+    Returns every combination of the given parameter values.
+
+    Args:
+        space: The list of values of each parameter
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_samples(space: dict, num_samples: int, seed: int = 1) -> List[dict]:
+    """
+    Returns parameter combinations drawn uniformly at random.
+
+    Args:
+        space: The `(low, high)` range of each numeric parameter, or the list of values of each other parameter
+        num_samples: The number of combinations
+        seed: The seed of the random number generator
+    """
+    rng = random.Random(seed)
+    return [
+        {name: from_unit(values, rng.random()) for name, values in space.items()}
+        for _ in range(num_samples)
+    ]
+
+
+def latin_hypercube_samples(space: dict, num_samples: int, seed: int = 1) -> List[dict]:
+    """
+    Returns parameter combinations drawn by Latin hypercube sampling.
+    The range of each parameter is split into `num_samples` strata, and each stratum is drawn exactly once.
+
+    Args:
+        space: The `(low, high)` range of each numeric parameter, or the list of values of each other parameter
+        num_samples: The number of combinations
+        seed: The seed of the random number generator
+    """
+    rng = random.Random(seed)
+    columns = {}
+    for name, values in space.items():
+        strata = [(i + rng.random()) / num_samples for i in range(num_samples)]
+        rng.shuffle(strata)
+        columns[name] = [from_unit(values, u) for u in strata]
+    return [{name: columns[name][i] for name in space} for i in range(num_samples)]
+
+
+def from_unit(values, u: float):
+    """
+    Maps a number in [0, 1) onto a `(low, high)` range, or onto a list of values.
+    """
+    if isinstance(values, tuple):
+        low, high = values
+        if isinstance(low, int) and isinstance(high, int):
+            return min(low + int(u * (high - low + 1)), high)
+        return low + u * (high - low)
+    return values[min(int(u * len(values)), len(values) - 1)]
+
+
+def sample_key(params: dict, seed: int) -> str:
+    """
+    Returns a stable identifier of a run, used to name its checkpoint file.
+    """
+    text = json.dumps([params, seed], sort_keys=True, default=str)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def final_values(frame: pd.DataFrame) -> dict:
+    """
+    Summarizes a run by the values in the last row of its logger frames.
+    """
+    return frame.iloc[-1].to_dict() if len(frame) > 0 else {}
+
+
+class ParameterSweep(object):
+    """
+    Runs a simulation for every parameter combination across worker processes.
+    Each completed run is saved in the checkpoint directory, so that an interrupted sweep resumes where it stopped.
+    The runs are identified by their own parameters and seed only, so use a new checkpoint directory whenever
+    the transact function or the parameters shared by all the runs are changed.
+
+    Args:
+        transact: The function which performs the actions of each simulated day, given the `MonteCarloGenerator`
+        generator_params: The arguments passed to `MonteCarloGenerator` in every run
+        run_params: The arguments passed to `MonteCarloGenerator.run` in every run
+        checkpoint_dir: The directory in which the runs and the aggregated results table are saved
+        summarize: The function which returns a dictionary of results, given the logger frames of a run
+        max_workers: The number of worker processes (default = the number of processors on the machine)
+        seed: The seed of every run
+    """
+
+    def __init__(
+        self,
+        transact: Callable,
+        generator_params: dict,
+        run_params: dict = None,
+        checkpoint_dir: str = "sweep",
+        summarize: Callable = final_values,
+        max_workers: int = None,
+        seed: int = 1,
+    ):
+        self.batch = MonteCarloBatch(
+            transact, generator_params, run_params, max_workers
+        )
+        self.checkpoint_dir = checkpoint_dir
+        self.summarize = summarize
+        self.seed = seed
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def run(self, samples: List[dict]) -> pd.DataFrame:
+        """
+        Executes the runs which are not yet in the checkpoint directory, and returns the aggregated results table.
+        The table has one row per sample, holding its parameters followed by its results.
+        """
+        keys = [sample_key(params, self.seed) for params in samples]
+        pending = [
+            (
+                run_id,
+                self.seed,
+                split_params(params, GENERATOR_PARAMS),
+                split_params(params, RUN_PARAMS),
+            )
+            for run_id, params in enumerate(samples)
+            if not os.path.exists(self.checkpoint_path(keys[run_id]))
+        ]
+        for run_id, frame in self.batch.iter_runs(pending):
+            self.save(keys[run_id], samples[run_id], frame)
+
+        results = []
+        for run_id, key in enumerate(keys):
+            params, frame = self.load(key)
+            row = {RUN_ID: run_id, "key": key}
+            row.update({name: format_param(value) for name, value in params.items()})
+            row.update(self.summarize(frame))
+            results.append(row)
+        table = pd.DataFrame(results)
+        table.to_csv(os.path.join(self.checkpoint_dir, RESULTS_FILE), index=False)
+        return table
+
+    def frames(self, samples: List[dict]) -> pd.DataFrame:
+        """
+        Returns the logger frames of the completed runs, merged into a single frame with a run id column.
+        """
+        keys = [sample_key(params, self.seed) for params in samples]
+        return merge_runs(
+            {
+                run_id: self.load(key)[1]
+                for run_id, key in enumerate(keys)
+                if os.path.exists(self.checkpoint_path(key))
+            }
+        )
+
+    def checkpoint_path(self, key: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"{key}.pkl")
+
+    def save(self, key: str, params: dict, frame: pd.DataFrame):
+        """
+        Saves a completed run, such that an interrupted write never leaves a partial checkpoint behind.
+        """
+        path = self.checkpoint_path(key)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump((params, frame), f)
+        os.replace(path + ".tmp", path)
+
+    def load(self, key: str):
+        with open(self.checkpoint_path(key), "rb") as f:
+            return pickle.load(f)
+
+
+def split_params(params: dict, names: list) -> dict:
+    """
+    Returns the parameters which are accepted by the function whose parameter names are given.
+    """
+    unknown = [name for name in params if name not in GENERATOR_PARAMS + RUN_PARAMS]
+    assert not unknown, f"Unknown simulation parameters: {unknown}"
+    return {name: value for name, value in params.items() if name in names}
+
+
+def format_param(value):
+    """
+    Returns a parameter value which fits in a single table cell.
+    """
+    return json.dumps(value, sort_keys=True) if isinstance(value, dict) else value
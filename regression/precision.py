@@ -0,0 +1,99 @@
+import sys
+
+precision = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+
+from bancor_research.bancor_simulator.v3.spec.network import BancorDapp, describe_divergence
+
+from os.path import join, dirname
+from json import loads
+
+operations = {
+    'deposit'             : lambda d, o, t, ids: d.deposit(o['poolId'], o['amount'], o['userId'], t),
+    'withdraw'            : lambda d, o, t, ids: d.withdraw(o['userId'], d.begin_cooldown_by_ptkn(o['amount'], o['poolId'], o['userId'], t), t),
+    'trade'               : lambda d, o, t, ids: d.trade(o['amount'], o['poolId'], o['targetPoolId'], o['userId'], t),
+    'burnPoolToken'       : lambda d, o, t, ids: d.burn_pool_tokens(o['poolId'], o['amount'], o['userId'], t),
+    'joinProgram'         : lambda d, o, t, ids: d.join_standard_rewards_program(o['poolId'], o['amount'], o['userId'], ids[o['poolId']], t),
+    'leaveProgram'        : lambda d, o, t, ids: d.leave_standard_rewards_program(o['poolId'], o['amount'], o['userId'], ids[o['poolId']], t),
+    'claimRewards'        : lambda d, o, t, ids: d.claim_standard_rewards(o['userId'], [ids[o['poolId']]], t),
+    'createFlatAcrProgram': lambda d, o, t, ids: d.create_flat_ac_rewards_program(o['poolId'], o['userId'], o['rewards'], t, o['duration'], t),
+    'createExpAcrProgram' : lambda d, o, t, ids: d.create_exp_ac_rewards_program(o['poolId'], o['userId'], o['rewards'], t, o['halfLife'], t),
+    'processAcrProgram'   : lambda d, o, t, ids: d.process_ac_rewards_program(o['poolId'], t),
+    'terminateAcrProgram' : lambda d, o, t, ids: d.terminate_ac_rewards_program(o['poolId'], t),
+    'setFundingLimit'     : lambda d, o, t, ids: d.set_bnt_funding_limit(o['poolId'], o['amount'], t),
+    'enableTrading'       : lambda d, o, t, ids: d.enable_trading(o['poolId'], o['bntVirtualBalance'], o['baseTokenVirtualBalance'], t),
+}
+
+def execute(fileName):
+    fileDesc = open(join(dirname(__file__), 'data', fileName + '.json'), 'r')
+    fileData = loads(fileDesc.read())
+    fileDesc.close()
+
+    timestamp = 0
+
+    bancorDapps = [
+        BancorDapp(
+            timestamp = timestamp,
+            log_state = False,
+            cooldown_time = 0,
+            bnt_min_liquidity = fileData['bnt_min_liquidity'],
+            withdrawal_fee = fileData['withdrawal_fee'],
+            network_fee = fileData['network_fee'],
+            whitelisted_tokens = fileData['pools'],
+            precision = precision,
+        )
+        for precision in [None, precision]
+    ]
+
+    for user, balances in fileData['users'].items():
+        for token, balance in balances.items():
+            for bancorDapp in bancorDapps:
+                bancorDapp.set_user_balance(user, token, balance, timestamp)
+
+    programIds = {bancorDapp : {} for bancorDapp in bancorDapps}
+    for poolId, programsParams in fileData['programs'].items():
+        for bancorDapp in bancorDapps:
+            programIds[bancorDapp][poolId] = bancorDapp.create_standard_rewards_program(
+                poolId,
+                programsParams['rewards'],
+                timestamp,
+                timestamp + programsParams['duration'],
+                timestamp
+            )
+
+    maxDivergence = 0
+    for n in range(len(fileData['operations'])):
+        operation = fileData['operations'][n]
+        timestamp += operation['elapsed']
+
+        print('\r{} (precision {}), operation {} out of {}... '.format(fileName, precision, n + 1, len(fileData['operations'])), end = '')
+
+        errors = []
+        for bancorDapp in bancorDapps:
+            try:
+                operations[operation['type']](bancorDapp, operation, timestamp, programIds[bancorDapp])
+                errors.append(None)
+            except AssertionError as error:
+                errors.append(str(error))
+
+        if errors[0] != errors[1]:
+            print('operation {} ({}) diverged: {} instead of {}'.format(n + 1, operation['type'], errors[1], errors[0]))
+            break
+
+        maxDivergence = max(maxDivergence, describe_divergence(*bancorDapps).max().max())
+
+    print('max divergence: {:.12f}%'.format(maxDivergence * 100))
+    print('final divergence:')
+    print(describe_divergence(*bancorDapps).applymap(lambda x: '{:.12f}%'.format(x * 100)))
+
+execute('BancorNetworkSimpleFinancialScenario1')
+execute('BancorNetworkSimpleFinancialScenario2')
+execute('BancorNetworkSimpleFinancialScenario3')
+execute('BancorNetworkSimpleFinancialScenario4')
+execute('BancorNetworkSimpleFinancialScenario5')
+execute('BancorNetworkSimpleFinancialScenario6')
+execute('BancorNetworkComplexFinancialScenario1')
+execute('BancorNetworkComplexFinancialScenario2')
+execute('BancorNetworkRewardsFinancialScenario1')
+execute('BancorNetworkRewardsFinancialScenario2')
+execute('BancorNetworkMassiveFinancialScenario1')
+execute('BancorNetworkMassiveFinancialScenario2')